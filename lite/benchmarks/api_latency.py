@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Measure API latency under concurrent load, with and without the DB thread pool.
+
+Starts the FastAPI app in a uvicorn subprocess against a temporary database
+filled with synthetic stories, then drives it with many concurrent clients
+requesting story details. The response cache is disabled so every request
+reaches SQLite. Run from the lite directory:
+
+    python benchmarks/api_latency.py --clients 200 --requests 25
+
+On a single CPU the two modes are within run-to-run noise (p99 about
+7.3-8.3 s at 200 clients, 370-420 ms at 20): queries and serialization are
+CPU-bound, so extra threads add no capacity there. The pool's gain is that
+a slow query no longer stalls the event loop for every other connection.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import httpx
+
+LITE_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(LITE_ROOT))
+
+SERVER_CODE = '''
+import sys
+import config
+config.DATABASE_PATH = {database_path!r}
+config.API_DB_THREADS = {threads}
+config.STORY_CACHE_MAX_ENTRIES = 0
+config.PIPELINE_ENABLED = False
+import uvicorn
+from src.api.main import app
+uvicorn.run(app, host="127.0.0.1", port={port}, log_level="warning", timeout_keep_alive=120)
+'''
+
+
+def seed_stories(database_path: str, count: int):
+    """Fill a fresh database with synthetic processed stories."""
+    import config
+    config.DATABASE_PATH = database_path
+    from src.synthesis.processor import StoryProcessor
+
+    processor = StoryProcessor(database_path=database_path)
+    now = datetime.now()
+    sources = ['CNN', 'BBC', 'Reuters', 'Fox News', 'NPR', 'AP News']
+    stories = []
+    for i in range(count):
+        references = [{'source': source, 'title': f'Story {i} coverage', 'url': f'https://example.com/{i}/{j}'}
+                      for j, source in enumerate(random.sample(sources, 3))]
+        paragraph = ' '.join(f'Sentence {k} about story {i}.' for k in range(12))
+        stories.append({
+            'id': f'story-{i:05d}',
+            'event_headline': f'Synthetic event {i}',
+            'unified_summary': '\n\n'.join([paragraph] * 3),
+            'background_context': paragraph,
+            'economic_impact': paragraph,
+            'social_values': paragraph,
+            'practical_solutions': paragraph,
+            'conservative_view': paragraph,
+            'progressive_view': paragraph,
+            'references_json': json.dumps(references),
+            'created_date': (now - timedelta(minutes=i)).isoformat(),
+            'source_count': len(references),
+            'political_balance_score': random.choice([1 / 3, 2 / 3, 1.0])
+        })
+    with contextlib.redirect_stdout(io.StringIO()):
+        processor.save_processed_stories(stories)
+    return [story['id'] for story in stories]
+
+
+async def wait_for_server(base_url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f'{base_url}/api/health')).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError('Server did not start in time')
+
+
+async def drive(base_url: str, story_ids, clients: int, requests_per_client: int):
+    """Run ``clients`` concurrent request loops and return per-request latencies."""
+    latencies = []
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+
+    async with httpx.AsyncClient(limits=limits, timeout=60.0) as client:
+        async def client_loop():
+            for _ in range(requests_per_client):
+                path = random.choice([f'/api/story/{random.choice(story_ids)}', '/api/stories'])
+                start = time.perf_counter()
+                response = await client.get(base_url + path)
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*[client_loop() for _ in range(clients)])
+        elapsed = time.perf_counter() - start
+
+    return latencies, elapsed
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_mode(label: str, threads: int, database_path: str, story_ids, args) -> dict:
+    port = args.port + threads
+    server = subprocess.Popen(
+        [sys.executable, '-c', SERVER_CODE.format(database_path=database_path, threads=threads, port=port)],
+        cwd=LITE_ROOT
+    )
+    try:
+        base_url = f'http://127.0.0.1:{port}'
+        asyncio.run(wait_for_server(base_url))
+        latencies, elapsed = asyncio.run(drive(base_url, story_ids, args.clients, args.requests))
+    finally:
+        server.terminate()
+        server.wait()
+
+    result = {
+        'mode': label,
+        'db_threads': threads,
+        'requests': len(latencies),
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+    }
+    print(f"{label:>8}: p50 {result['p50_ms']} ms | p95 {result['p95_ms']} ms | "
+          f"p99 {result['p99_ms']} ms | {result['throughput_rps']} req/s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=25, help='requests per client')
+    parser.add_argument('--stories', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=8, help='DB threads for the "after" run')
+    parser.add_argument('--port', type=int, default=8100)
+    parser.add_argument('--output', help='write results as JSON to this file')
+    args = parser.parse_args()
+
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        database_path = os.path.join(tmp, 'bench.db')
+        story_ids = seed_stories(database_path, args.stories)
+        print(f"Seeded {len(story_ids)} stories; {args.clients} clients x {args.requests} requests")
+
+        results = [
+            run_mode('before', 0, database_path, story_ids, args),
+            run_mode('after', args.threads, database_path, story_ids, args),
+        ]
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Check the API server's cold-start import time against a budget.
+
+Starts fresh interpreters that import what ``run_server.py`` needs before
+serving (uvicorn and ``src.api.main.app``) and reports the median wall
+time, the slowest imports, and whether any heavy module that serving
+doesn't need (numpy, scikit-learn, torch, ...) was pulled in. Exits with
+status 1 when the median exceeds ``--budget-ms`` or a heavy module is
+imported, so it can gate CI. Run from the lite directory:
+
+    python benchmarks/import_time.py --budget-ms 1500
+"""
+
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+LITE_ROOT = Path(__file__).resolve().parent.parent
+
+# Modules only the pipeline worker needs; importing the app must not load them
+HEAVY_MODULES = ('numpy', 'scipy', 'sklearn', 'torch', 'transformers', 'sentence_transformers',
+                 'faiss', 'feedparser', 'httpx', 'pandas')
+
+STARTUP_CODE = f'''
+import json, sys
+import run_server, uvicorn
+from src.api.main import app
+print(json.dumps(sorted(set(sys.modules) & set({HEAVY_MODULES!r}))))
+'''
+
+_IMPORTTIME_RE = re.compile(r'import time:\s+(\d+) \|\s+\d+ \|\s*(\S+)')
+
+
+def cold_start():
+    """Wall seconds, heavy modules loaded and per-module self times (us) of one fresh import."""
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', STARTUP_CODE], cwd=LITE_ROOT,
+                               capture_output=True, text=True, check=True)
+    elapsed = time.perf_counter() - start
+    self_times = {}
+    for match in _IMPORTTIME_RE.finditer(completed.stderr):
+        self_times[match.group(2)] = int(match.group(1))
+    return elapsed, json.loads(completed.stdout.strip().splitlines()[-1]), self_times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=1500)
+    parser.add_argument('--top', type=int, default=10, help='slowest imports to list')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    args = parser.parse_args()
+
+    cold_start()  # Warm the OS file cache and bytecode caches
+    timings, heavy, self_times = [], [], {}
+    for _ in range(args.runs):
+        elapsed, heavy, self_times = cold_start()
+        timings.append(elapsed * 1000)
+
+    median_ms = statistics.median(timings)
+    slowest = sorted(self_times.items(), key=lambda item: item[1], reverse=True)[:args.top]
+    print(f"Cold start: median {median_ms:.0f} ms over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+    print("Slowest imports (self time):")
+    for module, micros in slowest:
+        print(f"  {micros / 1000:>8.1f} ms  {module}")
+    if heavy:
+        print(f"Heavy modules imported at startup: {', '.join(heavy)}")
+
+    results = {
+        'median_ms': round(median_ms, 1),
+        'runs_ms': [round(t, 1) for t in timings],
+        'budget_ms': args.budget_ms,
+        'heavy_modules': heavy,
+        'slowest_imports_ms': {module: round(micros / 1000, 2) for module, micros in slowest},
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if median_ms > args.budget_ms or heavy:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Time each clustering and synthesis stage on synthetic corpora of growing size.
+
+For every ``--sizes`` entry a temporary database is filled with a
+deterministic synthetic corpus (see ``benchmarks/synthetic.py``) and the
+following are run against it:
+
+    load_articles               EventClusterer.load_articles
+    calculate_event_similarity  dense n x n matrix (skipped above --dense-limit)
+    cluster_articles            on the loaded articles
+    get_top_stories             load + cluster + scoring, end to end
+    process_story_cluster       rule-based synthesis of every top story
+
+Each stage is run once for wall time and once more under tracemalloc for
+peak Python/numpy memory, so tracing overhead never affects the timing.
+The JSON report also records how well the clusters recover the generated
+events (adjusted Rand index), so a speedup that breaks clustering shows up.
+Pass a previous report as ``--baseline`` to print the change per stage.
+Run from the lite directory:
+
+    python benchmarks/pipeline.py --sizes 1000 10000 100000 --output after.json
+    python benchmarks/pipeline.py --sizes 1000 10000 --baseline before.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+LITE_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(LITE_ROOT))
+
+from benchmarks.synthetic import fill_articles, generate_articles
+
+STAGES = ['load_articles', 'calculate_event_similarity', 'cluster_articles', 'get_top_stories',
+          'process_story_cluster']
+
+
+def measure(fn):
+    """Wall time of one quiet call, then peak traced memory of a second one."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = fn()
+        seconds = time.perf_counter() - start
+
+        result = None  # Don't count the first result against the traced run
+        tracemalloc.start()
+        try:
+            result = fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return result, {'seconds': round(seconds, 4), 'peak_mb': round(peak / 2 ** 20, 2)}
+
+
+def benchmark_size(size: int, args):
+    from sklearn.metrics import adjusted_rand_score
+    from src.analysis.clustering import EventClusterer
+    from src.synthesis.processor import StoryProcessor
+
+    articles = generate_articles(size, events=args.events, noise=args.noise, seed=args.seed)
+    truth = {article['id']: article['event'] for article in articles}
+    run = {'articles': size, 'events': len({a['event'] for a in articles} - {-1}), 'stages': {}}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_path = os.path.join(tmp, 'pipeline.db')
+        start = time.perf_counter()
+        fill_articles(database_path, articles)
+        run['fill_seconds'] = round(time.perf_counter() - start, 2)
+        del articles
+
+        clusterer = EventClusterer(engine='sparse', backend='tfidf')
+        clusterer.database_path = database_path
+        # Measure generation, not cache hits
+        processor = StoryProcessor(database_path=database_path, cache_generations=False)
+
+        stages = run['stages']
+        loaded, stages['load_articles'] = measure(clusterer.load_articles)
+        if size <= args.dense_limit:
+            _, stages['calculate_event_similarity'] = measure(lambda: clusterer.calculate_event_similarity(loaded))
+        else:
+            stages['calculate_event_similarity'] = {'skipped': f'more than --dense-limit {args.dense_limit} articles'}
+        clusters, stages['cluster_articles'] = measure(lambda: clusterer.cluster_articles(loaded))
+        top_stories, stages['get_top_stories'] = measure(lambda: clusterer.get_top_stories(args.max_stories))
+        _, stages['process_story_cluster'] = measure(lambda: [
+            processor.process_story_cluster([dict(a) for a in story['articles']], story['id'])
+            for story in top_stories
+        ])
+
+        predicted = {article['id']: label for label, cluster in enumerate(clusters) for article in cluster}
+        ids = list(truth)
+        run['clusters_found'] = len(clusters)
+        run['stories_processed'] = len(top_stories)
+        # Noise articles and unclustered articles are each their own singleton
+        run['adjusted_rand'] = round(adjusted_rand_score(
+            [truth[i] if truth[i] >= 0 else -1 - n for n, i in enumerate(ids)],
+            [predicted.get(i, -1 - n) for n, i in enumerate(ids)]
+        ), 4)
+    return run
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=LITE_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_run(run, baseline_run=None):
+    print(f"{run['articles']:,} articles, {run['events']:,} events: {run['clusters_found']:,} clusters, "
+          f"ARI {run['adjusted_rand']} (fill {run['fill_seconds']}s)")
+    for stage in STAGES:
+        result = run['stages'][stage]
+        if 'skipped' in result:
+            print(f"  {stage:>27}: skipped")
+            continue
+        line = f"  {stage:>27}: {result['seconds']:>9.3f}s  peak {result['peak_mb']:>9.1f} MB"
+        before = (baseline_run or {}).get('stages', {}).get(stage, {})
+        if before.get('seconds'):
+            line += f"  ({(result['seconds'] / before['seconds'] - 1) * 100:+.0f}% time"
+            line += f", {(result['peak_mb'] / before['peak_mb'] - 1) * 100:+.0f}% memory)" if before['peak_mb'] else ')'
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--events', type=int, help='events per corpus (default: one per 8 event articles)')
+    parser.add_argument('--noise', type=float, default=0.3, help='fraction of articles in no event')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-stories', type=int, default=15)
+    parser.add_argument('--dense-limit', type=int, default=5000,
+                        help='largest corpus to build the quadratic dense similarity matrix for')
+    parser.add_argument('--baseline', help='earlier JSON report to compare against')
+    parser.add_argument('--output', help='write the report as JSON to this file')
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {run['articles']: run for run in json.load(f)['runs']}
+
+    report = {
+        'revision': git_revision(),
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'cpus': os.cpu_count(),
+        'parameters': {'noise': args.noise, 'events': args.events, 'seed': args.seed,
+                       'max_stories': args.max_stories},
+        'runs': []
+    }
+    for size in args.sizes:
+        run = benchmark_size(size, args)
+        report['runs'].append(run)
+        print_run(run, baseline.get(size))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Measure story processing time per cycle against the number of worker processes.
+
+Builds synthetic clusters and runs ``StoryProcessor.process_story_clusters``
+with 1, 2, 4, ... workers up to the core count. Nothing is saved. With
+``--tiny-llm`` the sections are generated instead by a small randomly
+initialized model (no download needed) and tokens/sec is reported, with and
+without int8 quantization. Run from the lite directory:
+
+    python benchmarks/processing.py --clusters 200
+    python benchmarks/processing.py --clusters 16 --tiny-llm
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+LITE_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(LITE_ROOT))
+
+from benchmarks.synthetic import SOURCES
+
+
+def synthetic_clusters(count: int, articles_per_cluster: int, sentences: int):
+    """Clusters shaped like ``EventClusterer.get_top_stories`` output."""
+    clusters = []
+    for c in range(count):
+        articles = []
+        for i in range(articles_per_cluster):
+            source, lean = random.choice(SOURCES)
+            body = ' '.join(f'Officials said item {random.randint(0, 9999)} changed.' for _ in range(sentences))
+            articles.append({
+                'id': f'{c}-{i}',
+                'title': f'Election vote count continues in region {c} as results near {i}',
+                'content': f'<p>{body}</p>',
+                'url': f'https://example.com/{c}/{i}',
+                'source_name': source,
+                'political_lean': lean,
+                'published_date': '2024-01-01T00:00:00',
+                'collected_date': '2024-01-01T00:00:00'
+            })
+        clusters.append({'id': f'cluster-{c}', 'articles': articles})
+    return clusters
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clusters', type=int, default=200)
+    parser.add_argument('--articles', type=int, default=12, help='articles per cluster')
+    parser.add_argument('--sentences', type=int, default=200, help='sentences per article')
+    parser.add_argument('--tiny-llm', action='store_true', help='benchmark batched generation instead')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    args = parser.parse_args()
+
+    from src.synthesis.processor import StoryProcessor
+
+    random.seed(0)
+    clusters = synthetic_clusters(args.clusters, args.articles, args.sentences)
+    # No database needed; measure generation, not cache hits
+    processor = StoryProcessor(init_db=False, cache_generations=False)
+
+    if args.tiny_llm:
+        results = benchmark_tiny_llm(processor, clusters)
+    else:
+        results = benchmark_workers(processor, clusters)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+def benchmark_workers(processor, clusters):
+    worker_counts = [1]
+    while worker_counts[-1] * 2 <= (os.cpu_count() or 1):
+        worker_counts.append(worker_counts[-1] * 2)
+
+    results = []
+    for workers in worker_counts:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            processor.process_story_clusters(clusters, workers=workers)
+        elapsed = time.perf_counter() - start
+        results.append({'workers': workers, 'clusters': len(clusters), 'seconds': round(elapsed, 3)})
+        print(f"{workers:>3} workers: {elapsed:.2f}s ({len(clusters) / elapsed:.1f} clusters/s)")
+    return results
+
+
+def benchmark_tiny_llm(processor, clusters):
+    from src.synthesis.llm import LLMEngine, tiny_random_model
+
+    results = []
+    for quantize in (False, True):
+        model, tokenizer = tiny_random_model()
+        processor.llm_engine = LLMEngine('tiny-random', model=model, tokenizer=tokenizer,
+                                           quantize=quantize, temperature=0)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            processor.process_story_clusters(clusters)
+        elapsed = time.perf_counter() - start
+        engine = processor.llm_engine
+        results.append({'quantized': quantize, 'clusters': len(clusters), 'seconds': round(elapsed, 3),
+                        'generated_tokens': engine.generated_tokens,
+                        'tokens_per_second': round(engine.tokens_per_second, 1)})
+        print(f"int8={quantize!s:>5}: {elapsed:.2f}s, {engine.tokens_per_second:.1f} tokens/sec")
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Measure full-text search latency on a large synthetic article archive.
+
+Fills a temporary database with ``--articles`` synthetic articles whose
+words follow a Zipf distribution (so there are very common, mid-frequency
+and rare terms, as in real news text). The FTS5 index is maintained by the
+insert triggers, as in production. The script then times ``search_articles``
+for several query shapes, plus one LIKE scan for comparison. Run from the
+lite directory (the default 1M articles takes a few minutes to build):
+
+    python benchmarks/search.py --articles 1000000
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+LITE_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(LITE_ROOT))
+
+from benchmarks.synthetic import make_vocabulary, zipf_texts
+
+VOCABULARY_SIZE = 50000
+WORDS_PER_ARTICLE = 80
+INSERT_BATCH = 20000
+
+
+def fill_articles(database_path: str, count: int, vocabulary):
+    from src.data.database import init_schema, transaction
+
+    init_schema(database_path)
+    rng = np.random.default_rng(0)
+    vocabulary = np.array(vocabulary)
+    now = datetime.now()
+    for start in range(0, count, INSERT_BATCH):
+        size = min(INSERT_BATCH, count - start)
+        texts = zipf_texts(rng, vocabulary, size, WORDS_PER_ARTICLE)
+        rows = [(
+            f'a{start + i}', ' '.join(text.split()[:8]).capitalize(), text, f'https://example.com/{start + i}',
+            'Synthetic', 'center', (now - timedelta(minutes=start + i)).isoformat(), text
+        ) for i, text in enumerate(texts)]
+        with transaction(database_path) as conn:
+            conn.executemany('''
+                INSERT INTO articles (id, title, content, url, source_name, political_lean, collected_date,
+                                      clean_content)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+        print(f"\r  {start + size:,} / {count:,} articles", end='', flush=True)
+    print()
+
+
+def time_query(fn, repeats: int):
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return result, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--articles', type=int, default=1000000)
+    parser.add_argument('--repeats', type=int, default=20)
+    parser.add_argument('--output', help='write results as JSON to this file')
+    args = parser.parse_args()
+
+    from src.data.database import get_connection
+    from src.data.search import search_articles
+
+    vocabulary = make_vocabulary(VOCABULARY_SIZE)
+    queries = {
+        'common term': vocabulary[0],
+        'mid-frequency term': vocabulary[200],
+        'rare term': vocabulary[20000],
+        'two terms': f'{vocabulary[3]} {vocabulary[150]}',
+        'three terms': f'{vocabulary[1]} {vocabulary[40]} {vocabulary[900]}',
+    }
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        database_path = os.path.join(tmp, 'search.db')
+        print(f"Building {args.articles:,} article corpus")
+        start = time.perf_counter()
+        fill_articles(database_path, args.articles, vocabulary)
+        print(f"Built and indexed in {time.perf_counter() - start:.1f}s")
+
+        for label, query in queries.items():
+            for offset in (0, 200):
+                page, latencies = time_query(
+                    lambda: search_articles(query, 20, offset, database_path), args.repeats
+                )
+                result = {
+                    'query': label, 'text': query, 'offset': offset, 'hits_on_page': len(page['results']),
+                    'p50_ms': round(statistics.median(latencies), 2),
+                    'p95_ms': round(sorted(latencies)[int(0.95 * (len(latencies) - 1))], 2),
+                }
+                results.append(result)
+                print(f"{label:>20} @ offset {offset:>3}: p50 {result['p50_ms']} ms | p95 {result['p95_ms']} ms")
+
+        conn = get_connection(database_path)
+        _, latencies = time_query(lambda: conn.execute(
+            "SELECT id FROM articles WHERE content LIKE ? LIMIT 20 OFFSET 200", (f'%{queries["rare term"]}%',)
+        ).fetchall(), 1)
+        results.append({'query': 'LIKE scan (rare term)', 'offset': 200, 'p50_ms': round(latencies[0], 2)})
+        print(f"{'LIKE scan (rare term)':>20}: {latencies[0]:.1f} ms")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
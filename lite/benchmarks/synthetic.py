@@ -0,0 +1,136 @@
+"""
+Deterministic synthetic news corpus shared by the benchmarks.
+
+Articles are spread over the sources in ``config.NEWS_SOURCES`` with their
+political leans. Most belong to an *event*: articles about one event share
+a person, a country, a date and a handful of topic words in the title and
+lead sentence, the way different outlets covering the same story do. The
+rest are unrelated noise articles. Body text after the lead sentence is
+filler drawn from a Zipf distribution over pseudo-words, so term
+frequencies look like real text. The same arguments always produce the
+same corpus, which keeps benchmark runs comparable between commits.
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+LITE_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(LITE_ROOT))
+
+from config import NEWS_SOURCES
+
+SOURCES = [(source['name'], lean) for lean, sources in NEWS_SOURCES.items() for source in sources]
+COUNTRIES = ['US', 'China', 'Russia', 'Ukraine', 'Israel', 'Iran', 'UK', 'France', 'Germany']
+MONTHS = ['January', 'February', 'March', 'April', 'May', 'June', 'July', 'August',
+          'September', 'October', 'November', 'December']
+INSERT_BATCH = 20000
+
+
+def make_vocabulary(size: int, seed: int = 1) -> List[str]:
+    """Pronounceable pseudo-words; index 0 is the most frequent under Zipf sampling."""
+    rng = np.random.default_rng(seed)
+    consonants, vowels = list('bcdfghklmnprstvz'), list('aeiou')
+    words = set()
+    while len(words) < size:
+        length = int(rng.integers(2, 5))
+        words.add(''.join(rng.choice(consonants) + rng.choice(vowels) for _ in range(length)))
+    return sorted(words, key=lambda w: (len(w), w))
+
+
+def zipf_texts(rng, vocabulary: np.ndarray, count: int, words: int, exponent: float = 1.1) -> List[str]:
+    """``count`` texts of ``words`` Zipf-distributed vocabulary words each."""
+    ranks = np.minimum(rng.zipf(exponent, size=(count, words)) - 1, len(vocabulary) - 1)
+    return [' '.join(row) for row in vocabulary[ranks]]
+
+
+def generate_articles(count: int, events: Optional[int] = None, noise: float = 0.3,
+                      body_words: int = 120, window_hours: float = 48, seed: int = 0,
+                      now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """Synthetic articles as dicts with the ``articles`` columns plus an ``event`` label.
+
+    ``events`` defaults to one event per eight event articles; event sizes
+    vary around that mean. ``noise`` is the fraction of articles that belong
+    to no event (``event`` is -1). Articles of one event are collected within
+    a few hours of each other, all within the last ``window_hours``.
+    """
+    rng = np.random.default_rng(seed)
+    now = now or datetime.now()
+    vocabulary = np.array(make_vocabulary(20000, seed + 1))
+    names = [word.capitalize() for word in make_vocabulary(3000, seed + 2)]
+    # Topic words come from the rarer part of the vocabulary so they stand out from filler
+    topic_words = vocabulary[2000:]
+
+    event_count = count - int(count * noise)
+    events = events or max(1, event_count // 8)
+    labels = np.concatenate([rng.integers(0, events, size=event_count), np.full(count - event_count, -1)])
+    rng.shuffle(labels)
+
+    event_topics = rng.choice(topic_words, size=(events, 5))
+    event_people = rng.choice(names, size=(events, 2))
+    event_countries = rng.choice(COUNTRIES, size=events)
+    event_days = rng.integers(1, 29, size=events)
+    event_months = rng.choice(MONTHS, size=events)
+    event_hours = rng.uniform(0, window_hours, size=events)
+
+    bodies = zipf_texts(rng, vocabulary, count, body_words)
+    articles = []
+    for i, event in enumerate(labels):
+        source, lean = SOURCES[rng.integers(len(SOURCES))]
+        if event >= 0:
+            # Outlets word the same story differently: each uses four of the five topic words
+            topic = list(rng.permutation(event_topics[event])[:4])
+            person = ' '.join(event_people[event])
+            country = event_countries[event]
+            date = f'{event_months[event]} {event_days[event]}'
+            hours_ago = min(window_hours, event_hours[event] + rng.uniform(0, 6))
+            title = f"{person} {topic[0]} {topic[1]} {topic[2]} in {country}"
+            lead = f"{person} said {country} would {topic[1]} the {topic[3]} {topic[0]} by {date}."
+        else:
+            # Unrelated stories share no topic, place or date wording with anything else
+            topic = list(rng.choice(topic_words, size=4))
+            person = ' '.join(rng.choice(names, size=2))
+            hours_ago = rng.uniform(0, window_hours)
+            title = f"{person} {topic[0]} {topic[1]} {topic[2]}"
+            lead = f"{person} {topic[1]} the {topic[3]} {topic[0]}."
+        collected = (now - timedelta(hours=float(hours_ago))).isoformat()
+        articles.append({
+            'id': f'synthetic-{seed}-{i}',
+            'title': title,
+            'content': f'<p>{lead} {bodies[i].capitalize()}.</p>',
+            'url': f'https://example.com/{seed}/{i}',
+            'source_name': source,
+            'political_lean': lean,
+            'published_date': collected,
+            'collected_date': collected,
+            'event': int(event)
+        })
+    return articles
+
+
+def fill_articles(database_path, articles: List[Dict[str, Any]], with_entities: bool = True):
+    """Insert ``articles`` into a database, deriving text fields and entities as ingest does."""
+    from src.analysis.entities import article_entity_text, extract_named_entities, save_article_entities
+    from src.data.cleaning import text_fields
+    from src.data.database import init_schema, transaction
+
+    init_schema(database_path)
+    for start in range(0, len(articles), INSERT_BATCH):
+        batch = articles[start:start + INSERT_BATCH]
+        fields = {a['id']: text_fields(a['title'], a['content']) for a in batch}
+        with transaction(database_path) as conn:
+            conn.executemany('''
+                INSERT INTO articles (id, title, content, url, source_name, political_lean,
+                                      published_date, collected_date, canonical_url,
+                                      clean_content, lead_sentence, clustering_text)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [(a['id'], a['title'], a['content'], a['url'], a['source_name'], a['political_lean'],
+                   a['published_date'], a['collected_date'], a['url'], *fields[a['id']]) for a in batch])
+            if with_entities:
+                save_article_entities(conn, {
+                    a['id']: extract_named_entities(article_entity_text(a['title'], fields[a['id']][0]))
+                    for a in batch
+                })
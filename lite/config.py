@@ -34,14 +34,74 @@ NEWS_SOURCES = {
     ]
 }
 
+# Feed collection
+FEED_TIMEOUT = 10.0  # seconds per request unless overridden for the host below
+FEED_HOST_TIMEOUTS = {
+    "feeds.reuters.com": 20.0,
+    "feeds.washingtonpost.com": 15.0,
+}
+FEED_MAX_CONNECTIONS = 20
+FEED_USER_AGENT = "NewsBot/1.0 (+https://github.com/dianavins/news_bot)"
+DEDUP_SIMHASH_DISTANCE = 6  # Max differing SimHash bits (of 64) for two bodies to count as the same copy
+DEDUP_MIN_WORDS = 25  # Shorter bodies are only deduplicated by canonical URL
+DEDUP_WINDOW_HOURS = 168  # Compare new articles against those collected this recently
+
+# Event clustering
+CLUSTER_EPS = 0.3  # DBSCAN radius in cosine distance (70%+ similarity to share a cluster)
+CLUSTERING_ENGINE = "sparse"  # "sparse" neighbor graph, or "dense" n x n matrix
+CLUSTERING_BACKEND = "tfidf"  # "tfidf", or "embedding" for sentence-transformer vectors
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+EMBEDDING_BATCH_SIZE = 64
+EMBEDDING_STORE_PATH = DATA_DIR / "embeddings"  # <path>.f32 / .ids / .json
+CLUSTERING_WINDOW_HOURS = 72  # Only articles collected this recently are clustered (0 = all)
+ARTICLE_FETCH_BATCH_SIZE = 1000  # Rows per fetchmany() when streaming articles
+CLUSTER_LIVE_HOURS = 72  # Clusters untouched for longer stop accepting new articles
+CLUSTER_COMPACTION_INTERVAL = 86400  # Full re-cluster every 24 hours in incremental mode
+
 # LLM Configuration
 DEFAULT_MODEL = "microsoft/DialoGPT-medium"  # Fallback, will use SmolLM3-3B when available
 MAX_TOKENS = 512
 TEMPERATURE = 0.3
+LLM_ENABLED = False  # Write story sections with DEFAULT_MODEL instead of the rule-based templates
+LLM_BATCH_SIZE = 8  # Prompts per padded generate() call
+LLM_QUANTIZE = True  # int8 dynamic quantization of Linear (and GPT-2 Conv1D) layers for CPU inference
+LLM_MAX_INPUT_TOKENS = 1024  # Longer prompts keep their last tokens
+
+# Story processing
+PROCESSING_WORKERS = 0  # Processes for cluster synthesis (0 = one per CPU core, 1 = serial)
+GENERATION_CACHE_ENABLED = True  # Reuse sections generated from identical cluster inputs
+GENERATION_CACHE_MAX_AGE_DAYS = 30  # Cached sections unused for longer are pruned
+
+# API
+STORY_CACHE_CHECK_INTERVAL = 1.0  # Seconds between stories-version checks by the response cache
+STORY_CACHE_MAX_ENTRIES = 512  # Cached API responses kept in memory (0 disables caching)
+API_DB_THREADS = 8  # Worker threads (and connections) for API database access
+SEARCH_MAX_CANDIDATES = 5000  # Search ranks only the newest this-many matches of a query
+COMPRESSION_MIN_SIZE = 1024  # JSON bodies of fewer bytes are sent uncompressed
+STORY_EVENTS_POLL_INTERVAL = 2.0  # Seconds between checks for new story events while clients listen
+STORY_EVENTS_QUEUE_SIZE = 64  # Events buffered per client; clients that fall further behind must resync
+STORY_EVENTS_KEEPALIVE = 15.0  # Seconds of silence before an event stream sends a keep-alive comment
+STORY_EVENTS_KEEP = 1000  # Newest story events kept for clients resuming with Last-Event-ID
+
+# Frontend static files, built into hashed, precompressed copies by src/web/assets.py
+STATIC_DIR = PROJECT_ROOT / "src" / "web" / "static"
+STATIC_BUILD_DIR = DATA_DIR / "static"
+
+# Metrics (exported at /api/metrics)
+METRICS_ENABLED = True
+METRICS_DB_STATEMENTS = True  # Time every SQLite statement, labelled by verb and table
 
 # Update intervals
 NEWS_UPDATE_INTERVAL = 14400  # 4 hours in seconds
 
+# Background pipeline (collect -> cluster -> process), scheduled by the API server
+PIPELINE_ENABLED = True
+PIPELINE_INITIAL_DELAY = 60  # Seconds after server start before the first run
+PIPELINE_JITTER = 0.1  # Each delay is NEWS_UPDATE_INTERVAL +/- this fraction
+PIPELINE_MAX_STORIES = 15
+PIPELINE_INCREMENTAL = True  # Cluster only new articles between compactions
+PIPELINE_LOCK_PATH = DATA_DIR / "pipeline.lock"  # Keeps two servers from running at once
+
 # User settings defaults
 DEFAULT_SETTINGS = {
     "detail_level": "standard",
@@ -50,6 +110,7 @@ DEFAULT_SETTINGS = {
     "update_frequency": "4h"
 }
 
-# Create directories if they don't exist
-for directory in [DATA_DIR, MODELS_DIR, LOGS_DIR]:
-    directory.mkdir(exist_ok=True)
\ No newline at end of file
+def ensure_directories():
+    """Create the data, model and log directories; importing config never touches the disk."""
+    for directory in [DATA_DIR, MODELS_DIR, LOGS_DIR]:
+        directory.mkdir(exist_ok=True)
@@ -14,8 +14,11 @@ sys.path.append('src')
 # Import and run the FastAPI app
 if __name__ == "__main__":
     import uvicorn
+    from config import ensure_directories
     from src.api.main import app
     
+    ensure_directories()
+    
     print("Starting News Bot Lite Web Server...")
     print("Open your browser to: http://127.0.0.1:8003")
     
@@ -0,0 +1,148 @@
+"""Compact in-memory articles for the clustering hot path.
+
+Clustering only needs each article's id, its clustering text (title plus
+first sentence) and a few metadata fields, so ``ArticleBatch`` keeps those
+as parallel columns: numpy codes for lean and source, ``datetime64`` for
+collection time, and plain lists for the strings. The clustering text is
+derived at ingest (``src.data.cleaning``), so full article bodies never
+enter Python while clustering. ``Article`` is the slotted per-article record handed to story
+building and synthesis; it is created only for clustered articles.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set
+
+import numpy as np
+
+from src.data.cleaning import text_fields
+
+# SQL for the batch columns, in ArticleBatch.from_rows order
+BATCH_COLUMNS = 'id, title, url, source_name, political_lean, collected_date, clustering_text'
+
+
+def clustering_text(article: Mapping[str, Any]) -> str:
+    """Stored clustering text of an article mapping, deriving it only if it has none."""
+    text = article.get('clustering_text')
+    return text if text is not None else text_fields(article['title'], article.get('content'))[2]
+
+
+class Article:
+    """One article as a slotted record.
+
+    Supports the mapping access the rest of the app uses
+    (``article['title']``, ``article.get(...)``, ``dict(article)``).
+    ``content`` and ``clean_content`` are only loaded for articles that go
+    on to synthesis, and ``entities`` holds the stored entity set once it
+    has been loaded.
+    """
+
+    __slots__ = ('id', 'title', 'url', 'source_name', 'political_lean', 'collected_date', 'content',
+                 'clean_content', 'entities')
+
+    FIELDS = ('id', 'title', 'content', 'clean_content', 'source_name', 'political_lean', 'url', 'collected_date')
+
+    def __init__(self, id: str, title: str, url: str, source_name: str, political_lean: str,
+                 collected_date: str, content: Optional[str] = None, clean_content: Optional[str] = None,
+                 entities: Optional[Set[str]] = None):
+        self.id = id
+        self.title = title
+        self.url = url
+        self.source_name = source_name
+        self.political_lean = political_lean
+        self.collected_date = collected_date
+        self.content = content
+        self.clean_content = clean_content
+        self.entities = entities
+
+    def __getitem__(self, key: str):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in self.FIELDS else default
+
+    def keys(self):
+        return self.FIELDS
+
+    def __repr__(self):
+        return f"Article({self.id!r}, {self.title!r})"
+
+
+class ArticleBatch:
+    """Column-oriented articles: row ``i`` of every column is one article."""
+
+    __slots__ = ('ids', 'titles', 'urls', 'texts', 'source_codes', 'sources', 'lean_codes', 'leans',
+                 'collected', 'entity_sets', 'entity_matrix')
+
+    def __init__(self, ids: List[str], titles: List[str], urls: List[str], texts: List[str],
+                 source_codes: np.ndarray, sources: List[str], lean_codes: np.ndarray, leans: List[str],
+                 collected: np.ndarray, entity_sets: Optional[List[Set[str]]] = None):
+        self.ids = ids
+        self.titles = titles
+        self.urls = urls
+        self.texts = texts  # Title + lead sentence, see src.data.cleaning
+        self.source_codes = source_codes  # Index into ``sources``
+        self.sources = sources
+        self.lean_codes = lean_codes  # Index into ``leans``
+        self.leans = leans
+        self.collected = collected  # datetime64[us]
+        self.entity_sets = entity_sets  # Filled in by EventClusterer.load_entity_sets
+        self.entity_matrix = None  # Sparse article x entity matrix, see EventClusterer.entity_matrix
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence[Any]]) -> 'ArticleBatch':
+        """Build from rows selected with ``BATCH_COLUMNS`` (may be a streaming cursor)."""
+        ids, titles, urls, texts, collected = [], [], [], [], []
+        source_codes, lean_codes = [], []
+        sources: Dict[str, int] = {}
+        leans: Dict[str, int] = {}
+        for article_id, title, url, source_name, political_lean, collected_date, text in rows:
+            ids.append(article_id)
+            titles.append(title)
+            urls.append(url)
+            texts.append(text)
+            source_codes.append(sources.setdefault(source_name, len(sources)))
+            lean_codes.append(leans.setdefault(political_lean, len(leans)))
+            collected.append(collected_date)
+        return cls(
+            ids, titles, urls, texts,
+            np.array(source_codes, dtype=np.int32), list(sources),
+            np.array(lean_codes, dtype=np.int8), list(leans),
+            np.array(collected, dtype='datetime64[us]')
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def take(self, indices: Sequence[int]) -> 'ArticleBatch':
+        """Batch of the given rows, in that order."""
+        indices = np.asarray(indices, dtype=np.intp)
+        batch = ArticleBatch(
+            [self.ids[i] for i in indices], [self.titles[i] for i in indices],
+            [self.urls[i] for i in indices], [self.texts[i] for i in indices],
+            self.source_codes[indices], self.sources, self.lean_codes[indices], self.leans,
+            self.collected[indices],
+            [self.entity_sets[i] for i in indices] if self.entity_sets is not None else None
+        )
+        if self.entity_matrix is not None:
+            batch.entity_matrix = self.entity_matrix[indices]
+        return batch
+
+    def collected_date(self, i: int) -> str:
+        """ISO timestamp of row ``i``, as stored in the database."""
+        return self.collected[i].astype(datetime).isoformat()
+
+    def latest_collected_date(self) -> str:
+        return self.collected.max().astype(datetime).isoformat()
+
+    def record(self, i: int) -> Article:
+        return Article(
+            self.ids[i], self.titles[i], self.urls[i], self.sources[self.source_codes[i]],
+            self.leans[self.lean_codes[i]], self.collected_date(i),
+            entities=self.entity_sets[i] if self.entity_sets is not None else None
+        )
+
+    def records(self, indices: Optional[Sequence[int]] = None) -> List[Article]:
+        return [self.record(i) for i in (range(len(self)) if indices is None else indices)]
+
@@ -0,0 +1,138 @@
+"""SQLite persistence for incremental event clustering state."""
+
+import pickle
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.data.database import fetch_by_ids, get_connection, init_schema, transaction
+
+
+class ClusterStateStore:
+    """Persist live event clusters (centroids and members) between runs.
+
+    Centroids are stored as the float32 mean of member vectors, so new
+    members can be folded in with a running-mean update. For TF-IDF the
+    fitted vectorizer is kept alongside them because incremental runs must
+    project new articles into the same feature space the centroids live in.
+    """
+
+    def __init__(self, database_path):
+        self.database_path = database_path
+        init_schema(database_path)
+
+    def get_value(self, key: str):
+        """Read a value from the clustering_state table."""
+        conn = get_connection(self.database_path)
+        row = conn.execute('SELECT value FROM clustering_state WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def load_vectorizer(self):
+        """Return the vectorizer fitted at the last compaction, if any."""
+        blob = self.get_value('vectorizer')
+        return pickle.loads(blob) if blob is not None else None
+
+    def load_live_clusters(self, since: str, dimensions: Optional[int] = None
+                           ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Load ids, sizes and centroids of clusters updated at or after ``since``.
+
+        Centroids saved before the vocabulary grew are zero-padded to
+        ``dimensions``; the terms added since never occurred in their members.
+        """
+        rows = get_connection(self.database_path).execute(
+            'SELECT id, size, centroid FROM event_clusters WHERE updated_date >= ? ORDER BY id',
+            (since,)
+        ).fetchall()
+
+        ids = np.array([row[0] for row in rows], dtype=np.int64)
+        sizes = np.array([row[1] for row in rows], dtype=np.int64)
+        if rows:
+            vectors = [np.frombuffer(row[2], dtype=np.float32) for row in rows]
+            width = max([len(vector) for vector in vectors] + [dimensions or 0])
+            centroids = np.zeros((len(rows), width), dtype=np.float32)
+            for centroid, vector in zip(centroids, vectors):
+                centroid[:len(vector)] = vector
+        else:
+            centroids = np.zeros((0, 0), dtype=np.float32)
+        return ids, sizes, centroids
+
+    def load_members(self, cluster_ids) -> Dict[int, List[str]]:
+        """Load member article ids for the given clusters."""
+        cluster_ids = [int(cluster_id) for cluster_id in cluster_ids]
+        members = {cluster_id: [] for cluster_id in cluster_ids}
+        if not cluster_ids:
+            return members
+
+        rows = fetch_by_ids(
+            get_connection(self.database_path),
+            'SELECT cluster_id, article_id FROM event_cluster_members WHERE cluster_id IN ({placeholders})',
+            cluster_ids
+        )
+        for cluster_id, article_id in rows:
+            members[cluster_id].append(article_id)
+        return members
+
+    def replace_all(self, backend: str, vectorizer, centroids: np.ndarray, members: List[List[str]],
+                    watermark: Optional[str]):
+        """Replace all cluster state with the result of a full re-cluster."""
+        now = datetime.now().isoformat()
+        with transaction(self.database_path) as conn:
+            cursor = conn.cursor()
+
+            cursor.execute('DELETE FROM event_cluster_members')
+            cursor.execute('DELETE FROM event_clusters')
+
+            for centroid, article_ids in zip(centroids, members):
+                self._insert_cluster(cursor, centroid, article_ids, now)
+
+            cursor.executemany('INSERT OR REPLACE INTO clustering_state (key, value) VALUES (?, ?)', [
+                ('backend', backend),
+                ('vectorizer', pickle.dumps(vectorizer) if vectorizer is not None else None),
+                ('watermark', watermark),
+                ('last_compaction', now)
+            ])
+
+    def apply_increment(self, updated: Dict[int, Tuple[np.ndarray, int, List[str]]],
+                        new_centroids: np.ndarray, new_members: List[List[str]],
+                        watermark: Optional[str], vectorizer=None):
+        """Persist one incremental run in a single transaction.
+
+        ``updated`` maps existing cluster ids to (centroid, size, added article ids).
+        ``vectorizer`` replaces the stored one when the run extended its vocabulary.
+        """
+        now = datetime.now().isoformat()
+        with transaction(self.database_path) as conn:
+            cursor = conn.cursor()
+
+            for cluster_id, (centroid, size, article_ids) in updated.items():
+                cursor.execute(
+                    'UPDATE event_clusters SET centroid = ?, size = ?, updated_date = ? WHERE id = ?',
+                    (np.asarray(centroid, dtype=np.float32).tobytes(), int(size), now, int(cluster_id))
+                )
+                cursor.executemany(
+                    'INSERT OR REPLACE INTO event_cluster_members (article_id, cluster_id) VALUES (?, ?)',
+                    [(article_id, int(cluster_id)) for article_id in article_ids]
+                )
+
+            for centroid, article_ids in zip(new_centroids, new_members):
+                self._insert_cluster(cursor, centroid, article_ids, now)
+
+            if watermark is not None:
+                cursor.execute('INSERT OR REPLACE INTO clustering_state (key, value) VALUES (?, ?)',
+                               ('watermark', watermark))
+            if vectorizer is not None:
+                cursor.execute('INSERT OR REPLACE INTO clustering_state (key, value) VALUES (?, ?)',
+                               ('vectorizer', pickle.dumps(vectorizer)))
+
+    @staticmethod
+    def _insert_cluster(cursor, centroid, article_ids, now):
+        cursor.execute(
+            'INSERT INTO event_clusters (centroid, size, created_date, updated_date) VALUES (?, ?, ?, ?)',
+            (np.asarray(centroid, dtype=np.float32).tobytes(), len(article_ids), now, now)
+        )
+        cluster_id = cursor.lastrowid
+        cursor.executemany(
+            'INSERT OR REPLACE INTO event_cluster_members (article_id, cluster_id) VALUES (?, ?)',
+            [(article_id, cluster_id) for article_id in article_ids]
+        )
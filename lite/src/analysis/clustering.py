@@ -1,128 +1,433 @@
 """Story clustering algorithm for grouping articles by specific events."""
 
-import sqlite3
 import numpy as np
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.cluster import DBSCAN
 from collections import Counter, defaultdict
-import re
-from datetime import datetime
+from itertools import chain
+from datetime import datetime, timedelta
 import hashlib
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
-from config import DATABASE_PATH
+from config import (DATABASE_PATH, CLUSTER_EPS, CLUSTER_LIVE_HOURS, CLUSTER_COMPACTION_INTERVAL,
+                    CLUSTERING_ENGINE, CLUSTERING_BACKEND, EMBEDDING_MODEL, EMBEDDING_BATCH_SIZE,
+                    EMBEDDING_STORE_PATH, CLUSTERING_WINDOW_HOURS, ARTICLE_FETCH_BATCH_SIZE)
+from src.analysis.articles import BATCH_COLUMNS, Article, ArticleBatch, clustering_text
+from src.analysis.cluster_state import ClusterStateStore
+from src.analysis.embeddings import EmbeddingBackend, SentenceEmbedder
+from src.analysis.engines import DenseSimilarityEngine, entity_overlap_boost, get_engine
+from src.analysis.entities import (extract_named_entities, article_entity_text,
+                                   save_article_entities, load_article_entities)
+from src.data.cleaning import article_clean_content
+from src.data.database import fetch_by_ids, get_connection, init_schema, transaction
+from src.monitoring.metrics import span
+
+# Columns of the Article records handed to story building (content is loaded separately)
+RECORD_COLUMNS = "id, title, url, source_name, political_lean, collected_date"
 
 class EventClusterer:
-    def __init__(self):
+    def __init__(self, engine=None, backend=None):
         self.database_path = DATABASE_PATH
+        self.engine = get_engine(engine or CLUSTERING_ENGINE)
+        self.backend = backend or CLUSTERING_BACKEND
+        if self.backend not in ('tfidf', 'embedding'):
+            raise ValueError(f"Unknown clustering backend: {self.backend}")
+        self._embedding_backend = None
         self.vectorizer = TfidfVectorizer(
             max_features=1000,
             stop_words='english',
             ngram_range=(1, 2),
             min_df=2
         )
+        self._cluster_state = None
+    
+    @property
+    def cluster_state(self):
+        """Persisted cluster state used by incremental mode."""
+        if self._cluster_state is None:
+            self._cluster_state = ClusterStateStore(self.database_path)
+        return self._cluster_state
+    
+    @property
+    def embedding_backend(self):
+        """Sentence-transformer vectors backed by the persistent embedding store."""
+        if self._embedding_backend is None:
+            self._embedding_backend = EmbeddingBackend(
+                SentenceEmbedder(EMBEDDING_MODEL, EMBEDDING_BATCH_SIZE),
+                EMBEDDING_STORE_PATH
+            )
+        return self._embedding_backend
         
-    def load_articles(self):
-        """Load articles from database for clustering."""
-        conn = sqlite3.connect(self.database_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT id, title, content, source_name, political_lean, url, collected_date
-            FROM articles 
-            ORDER BY collected_date DESC
-        ''')
-        
-        articles = []
-        for row in cursor.fetchall():
-            articles.append({
-                'id': row[0],
-                'title': row[1],
-                'content': row[2] or '',
-                'source_name': row[3],
-                'political_lean': row[4],
-                'url': row[5],
-                'collected_date': row[6]
-            })
+    def load_articles(self, since=None, window_hours=None, unclustered_since=None):
+        """Load articles from database for clustering.
+        
+        Only articles collected within the recency window (``window_hours``,
+        defaulting to config.CLUSTERING_WINDOW_HOURS; 0 disables it) are
+        loaded, and when ``since`` is given only those collected after that
+        timestamp, plus, with ``unclustered_since``, the earlier ones
+        collected after that second timestamp that no persisted cluster
+        holds. Rows stream in ``fetchmany`` batches straight into a
+        columnar ``ArticleBatch``; article bodies are never loaded, only the
+        clustering text SQLite cuts from them.
+        """
+        if window_hours is None:
+            window_hours = CLUSTERING_WINDOW_HOURS
+        
+        # Near-duplicate copies are linked to their original at ingest and never clustered
+        conditions = ['duplicate_of IS NULL']
+        params = []
+        if window_hours:
+            conditions.append('collected_date >= ?')
+            params.append((datetime.now() - timedelta(hours=window_hours)).isoformat())
+        if since is not None and unclustered_since is not None:
+            conditions.append('(collected_date > ? OR (collected_date >= ? AND '
+                              'id NOT IN (SELECT article_id FROM event_cluster_members)))')
+            params.extend([since, unclustered_since])
+        elif since is not None:
+            conditions.append('collected_date > ?')
+            params.append(since)
+        where = f"WHERE {' AND '.join(conditions)}"
+        
+        init_schema(self.database_path)
+        with span('cluster.load_articles'):
+            cursor = get_connection(self.database_path).cursor()
+            cursor.arraysize = ARTICLE_FETCH_BATCH_SIZE
+            
+            cursor.execute(f'''
+                SELECT {BATCH_COLUMNS}
+                FROM articles 
+                {where}
+                ORDER BY collected_date DESC
+            ''', params)
+            
+            articles = ArticleBatch.from_rows(
+                row for rows in iter(cursor.fetchmany, []) for row in rows
+            )
         
-        conn.close()
         print(f"Loaded {len(articles)} articles for clustering")
         return articles
     
+    def load_articles_by_ids(self, article_ids):
+        """Load specific articles by id as ``Article`` records (without content), preserving order."""
+        article_ids = list(article_ids)
+        rows = fetch_by_ids(
+            get_connection(self.database_path),
+            f'SELECT {RECORD_COLUMNS} FROM articles WHERE id IN ({{placeholders}})',
+            article_ids
+        )
+        by_id = {row[0]: Article(*row) for row in rows}
+        return [by_id[article_id] for article_id in article_ids if article_id in by_id]
+    
+    def load_content(self, articles):
+        """Fill in ``content`` and ``clean_content`` on records that were loaded without them."""
+        pending = {article.id: article for article in articles if article.content is None}
+        rows = fetch_by_ids(
+            get_connection(self.database_path),
+            "SELECT id, COALESCE(content, ''), COALESCE(clean_content, '') FROM articles WHERE id IN ({placeholders})",
+            pending
+        )
+        for article_id, content, clean_content in rows:
+            pending[article_id].content = content
+            pending[article_id].clean_content = clean_content
+        return articles
+    
     def extract_named_entities(self, text):
         """Simple named entity extraction for event validation."""
-        # Basic patterns for important entities
-        patterns = {
-            'people': r'\b[A-Z][a-z]+ [A-Z][a-z]+\b',
-            'organizations': r'\b(?:NATO|EU|UN|FBI|CIA|GOP|NASA|WHO)\b',
-            'countries': r'\b(?:US|USA|China|Russia|Ukraine|Israel|Iran|UK|France|Germany)\b',
-            'dates': r'\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2}(?:st|nd|rd|th)?\b'
+        return extract_named_entities(text)
+    
+    def load_entity_sets(self, articles):
+        """Load per-article entity sets, extracting and storing any that are missing.
+        
+        Sets are remembered on an ``ArticleBatch`` (and on ``Article``
+        records), so later stages reuse them instead of querying again.
+        """
+        if isinstance(articles, ArticleBatch):
+            if articles.entity_sets is None:
+                articles.entity_sets = self._entity_sets_by_id(articles.ids)
+            return articles.entity_sets
+        
+        sets = self._entity_sets_by_id(
+            [article['id'] for article in articles],
+            {article['id']: article for article in articles if article.get('content') is not None}
+        )
+        for article, entities in zip(articles, sets):
+            if isinstance(article, Article):
+                article.entities = entities
+        return sets
+    
+    def _entity_sets_by_id(self, article_ids, known_articles=None):
+        init_schema(self.database_path)
+        conn = get_connection(self.database_path)
+        entities = load_article_entities(conn, article_ids)
+        
+        # Backfill articles collected before entities were extracted at ingest
+        missing_ids = [article_id for article_id in article_ids if article_id not in entities]
+        known_articles = known_articles or {}
+        texts = {
+            article_id: (known_articles[article_id]['title'], article_clean_content(known_articles[article_id]))
+            for article_id in missing_ids if article_id in known_articles
+        }
+        texts.update({row[0]: (row[1], row[2]) for row in fetch_by_ids(
+            conn, 'SELECT id, title, clean_content FROM articles WHERE id IN ({placeholders})',
+            [article_id for article_id in missing_ids if article_id not in texts]
+        )})
+        missing = {
+            article_id: extract_named_entities(article_entity_text(*texts[article_id])) if article_id in texts else set()
+            for article_id in missing_ids
         }
+        if missing:
+            with transaction(self.database_path) as conn:
+                save_article_entities(conn, missing)
+            entities.update(missing)
         
-        entities = set()
-        for category, pattern in patterns.items():
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            entities.update([match.lower() for match in matches])
+        return [entities[article_id] for article_id in article_ids]
+    
+    def build_entity_matrix(self, entity_sets):
+        """Build a sparse binary article x entity matrix."""
+        # Entity ids in first-seen order; the per-entity lookups run in C via map()
+        flat = list(chain.from_iterable(entity_sets))
+        vocabulary = {entity: i for i, entity in enumerate(dict.fromkeys(flat))}
+        indices = np.fromiter(map(vocabulary.__getitem__, flat), dtype=np.int64, count=len(flat))
+        indptr = np.zeros(len(entity_sets) + 1, dtype=np.int64)
+        np.cumsum([len(entities) for entities in entity_sets], out=indptr[1:])
         
-        return entities
+        data = np.ones(len(indices), dtype=np.float64)
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(entity_sets), len(vocabulary)))
     
-    def calculate_event_similarity(self, articles):
-        """Calculate similarity matrix for articles using multiple signals."""
-        # Combine title and first sentence of content for clustering
-        texts = []
-        for article in articles:
-            # Use title + first sentence of content
-            content_first_sentence = article['content'].split('.')[0] if article['content'] else ''
-            combined_text = f"{article['title']} {content_first_sentence}"
-            texts.append(combined_text)
-        
-        # Calculate TF-IDF similarity
-        tfidf_matrix = self.vectorizer.fit_transform(texts)
-        similarity_matrix = cosine_similarity(tfidf_matrix)
-        
-        # Enhance similarity with named entity overlap
-        for i, article1 in enumerate(articles):
-            entities1 = self.extract_named_entities(f"{article1['title']} {article1['content']}")
-            
-            for j, article2 in enumerate(articles):
-                if i != j:
-                    entities2 = self.extract_named_entities(f"{article2['title']} {article2['content']}")
-                    
-                    # Calculate entity overlap bonus
-                    if entities1 and entities2:
-                        overlap = len(entities1.intersection(entities2))
-                        total = len(entities1.union(entities2))
-                        entity_boost = (overlap / total) * 0.3 if total > 0 else 0
-                        similarity_matrix[i][j] = min(1.0, similarity_matrix[i][j] + entity_boost)
-        
-        return similarity_matrix
+    def entity_matrix(self, articles):
+        """Article x entity matrix for ``articles``, from stored entity sets (kept on a batch)."""
+        if isinstance(articles, ArticleBatch) and articles.entity_matrix is not None:
+            return articles.entity_matrix
+        with span('cluster.entities'):
+            matrix = self.build_entity_matrix(self.load_entity_sets(articles))
+        if isinstance(articles, ArticleBatch):
+            articles.entity_matrix = matrix
+        return matrix
     
-    def cluster_articles(self, articles, min_cluster_size=2):
-        """Cluster articles into event-specific groups."""
-        if len(articles) < 2:
-            return []
+    def entity_overlap_boost(self, entity_matrix):
+        """Jaccard entity-overlap bonus for every article pair with shared entities."""
+        return entity_overlap_boost(entity_matrix)
+    
+    def clustering_texts(self, articles):
+        """Text used to place each article in the vector space: title + lead sentence."""
+        if isinstance(articles, ArticleBatch):
+            return articles.texts
+        return [clustering_text(article) for article in articles]
+    
+    def vectorize(self, articles, vectorizer=None):
+        """Vectors for articles from the configured backend.
         
-        similarity_matrix = self.calculate_event_similarity(articles)
+        With TF-IDF the vectorizer is refit on ``articles`` unless an already
+        fitted ``vectorizer`` is given; embeddings are only computed for
+        articles that are not in the embedding store yet.
+        """
+        texts = self.clustering_texts(articles)
+        with span('cluster.vectorize', backend=self.backend):
+            if self.backend == 'embedding':
+                ids = articles.ids if isinstance(articles, ArticleBatch) else [article['id'] for article in articles]
+                return self.embedding_backend.vectors(ids, texts)
+            if vectorizer is not None:
+                return vectorizer.transform(texts)
+            return self.vectorizer.fit_transform(texts)
+    
+    def extend_vocabulary(self, vectorizer, articles):
+        """A copy of a fitted TF-IDF vectorizer that also knows the terms ``articles`` share.
         
-        # Convert similarity to distance for DBSCAN
-        # Ensure all values are valid distances (0 to 1)
-        distance_matrix = np.clip(1 - similarity_matrix, 0, 1)
+        Terms that at least two of the articles use and the vectorizer lacks
+        are appended after the existing features, so vectors and centroids
+        made before stay valid once zero-padded. They get the highest idf
+        the vectorizer knows: terms first seen after the fit are rare across
+        the corpus it was fitted on. Returns None when nothing is new.
+        """
+        texts = self.clustering_texts(articles)
+        analyzer = vectorizer.build_analyzer()
+        document_counts = Counter(chain.from_iterable(set(analyzer(text)) for text in texts))
+        new_terms = sorted(term for term, count in document_counts.items()
+                           if count >= 2 and term not in vectorizer.vocabulary_)
+        if not new_terms:
+            return None
+        
+        vocabulary = dict(vectorizer.vocabulary_)
+        vocabulary.update((term, len(vectorizer.vocabulary_) + i) for i, term in enumerate(new_terms))
+        extended = TfidfVectorizer(**dict(vectorizer.get_params(), vocabulary=vocabulary)).fit(texts)
+        extended.idf_ = np.concatenate([vectorizer.idf_, np.full(len(new_terms), vectorizer.idf_.max())])
+        print(f"Added {len(new_terms)} new terms to the clustering vocabulary")
+        return extended
+    
+    def calculate_event_similarity(self, articles, vectors=None):
+        """Calculate the dense similarity matrix for articles using multiple signals.
+        
+        Clustering itself goes through the configured engine and does not
+        need this matrix.
+        """
+        # Calculate similarity on title + lead sentence, stored at ingest
+        if vectors is None:
+            vectors = self.vectorize(articles)
+        
+        # Enhance similarity with named entity overlap, computed for all pairs at once
+        entity_matrix = self.entity_matrix(articles)
+        return DenseSimilarityEngine().similarity_matrix(vectors, entity_matrix)
+    
+    def cluster_labels(self, articles, min_cluster_size=2, vectors=None):
+        """Assign a DBSCAN cluster label to every article (-1 for noise)."""
+        if vectors is None:
+            vectors = self.vectorize(articles)
+        entity_matrix = self.entity_matrix(articles)
         
-        # Use DBSCAN for clustering
         # eps=0.3 means articles need 70%+ similarity to be in same cluster (strict for quality)
-        clustering = DBSCAN(eps=0.3, min_samples=min_cluster_size, metric='precomputed')
-        cluster_labels = clustering.fit_predict(distance_matrix)
+        distances = self.engine.distance_graph(vectors, entity_matrix, CLUSTER_EPS)
+        
+        # Use DBSCAN for clustering
+        with span('cluster.dbscan'):
+            clustering = DBSCAN(eps=CLUSTER_EPS, min_samples=min_cluster_size, metric='precomputed')
+            return clustering.fit_predict(distances)
+    
+    def cluster_articles(self, articles, min_cluster_size=2):
+        """Cluster articles into event-specific groups.
+        
+        For an ``ArticleBatch`` each group is a list of ``Article`` records
+        (created only for clustered articles); otherwise the given articles.
+        """
+        members = self.cluster_members(articles, min_cluster_size)
+        if isinstance(articles, ArticleBatch):
+            return [articles.records(indices) for indices in members]
+        return [[articles[idx] for idx in indices] for indices in members]
+    
+    def cluster_members(self, articles, min_cluster_size=2):
+        """Row indices of the articles in each cluster, noise left out."""
+        if len(articles) < 2:
+            return []
+        
+        cluster_labels = self.cluster_labels(articles, min_cluster_size)
         
         # Group articles by cluster
         clusters = defaultdict(list)
         for idx, label in enumerate(cluster_labels):
             if label != -1:  # -1 is noise/unclustered
-                clusters[label].append(articles[idx])
+                clusters[label].append(idx)
         
         print(f"Found {len(clusters)} clusters from {len(articles)} articles")
-        return list(clusters.values())
+        return [np.array(indices, dtype=np.intp) for indices in clusters.values()]
+    
+    @staticmethod
+    def _cluster_means(vectors, labels):
+        """Mean vector and member indices for every non-noise label."""
+        centroids = []
+        members = []
+        for label in sorted(set(labels) - {-1}):
+            indices = np.flatnonzero(labels == label)
+            centroids.append(np.asarray(vectors[indices].mean(axis=0)).ravel())
+            members.append(indices)
+        return centroids, members
+    
+    def compact_clusters(self):
+        """Full re-cluster of the corpus, replacing all persisted cluster state.
+        
+        This is the periodic compaction step for incremental mode: it refits
+        the vectorizer on every article and rebuilds clusters from scratch.
+        """
+        articles = self.load_articles()
+        if len(articles) < 2:
+            return
+        
+        vectors = self.vectorize(articles)
+        labels = self.cluster_labels(articles, vectors=vectors)
+        centroids, members = self._cluster_means(vectors, labels)
+        
+        self.cluster_state.replace_all(
+            self.backend,
+            self.vectorizer if self.backend == 'tfidf' else None,
+            centroids,
+            [[articles.ids[i] for i in indices] for indices in members],
+            articles.latest_collected_date()
+        )
+        print(f"Compacted {len(articles)} articles into {len(members)} clusters")
+    
+    def _compaction_due(self):
+        last_compaction = self.cluster_state.get_value('last_compaction')
+        if last_compaction is None or self.cluster_state.get_value('backend') != self.backend:
+            return True
+        if self.backend == 'tfidf' and self.cluster_state.load_vectorizer() is None:
+            return True
+        age = datetime.now() - datetime.fromisoformat(last_compaction)
+        return age.total_seconds() >= CLUSTER_COMPACTION_INTERVAL
+    
+    def _live_since(self):
+        return (datetime.now() - timedelta(hours=CLUSTER_LIVE_HOURS)).isoformat()
+    
+    def update_clusters(self):
+        """Fold articles collected since the last run into the live clusters.
+        
+        New articles are compared only against centroids of live clusters;
+        those close enough (cosine >= 1 - eps) join the nearest one, and the
+        leftovers are clustered among themselves to open new clusters.
+        Unclustered articles from the live window join the new ones in both
+        steps, so a story whose sources arrive in separate runs still forms
+        a cluster. A full compaction runs instead when one is due.
+        """
+        if self._compaction_due():
+            self.compact_clusters()
+            return
+        
+        watermark = self.cluster_state.get_value('watermark')
+        articles = self.load_articles(since=watermark, unclustered_since=self._live_since())
+        new = articles.collected > np.datetime64(watermark) if watermark else np.ones(len(articles), dtype=bool)
+        if not new.any():
+            # Without new articles the unclustered ones would only pair up as they did last run
+            return
+        
+        # Project articles into the space the persisted centroids live in, grown by
+        # the terms the new stories introduce so they don't cluster on leftover words
+        vectorizer = self.cluster_state.load_vectorizer()
+        extended = self.extend_vocabulary(vectorizer, articles) if vectorizer is not None else None
+        vectorizer = extended or vectorizer
+        vectors = self.vectorize(articles, vectorizer=vectorizer)
+        cluster_ids, sizes, centroids = self.cluster_state.load_live_clusters(self._live_since(), vectors.shape[1])
+        
+        updated = {}
+        leftover = np.arange(len(articles))
+        if len(cluster_ids):
+            # Cosine similarity of every article to every live centroid
+            norms = np.linalg.norm(centroids, axis=1)
+            norms[norms == 0] = 1.0
+            similarities = np.asarray(vectors @ (centroids / norms[:, None]).T)
+            best = similarities.argmax(axis=1)
+            assigned = similarities[np.arange(len(articles)), best] >= 1 - CLUSTER_EPS
+            
+            for position in np.unique(best[assigned]):
+                indices = np.flatnonzero(assigned & (best == position))
+                total = sizes[position] + len(indices)
+                centroid = (centroids[position] * sizes[position]
+                            + np.asarray(vectors[indices].sum(axis=0)).ravel()) / total
+                updated[cluster_ids[position]] = (
+                    centroid, total, [articles.ids[i] for i in indices]
+                )
+            leftover = np.flatnonzero(~assigned)
+        
+        new_centroids, new_members = [], []
+        if len(leftover) >= 2:
+            leftover_articles = articles.take(leftover)
+            labels = self.cluster_labels(leftover_articles, vectors=vectors[leftover])
+            new_centroids, member_indices = self._cluster_means(vectors[leftover], labels)
+            new_members = [[leftover_articles.ids[i] for i in indices] for indices in member_indices]
+        
+        self.cluster_state.apply_increment(
+            updated, new_centroids, new_members,
+            articles.latest_collected_date(),
+            extended
+        )
+        print(f"Assigned {len(articles) - len(leftover)} new or unclustered articles to {len(updated)} clusters, "
+              f"opened {len(new_members)} new clusters")
+    
+    def load_live_clusters(self):
+        """Load the member articles of every live persisted cluster, with their entity sets."""
+        cluster_ids, _, _ = self.cluster_state.load_live_clusters(self._live_since())
+        members = self.cluster_state.load_members(cluster_ids)
+        clusters = [self.load_articles_by_ids(article_ids) for article_ids in members.values()]
+        self.load_entity_sets([article for cluster in clusters for article in cluster])
+        return clusters
     
     def generate_cluster_headline(self, cluster_articles):
         """Generate a representative headline for the cluster."""
@@ -136,45 +441,94 @@ class EventClusterer:
     
     def calculate_importance_score(self, cluster_articles):
         """Calculate importance score for ranking clusters."""
-        source_count = len(cluster_articles)
-        
-        # Political diversity bonus
-        political_leans = set(article['political_lean'] for article in cluster_articles)
-        diversity_bonus = len(political_leans) * 2  # Bonus for cross-spectrum coverage
-        
-        # Recency weight (articles from today get bonus)
-        today = datetime.now().date()
-        recent_count = 0
-        for article in cluster_articles:
-            article_date = datetime.fromisoformat(article['collected_date']).date()
-            if article_date == today:
-                recent_count += 1
-        
-        recency_weight = recent_count * 1.5
-        
-        # Named entity importance (simple heuristic)
-        all_text = ' '.join([f"{a['title']} {a['content']}" for a in cluster_articles])
-        entities = self.extract_named_entities(all_text)
-        entity_importance = len(entities) * 0.5
-        
-        total_score = source_count * 2 + diversity_bonus + recency_weight + entity_importance
+        return float(self.calculate_importance_scores([cluster_articles])[0])
+    
+    def calculate_importance_scores(self, clusters):
+        """Importance scores of clusters given as lists of articles.
         
-        return total_score
+        Gathers the per-article columns once and scores every cluster in one
+        ``importance_scores`` pass. Articles without a stored entity set
+        (plain dicts) have their entities extracted from their text.
+        """
+        articles = [article for cluster in clusters for article in cluster]
+        sizes = [len(cluster) for cluster in clusters]
+        owner = np.repeat(np.arange(len(clusters)), sizes)
+        leans = {}
+        lean_codes = np.array([leans.setdefault(a['political_lean'], len(leans)) for a in articles], dtype=np.int64)
+        collected = np.array([a['collected_date'] for a in articles], dtype='datetime64[us]')
+        entity_sets = [
+            a.entities if isinstance(a, Article) and a.entities is not None
+            else self.extract_named_entities(article_entity_text(a['title'], article_clean_content(a)))
+            for a in articles
+        ]
+        # Set unions run in C; cheaper than building an entity matrix for records
+        ends = np.cumsum(sizes)
+        entity_count = np.array([len(set().union(*entity_sets[end - size:end])) for size, end in zip(sizes, ends)],
+                                dtype=np.int64)
+        return self.importance_scores(owner, len(clusters), lean_codes, collected, entity_count)
     
-    def get_top_stories(self, max_stories=15):
-        """Get top news stories clustered by event."""
-        articles = self.load_articles()
+    def batch_importance_scores(self, articles, members):
+        """Importance scores of clusters given as row indices into an ``ArticleBatch``."""
+        rows = np.concatenate(members) if members else np.zeros(0, dtype=np.intp)
+        owner = np.repeat(np.arange(len(members)), [len(indices) for indices in members])
+        # Distinct entities per cluster: nonzero columns of the cluster x entity product
+        membership = sparse.csr_matrix(
+            (np.ones(len(rows)), (owner, np.arange(len(rows)))), shape=(len(members), len(rows))
+        )
+        entity_count = (membership @ self.entity_matrix(articles)[rows]).getnnz(axis=1)
+        return self.importance_scores(owner, len(members), articles.lean_codes[rows], articles.collected[rows],
+                                      entity_count)
+    
+    @staticmethod
+    def importance_scores(owner, cluster_count, lean_codes, collected, entity_count):
+        """Score every cluster at once from per-article arrays.
         
-        if not articles:
-            print("No articles found for clustering")
-            return []
+        ``owner`` is each article's cluster index; ``lean_codes`` and
+        ``collected`` (``datetime64``) are in the same order, and
+        ``entity_count`` holds each cluster's distinct named entities. A
+        cluster scores 2 per source, 2 per distinct political lean, 1.5 per
+        article collected today and 0.5 per distinct entity.
+        """
+        with span('cluster.importance'):
+            source_count = np.bincount(owner, minlength=cluster_count)
+            
+            # Political diversity bonus: distinct (cluster, lean) pairs per cluster
+            lean_count = int(lean_codes.max()) + 1 if len(lean_codes) else 1
+            pairs = np.unique(owner * lean_count + lean_codes)
+            diversity = np.bincount(pairs // lean_count, minlength=cluster_count)
+            
+            # Recency weight (articles from today get bonus)
+            today = np.datetime64(datetime.now().date())
+            recent_count = np.bincount(owner, weights=collected.astype('datetime64[D]') == today,
+                                       minlength=cluster_count)
+            
+            return source_count * 2 + diversity * 2 + recent_count * 1.5 + entity_count * 0.5
+    
+    def get_top_stories(self, max_stories=15, incremental=False):
+        """Get top news stories clustered by event.
         
-        # Cluster articles into events
-        clusters = self.cluster_articles(articles)
+        In incremental mode only newly collected articles are clustered and
+        stories are built from the persisted live clusters.
+        """
+        if incremental:
+            self.update_clusters()
+            clusters = self.load_live_clusters()
+            scores = self.calculate_importance_scores(clusters)
+        else:
+            articles = self.load_articles()
+            
+            if not articles:
+                print("No articles found for clustering")
+                return []
+            
+            # Cluster articles into events, scoring them straight from the batch columns
+            members = self.cluster_members(articles)
+            clusters = [articles.records(indices) for indices in members]
+            scores = self.batch_importance_scores(articles, members)
         
         # Create story objects with metadata
         stories = []
-        for cluster in clusters:
+        for cluster, score in zip(clusters, scores):
             if len(cluster) >= 2:  # Only include stories covered by multiple sources
                 story = {
                     'id': hashlib.md5(str(sorted([a['id'] for a in cluster])).encode()).hexdigest(),
@@ -183,7 +537,7 @@ class EventClusterer:
                     'source_count': len(cluster),
                     'political_diversity': len(set(a['political_lean'] for a in cluster)),
                     'sources_by_lean': self._group_sources_by_lean(cluster),
-                    'importance_score': self.calculate_importance_score(cluster)
+                    'importance_score': float(score)
                 }
                 stories.append(story)
         
@@ -193,6 +547,9 @@ class EventClusterer:
         # Quality over quantity - return what we have, don't force max_stories
         top_stories = stories[:max_stories] if len(stories) >= max_stories else stories
         
+        # Only the stories that go on to synthesis need article bodies
+        self.load_content([article for story in top_stories for article in story['articles']])
+        
         print(f"Found {len(stories)} quality story clusters (showing top {len(top_stories)}):")
         for i, story in enumerate(top_stories):
             print(f"{i+1}. {story['headline']} (Score: {story['importance_score']:.1f}, Sources: {story['source_count']})")
@@ -213,7 +570,7 @@ class EventClusterer:
 def main():
     """Test the clustering algorithm."""
     clusterer = EventClusterer()
-    top_stories = clusterer.get_top_stories(10)
+    top_stories = clusterer.get_top_stories(10, incremental='--incremental' in sys.argv)
     
     print(f"\n=== TOP 10 STORIES ===")
     for i, story in enumerate(top_stories, 1):
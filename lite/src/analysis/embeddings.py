@@ -0,0 +1,163 @@
+"""Sentence-transformer embedding backend with a persistent vector store."""
+
+import json
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+class EmbeddingStore:
+    """Append-only, memory-mapped float32 vector store keyed by article id.
+
+    Vectors live in ``<prefix>.f32`` as contiguous rows and their article
+    ids in ``<prefix>.ids`` (one per line, same order); ``<prefix>.json``
+    records the dimension and model so a model change never mixes vector
+    spaces. Rows are only ever appended, so reads go through a read-only
+    memmap and never load the whole file into memory.
+    """
+
+    def __init__(self, prefix, model_name: str, dimension: Optional[int] = None):
+        self.prefix = str(prefix)
+        self.vectors_path = self.prefix + '.f32'
+        self.ids_path = self.prefix + '.ids'
+        self.meta_path = self.prefix + '.json'
+        self.model_name = model_name
+        self.dimension = dimension
+        self._rows: Dict[str, int] = {}
+        self._memmap = None
+        self._open()
+
+    def _open(self):
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path) as f:
+                meta = json.load(f)
+            if meta['model'] != self.model_name or self.dimension not in (None, meta['dimension']):
+                raise ValueError(
+                    f"Embedding store {self.prefix} was built with {meta['model']} "
+                    f"({meta['dimension']}d); refusing to mix in {self.model_name}"
+                )
+            self.dimension = meta['dimension']
+        else:
+            if self.dimension is None:
+                raise ValueError(f"Embedding store {self.prefix} does not exist and no dimension was given")
+            os.makedirs(os.path.dirname(self.prefix) or '.', exist_ok=True)
+            with open(self.meta_path, 'w') as f:
+                json.dump({'dimension': self.dimension, 'model': self.model_name}, f)
+
+        ids = []
+        if os.path.exists(self.ids_path):
+            with open(self.ids_path) as f:
+                ids = f.read().splitlines()
+
+        # Vectors are written before ids, so a torn append leaves extra
+        # vector rows that are simply ignored (and later overwritten)
+        stored_rows = os.path.getsize(self.vectors_path) // (4 * self.dimension) \
+            if os.path.exists(self.vectors_path) else 0
+        ids = ids[:stored_rows]
+        self._rows = {article_id: row for row, article_id in enumerate(ids)}
+        self._remap(len(ids))
+
+    def _remap(self, rows: int):
+        self._memmap = np.memmap(self.vectors_path, dtype=np.float32, mode='r',
+                                 shape=(rows, self.dimension)) if rows else None
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, article_id):
+        return article_id in self._rows
+
+    def missing(self, article_ids: List[str]) -> List[str]:
+        """Ids from ``article_ids`` that have no stored vector yet."""
+        return [article_id for article_id in dict.fromkeys(article_ids) if article_id not in self._rows]
+
+    def append(self, article_ids: List[str], vectors: np.ndarray):
+        """Append vectors for new article ids."""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if vectors.shape != (len(article_ids), self.dimension):
+            raise ValueError(f"Expected {len(article_ids)}x{self.dimension} vectors, got {vectors.shape}")
+        if not article_ids:
+            return
+
+        start = len(self._rows)
+        with open(self.vectors_path, 'r+b' if os.path.exists(self.vectors_path) else 'wb') as f:
+            f.seek(start * self.dimension * 4)
+            f.write(vectors.tobytes())
+            f.truncate()
+        with open(self.ids_path, 'a') as f:
+            f.write(''.join(f"{article_id}\n" for article_id in article_ids))
+
+        for offset, article_id in enumerate(article_ids):
+            self._rows[article_id] = start + offset
+        self._remap(len(self._rows))
+
+    def get(self, article_ids: List[str]) -> np.ndarray:
+        """Stored vectors for ``article_ids`` as an in-memory array."""
+        rows = [self._rows[article_id] for article_id in article_ids]
+        if not rows:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        return np.asarray(self._memmap[rows])
+
+
+class SentenceEmbedder:
+    """Encode article text with a sentence-transformers model, loaded lazily."""
+
+    def __init__(self, model_name: str, batch_size: int = 64):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self._model = None
+
+    @property
+    def model(self):
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(self.model_name)
+        return self._model
+
+    @property
+    def dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts in batches into L2-normalized float32 vectors."""
+        return self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        ).astype(np.float32)
+
+
+class EmbeddingBackend:
+    """Article vectors from a sentence embedder, encoded at most once per article."""
+
+    def __init__(self, embedder: SentenceEmbedder, store_prefix):
+        self.embedder = embedder
+        self.store_prefix = store_prefix
+        self._store = None
+
+    @property
+    def store(self) -> EmbeddingStore:
+        if self._store is None:
+            # An existing store knows its own dimension, so the model is only
+            # loaded when there is something new to encode
+            dimension = None if os.path.exists(f"{self.store_prefix}.json") else self.embedder.dimension
+            self._store = EmbeddingStore(self.store_prefix, self.embedder.model_name, dimension)
+        return self._store
+
+    def vectors(self, article_ids: List[str], texts: List[str]) -> np.ndarray:
+        """Vectors for the given articles, encoding only ones not seen before."""
+        missing = set(self.store.missing(article_ids))
+        if missing:
+            new_ids = []
+            new_texts = []
+            for article_id, text in zip(article_ids, texts):
+                if article_id in missing:
+                    new_ids.append(article_id)
+                    new_texts.append(text)
+                    missing.discard(article_id)
+            self.store.append(new_ids, self.embedder.encode(new_texts))
+            print(f"Encoded {len(new_ids)} new article embeddings")
+        return self.store.get(article_ids)
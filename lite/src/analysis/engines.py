@@ -0,0 +1,162 @@
+"""Pluggable engines that turn article vectors into DBSCAN distance input.
+
+Every engine returns a distance structure DBSCAN accepts with
+``metric='precomputed'``. The dense engine materializes the full n x n
+matrix; the sparse engine only keeps edges that can fall inside the DBSCAN
+radius, so memory is linear in the number of neighbor edges.
+"""
+
+import numpy as np
+from scipy import sparse
+from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.neighbors import NearestNeighbors
+from sklearn.preprocessing import normalize
+
+from src.monitoring.metrics import span
+
+# Maximum similarity bonus for articles sharing all of their named entities
+ENTITY_BOOST_WEIGHT = 0.3
+
+
+def entity_pair_boost(entity_matrix, rows, cols):
+    """Jaccard entity-overlap bonus for the given article pairs."""
+    sizes = np.asarray(entity_matrix.sum(axis=1)).ravel()
+    overlap = np.asarray(entity_matrix[rows].multiply(entity_matrix[cols]).sum(axis=1)).ravel()
+    union = sizes[rows] + sizes[cols] - overlap
+
+    boost = np.zeros(len(rows), dtype=np.float64)
+    shared = overlap > 0
+    boost[shared] = (overlap[shared] / union[shared]) * ENTITY_BOOST_WEIGHT
+    return boost
+
+
+def entity_overlap_boost(entity_matrix):
+    """Entity-overlap bonus for every article pair with shared entities.
+
+    Returns a sparse matrix holding 0.3 * |A & B| / |A | B| for i != j;
+    pairs without a shared entity get no bonus and are not stored.
+    """
+    intersections = (entity_matrix @ entity_matrix.T).tocoo()
+    sizes = np.asarray(entity_matrix.sum(axis=1)).ravel()
+
+    off_diagonal = intersections.row != intersections.col
+    rows = intersections.row[off_diagonal]
+    cols = intersections.col[off_diagonal]
+    overlap = intersections.data[off_diagonal]
+    union = sizes[rows] + sizes[cols] - overlap
+
+    boost = (overlap / union) * ENTITY_BOOST_WEIGHT
+    return sparse.csr_matrix((boost, (rows, cols)), shape=intersections.shape)
+
+
+class DenseSimilarityEngine:
+    """Full pairwise similarity matrix; quadratic memory, kept as a reference."""
+
+    name = 'dense'
+
+    def similarity_matrix(self, vectors, entity_matrix):
+        """Cosine similarity for all pairs, enhanced with entity overlap."""
+        with span('cluster.similarity', engine=self.name):
+            similarity_matrix = cosine_similarity(vectors)
+
+        with span('cluster.entity_boost', engine=self.name):
+            boost = entity_overlap_boost(entity_matrix).tocoo()
+            similarity_matrix[boost.row, boost.col] = np.minimum(
+                1.0, similarity_matrix[boost.row, boost.col] + boost.data
+            )
+        return similarity_matrix
+
+    def distance_graph(self, vectors, entity_matrix, eps):
+        # Ensure all values are valid distances (0 to 1)
+        return np.clip(1 - self.similarity_matrix(vectors, entity_matrix), 0, 1)
+
+
+class SparseNeighborEngine:
+    """Radius neighbor search producing a sparse CSR distance graph.
+
+    The entity bonus can raise a pair's similarity by at most
+    ENTITY_BOOST_WEIGHT, so a radius search at ``eps + ENTITY_BOOST_WEIGHT``
+    on the raw vectors finds every pair that could end up within ``eps``.
+    The bonus is then applied to those candidate edges only, and edges
+    still beyond ``eps`` are dropped, giving the same neighborhoods as the
+    dense engine.
+
+    Dense vectors (embeddings) are searched with faiss when it is
+    installed; sparse TF-IDF vectors use scikit-learn's chunked brute-force
+    search, which never densifies the input.
+    """
+
+    name = 'sparse'
+
+    # Query rows per faiss range search, bounding result buffer size
+    FAISS_BATCH_SIZE = 4096
+
+    def candidate_graph(self, vectors, radius):
+        """CSR graph of cosine distances for all pairs within ``radius``."""
+        if not sparse.issparse(vectors):
+            graph = self._faiss_radius_graph(vectors, radius)
+            if graph is not None:
+                return graph
+
+        neighbors = NearestNeighbors(radius=radius, metric='cosine', algorithm='brute')
+        neighbors.fit(vectors)
+        return neighbors.radius_neighbors_graph(vectors, mode='distance')
+
+    def _faiss_radius_graph(self, vectors, radius):
+        try:
+            import faiss
+        except ImportError:
+            return None
+
+        vectors = normalize(np.asarray(vectors, dtype=np.float32)).astype(np.float32)
+        index = faiss.IndexFlatIP(vectors.shape[1])
+        index.add(vectors)
+
+        indptr = [0]
+        indices = []
+        distances = []
+        for start in range(0, len(vectors), self.FAISS_BATCH_SIZE):
+            limits, similarities, neighbors = index.range_search(
+                vectors[start:start + self.FAISS_BATCH_SIZE], 1 - radius
+            )
+            indices.append(neighbors)
+            distances.append(np.clip(1 - similarities, 0, 1))
+            indptr.extend(indptr[-1] + limits[1:])
+
+        return sparse.csr_matrix(
+            (np.concatenate(distances).astype(np.float64), np.concatenate(indices), indptr),
+            shape=(len(vectors), len(vectors))
+        )
+
+    def distance_graph(self, vectors, entity_matrix, eps):
+        with span('cluster.similarity', engine=self.name):
+            candidates = self.candidate_graph(vectors, eps + ENTITY_BOOST_WEIGHT).tocoo()
+        rows, cols = candidates.row, candidates.col
+
+        similarity = 1 - candidates.data
+        off_diagonal = rows != cols
+        with span('cluster.entity_boost', engine=self.name):
+            similarity[off_diagonal] += entity_pair_boost(
+                entity_matrix, rows[off_diagonal], cols[off_diagonal]
+            )
+        distance = np.clip(1 - np.minimum(1.0, similarity), 0, 1)
+
+        # Explicit zeros must survive: a stored 0 means "identical", not "absent"
+        keep = distance <= eps
+        return sparse.csr_matrix(
+            (distance[keep], (rows[keep], cols[keep])), shape=candidates.shape
+        )
+
+
+ENGINES = {
+    DenseSimilarityEngine.name: DenseSimilarityEngine,
+    SparseNeighborEngine.name: SparseNeighborEngine,
+}
+
+
+def get_engine(name):
+    """Instantiate a clustering engine by name."""
+    try:
+        return ENGINES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown clustering engine: {name}")
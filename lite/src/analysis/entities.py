@@ -0,0 +1,51 @@
+"""Named entity extraction and per-article entity persistence."""
+
+import re
+from typing import Dict, Iterable, Set
+
+from src.data.database import fetch_by_ids
+
+# Basic patterns for important entities, compiled once per process
+ENTITY_PATTERNS = {
+    'people': re.compile(r'\b[A-Z][a-z]+ [A-Z][a-z]+\b', re.IGNORECASE),
+    'organizations': re.compile(r'\b(?:NATO|EU|UN|FBI|CIA|GOP|NASA|WHO)\b', re.IGNORECASE),
+    'countries': re.compile(r'\b(?:US|USA|China|Russia|Ukraine|Israel|Iran|UK|France|Germany)\b', re.IGNORECASE),
+    'dates': re.compile(r'\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2}(?:st|nd|rd|th)?\b', re.IGNORECASE)
+}
+
+def extract_named_entities(text: str) -> Set[str]:
+    """Simple named entity extraction for event validation."""
+    entities = set()
+    for pattern in ENTITY_PATTERNS.values():
+        entities.update(match.lower() for match in pattern.findall(text))
+    return entities
+
+
+def article_entity_text(title: str, content: str) -> str:
+    """Text an article's entities are extracted from."""
+    return f"{title} {content or ''}"
+
+
+def save_article_entities(conn, entities_by_article: Dict[str, Set[str]]):
+    """Persist extracted entity sets; caller owns the transaction."""
+    conn.executemany(
+        'INSERT OR IGNORE INTO article_entities (article_id, entity) VALUES (?, ?)',
+        [(article_id, entity)
+         for article_id, entities in entities_by_article.items()
+         for entity in entities]
+    )
+
+
+def load_article_entities(conn, article_ids: Iterable[str]) -> Dict[str, Set[str]]:
+    """Load stored entity sets for the given article ids.
+
+    Articles without stored rows are absent from the result.
+    """
+    entities = {}
+    rows = fetch_by_ids(
+        conn, 'SELECT article_id, entity FROM article_entities WHERE article_id IN ({placeholders})',
+        article_ids
+    )
+    for article_id, entity in rows:
+        entities.setdefault(article_id, set()).add(entity)
+    return entities
@@ -0,0 +1,139 @@
+"""Versioned in-process response cache with strong ETags and compressed bodies."""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from src.api.compression import compress, negotiate
+from config import COMPRESSION_MIN_SIZE
+
+
+class CachedResponse:
+    """A serialized JSON body and its strong ETag.
+
+    Bodies of at least ``COMPRESSION_MIN_SIZE`` bytes are sent compressed
+    to clients that accept it. Each coding is computed once per entry and
+    kept, so cache hits never compress again.
+    """
+
+    __slots__ = ('body', 'etag', 'encoded')
+
+    def __init__(self, payload: Any):
+        self._set_body(json.dumps(payload, separators=(',', ':')).encode())
+
+    @classmethod
+    def from_body(cls, body: bytes) -> 'CachedResponse':
+        """Wrap an already serialized JSON body."""
+        response = cls.__new__(cls)
+        response._set_body(body)
+        return response
+
+    def _set_body(self, body: bytes):
+        self.body = body
+        self.etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        self.encoded = {}
+
+    def encoded_body(self, encoding: str) -> bytes:
+        body = self.encoded.get(encoding)
+        if body is None:
+            body = self.encoded[encoding] = compress(self.body, encoding)
+        return body
+
+    def representation_etag(self, encoding) -> str:
+        """Strong ETags must differ between content codings of the same body."""
+        return self.etag if encoding is None else f'{self.etag[:-1]}-{encoding}"'
+
+    def matches(self, request: Request) -> bool:
+        """True if the client already holds this exact body, in any coding."""
+        if_none_match = request.headers.get('if-none-match')
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == '*':
+            return True
+        # Compressing proxies may hand the tag back weakened (W/"...")
+        tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+        return any(self.representation_etag(encoding) in tags for encoding in (None, 'br', 'gzip'))
+
+    def to_response(self, request: Request) -> Response:
+        """Full 200 response, or an empty 304 when the client's copy is current."""
+        encoding = None
+        if len(self.body) >= COMPRESSION_MIN_SIZE:
+            encoding = negotiate(request.headers.get('accept-encoding'))
+        # no-cache: clients may store the body but must revalidate every time
+        headers = {'ETag': self.representation_etag(encoding), 'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding'}
+        if self.matches(request):
+            return Response(status_code=304, headers=headers)
+        if encoding is None:
+            return Response(content=self.body, media_type='application/json', headers=headers)
+        headers['Content-Encoding'] = encoding
+        return Response(content=self.encoded_body(encoding), media_type='application/json', headers=headers)
+
+
+class ResponseCache:
+    """Cache serialized responses until the underlying data version changes.
+
+    ``version_fn`` reads the stories-table version counter the processor
+    bumps on every write. It is consulted at most once per
+    ``check_interval`` seconds, so under load the common path is a dict
+    lookup and never touches the database. Version reads and builds are
+    blocking database calls and go through ``run`` (a coroutine function
+    such as ``DatabaseExecutor.run``) so they never stall the event loop.
+    """
+
+    def __init__(self, version_fn: Callable[[], int], run: Callable[..., Awaitable[Any]],
+                 check_interval: float = 1.0, max_entries: int = 512):
+        self.version_fn = version_fn
+        self.run = run
+        self.check_interval = check_interval
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Hashable, CachedResponse]' = OrderedDict()
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    async def _refresh_version(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+        version = await self.run(self.version_fn)
+        with self._lock:
+            self._checked_at = now
+            if version != self._version:
+                self._version = version
+                self._entries.clear()
+
+    async def get(self, key: Hashable, build: Callable[[], Any]) -> CachedResponse:
+        """Return the cached response for ``key``, building it on a miss.
+
+        ``build`` returns either a JSON-serializable payload or a ready
+        ``CachedResponse``.
+        """
+        await self._refresh_version()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+            version = self._version
+
+        built = await self.run(build)
+        entry = built if isinstance(built, CachedResponse) else CachedResponse(built)
+        with self._lock:
+            # Don't store a body built against data that changed meanwhile
+            if version == self._version:
+                self._entries[key] = entry
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self):
+        """Drop every entry and re-read the version on the next request."""
+        with self._lock:
+            self._entries.clear()
+            self._checked_at = 0.0
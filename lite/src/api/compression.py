@@ -0,0 +1,54 @@
+"""HTTP content-coding helpers shared by static assets and JSON responses.
+
+Brotli is used when the optional ``brotli`` package is installed; gzip is
+always available. ``negotiate`` picks the best coding a client accepts,
+preferring Brotli, which is smaller for text.
+"""
+
+import gzip
+from typing import Dict, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # Optional: fall back to gzip only
+    brotli = None
+
+# Preference order, with the file suffix precompressed variants are stored under
+ENCODINGS: Tuple[Tuple[str, str], ...] = (('br', '.br'), ('gzip', '.gz')) if brotli else (('gzip', '.gz'),)
+
+
+def accepted_encodings(accept_encoding: Optional[str]) -> Dict[str, float]:
+    """Codings in an Accept-Encoding header mapped to their q-values."""
+    accepted = {}
+    for part in (accept_encoding or '').split(','):
+        coding, _, params = part.strip().partition(';')
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    return accepted
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """Best coding in ``ENCODINGS`` the client accepts, or None for identity."""
+    accepted = accepted_encodings(accept_encoding)
+    for encoding, _ in ENCODINGS:
+        if accepted.get(encoding, accepted.get('*', 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str, best: bool = False) -> bytes:
+    """``body`` in ``encoding``; ``best`` trades CPU for size, for build-time assets."""
+    if encoding == 'br':
+        return brotli.compress(body, quality=11 if best else 5)
+    if encoding == 'gzip':
+        # mtime=0 keeps the output, and so hashes and ETags, deterministic
+        return gzip.compress(body, compresslevel=9 if best else 6, mtime=0)
+    raise ValueError(f"Unsupported content coding: {encoding}")
@@ -0,0 +1,39 @@
+"""Bounded thread pool that keeps blocking SQLite calls off the event loop."""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+
+class DatabaseExecutor:
+    """Run synchronous data-access calls on a small pool of worker threads.
+
+    Each worker thread lazily opens its own connection through
+    ``src.data.database.get_connection`` (connections are thread-local), so
+    the pool doubles as a bounded connection pool. With ``max_workers=0``
+    calls run inline on the event loop, which is the old blocking behaviour
+    and is kept only for benchmarking.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='db')
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Await ``fn(*args, **kwargs)`` executed on a database thread."""
+        if self.max_workers <= 0:
+            return fn(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -0,0 +1,148 @@
+"""Server-sent event fan-out of story writes to connected browsers."""
+
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, Set, Tuple
+
+# Sent once per stream: how long browsers wait before reconnecting (ms)
+RETRY_MS = 3000
+
+
+def format_event(event_id: int, payload: str, event: str = 'story') -> str:
+    """One SSE message; ``payload`` is single-line JSON."""
+    return f"id: {event_id}\nevent: {event}\ndata: {payload}\n\n"
+
+
+class _Client:
+    __slots__ = ('queue', 'overflowed', 'after')
+
+    def __init__(self, queue_size: int, after: int):
+        # (event id, message); None ends the stream
+        self.queue: 'asyncio.Queue[Optional[Tuple[int, str]]]' = asyncio.Queue(queue_size)
+        self.overflowed = False
+        self.after = after  # Events up to this id were sent before the stream started, or predate it
+
+
+class StoryEventHub:
+    """Broadcast new ``story_events`` rows to every connected event stream.
+
+    Stories are usually written by the pipeline worker process, so the hub
+    learns about them from the database: a single poller task reads the
+    rows after the last one it saw, and only while someone is listening.
+    Database load therefore stays the same however many browsers connect.
+    Each message is formatted once and put on every client's bounded
+    queue. A client that falls ``queue_size`` events behind is sent a
+    ``resync`` event and dropped rather than buffered without limit. A
+    browser that reconnects with ``Last-Event-ID`` is replayed what it
+    missed, or told to resync if that is more than a queue's worth.
+    """
+
+    def __init__(self, read_fn: Callable[[int, int], List[Tuple[int, str]]], latest_fn: Callable[[], int],
+                 run: Callable[..., Awaitable[Any]], poll_interval: float = 2.0, queue_size: int = 64,
+                 keepalive: float = 15.0):
+        self.read_fn = read_fn
+        self.latest_fn = latest_fn
+        self.run = run
+        self.poll_interval = poll_interval
+        self.queue_size = queue_size
+        self.keepalive = keepalive
+        self._clients: Set[_Client] = set()
+        self._last_id: Optional[int] = None
+        self._poller: Optional[asyncio.Task] = None
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    def _publish(self, event_id: int, message: str):
+        for client in list(self._clients):
+            try:
+                client.queue.put_nowait((event_id, message))
+            except asyncio.QueueFull:
+                client.overflowed = True
+                self._clients.discard(client)
+
+    async def _poll(self):
+        while self._clients:
+            try:
+                rows = await self.run(self.read_fn, self._last_id, self.queue_size)
+            except Exception as e:
+                print(f"Error reading story events: {e}")
+                rows = []
+            for event_id, payload in rows:
+                self._publish(event_id, format_event(event_id, payload))
+                self._last_id = event_id
+            if len(rows) < self.queue_size:
+                await asyncio.sleep(self.poll_interval)
+        # The next poller starts from whatever is newest when a client connects again
+        self._poller = None
+        self._last_id = None
+
+    def _register(self, after: int) -> Tuple[_Client, int]:
+        """Add a client; events after the returned id reach it through its queue."""
+        client = _Client(self.queue_size, after)
+        self._clients.add(client)
+        if self._poller is None:
+            self._poller = asyncio.create_task(self._poll())
+        return client, self._last_id
+
+    async def _missed(self, client: _Client, upto: int) -> List[str]:
+        """Messages between ``client.after`` and ``upto``, which its queue will not deliver."""
+        if client.after >= upto:
+            return []
+        rows = await self.run(self.read_fn, client.after, self.queue_size + 1)
+        if len(rows) > self.queue_size or (rows and rows[0][0] > client.after + 1):
+            # Too far behind, or the events it missed were already pruned
+            client.overflowed = True
+        return [format_event(event_id, payload) for event_id, payload in rows if event_id <= upto]
+
+    async def stream(self, last_event_id: Optional[str] = None) -> AsyncIterator[str]:
+        """SSE text for one client, until it disconnects or falls behind.
+
+        A new client starts after the newest event; a reconnecting one after
+        its ``Last-Event-ID``.
+        """
+        latest = await self.run(self.latest_fn)
+        try:
+            after = int(last_event_id) if last_event_id else latest
+        except ValueError:
+            after = latest
+        if self._last_id is None:
+            self._last_id = latest
+        client, upto = self._register(after)
+        try:
+            yield f"retry: {RETRY_MS}\n\n"
+            missed = await self._missed(client, upto)
+            if client.overflowed:
+                yield format_event(max(upto, client.after), '{}', event='resync')
+                return
+            for message in missed:
+                yield message
+            while True:
+                try:
+                    item = await asyncio.wait_for(client.queue.get(), self.keepalive)
+                except asyncio.TimeoutError:
+                    # Comment line; keeps proxies from closing an idle connection
+                    yield ": keepalive\n\n"
+                    continue
+                if item is None:
+                    return
+                event_id, message = item
+                if client.overflowed:
+                    yield format_event(self._last_id or event_id, '{}', event='resync')
+                    return
+                if event_id > client.after:
+                    yield message
+        finally:
+            self._clients.discard(client)
+
+    async def close(self):
+        """Stop polling and end every open stream; browsers reconnect on their own."""
+        for client in list(self._clients):
+            try:
+                client.queue.put_nowait(None)
+            except asyncio.QueueFull:
+                client.overflowed = True
+        self._clients.clear()
+        if self._poller is not None:
+            self._poller.cancel()
+            self._poller = None
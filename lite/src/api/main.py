@@ -1,179 +1,243 @@
 """FastAPI backend for the news bot web application."""
 
-from fastapi import FastAPI, HTTPException
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from typing import List, Dict, Any
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+import base64
+import json
 import sys
 import os
 
 # Import from proper paths when run from lite root
 from src.synthesis.processor import StoryProcessor
+from src.synthesis.rendering import format_source_subtitle
+from src.api.cache import CachedResponse, ResponseCache
+from src.api.db_executor import DatabaseExecutor
+from src.api.events import StoryEventHub
+from src.api.static import PrecompressedStaticFiles
+from src.data.search import search_articles, search_stories
+from src.pipeline.scheduler import PipelineScheduler
+from src.monitoring.metrics import REGISTRY
+from src.web.assets import PAGE, build_assets
+from config import (STORY_CACHE_CHECK_INTERVAL, STORY_CACHE_MAX_ENTRIES, API_DB_THREADS, PIPELINE_ENABLED,
+                    STATIC_BUILD_DIR, STORY_EVENTS_POLL_INTERVAL, STORY_EVENTS_QUEUE_SIZE, STORY_EVENTS_KEEPALIVE)
 
-app = FastAPI(title="News Bot API", description="Anti-echo chamber news aggregation API")
+# Collect -> cluster -> process every NEWS_UPDATE_INTERVAL, in a worker process
+scheduler = PipelineScheduler()
 
-# Mount static files (HTML, CSS, JS)
-app.mount("/static", StaticFiles(directory="src/web/static"), name="static")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build static files, set up the database, start the background pipeline, and stop it on shutdown."""
+    build_assets()
+    await db_executor.run(get_processor)
+    if PIPELINE_ENABLED:
+        scheduler.start()
+    yield
+    await story_events.close()
+    await scheduler.stop()
+    db_executor.shutdown()
 
-# Initialize processor
-processor = StoryProcessor()
+app = FastAPI(title="News Bot API", description="Anti-echo chamber news aggregation API", lifespan=lifespan)
+
+# Mount static files (HTML, CSS, JS), hashed and precompressed by build_assets()
+static_files = PrecompressedStaticFiles(STATIC_BUILD_DIR)
+app.mount("/static", static_files, name="static")
+
+# Created on first use (server startup), so importing this module never touches the database
+_processor: Optional[StoryProcessor] = None
+
+def get_processor() -> StoryProcessor:
+    """The API's story reader; its constructor creates the schema."""
+    global _processor
+    if _processor is None:
+        _processor = StoryProcessor()
+    return _processor
+
+# Blocking SQLite calls run on a bounded pool of threads, one connection each
+db_executor = DatabaseExecutor(API_DB_THREADS)
+
+# Serialized responses, reused until the processor writes new stories
+response_cache = ResponseCache(
+    lambda: get_processor().get_stories_version(),
+    db_executor.run,
+    check_interval=STORY_CACHE_CHECK_INTERVAL,
+    max_entries=STORY_CACHE_MAX_ENTRIES
+)
+
+# Story writes pushed to browsers over server-sent events, from one shared poller
+story_events = StoryEventHub(
+    lambda after_id, limit: get_processor().get_story_events(after_id, limit),
+    lambda: get_processor().get_latest_story_event_id(),
+    db_executor.run,
+    poll_interval=STORY_EVENTS_POLL_INTERVAL,
+    queue_size=STORY_EVENTS_QUEUE_SIZE,
+    keepalive=STORY_EVENTS_KEEPALIVE
+)
 
 @app.get("/")
-async def serve_homepage():
+async def serve_homepage(request: Request):
     """Serve the main HTML page."""
-    return FileResponse("src/web/static/index.html")
+    return await static_files.get_response(PAGE, request.scope)
 
 @app.get("/stories")
-async def serve_stories_page():
+async def serve_stories_page(request: Request):
     """Serve the main HTML page for stories route."""
-    return FileResponse("src/web/static/index.html")
+    return await static_files.get_response(PAGE, request.scope)
 
 @app.get("/story/{story_id}")
-async def serve_story_page(story_id: str):
+async def serve_story_page(story_id: str, request: Request):
     """Serve the main HTML page for individual story route."""
-    return FileResponse("src/web/static/index.html")
+    return await static_files.get_response(PAGE, request.scope)
+
+def encode_cursor(key, number: int) -> str:
+    """Opaque cursor for the page after the story with listing ``key``."""
+    raw = json.dumps([*key, number], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(cursor: str):
+    """Inverse of ``encode_cursor``: ((created_date, balance, id), number)."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_date, balance, story_id, number = json.loads(raw)
+        return (str(created_date), float(balance), str(story_id)), int(number)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def stored_timestamp(value: Optional[datetime]) -> Optional[str]:
+    """``value`` in the format ``created_date`` is stored in: naive local time, ISO 8601.
+    
+    Aware values are converted to local time first; naive ones are taken
+    as local already. Comparing the strings is then chronological.
+    """
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return value.isoformat()
+
+def build_story_list(limit: int = 20, cursor: Optional[str] = None, **filters) -> Dict[str, Any]:
+    """Build one page of the stories screen payload."""
+    after, offset = decode_cursor(cursor) if cursor else (None, 0)
+    stories, next_key = get_processor().get_stories_page(limit, after=after, **filters)
+    
+    # Transform for frontend consumption
+    story_list = []
+    for i, story in enumerate(stories, offset + 1):
+        story_item = {
+            'id': story['id'],
+            'number': i,
+            'title': story['event_headline'],
+            'subtitle': format_source_subtitle(story['references']),
+            'source_count': story['source_count'],
+            'political_balance_score': story['political_balance_score']
+        }
+        story_list.append(story_item)
+    
+    return {
+        'stories': story_list,
+        'next_cursor': encode_cursor(next_key, offset + len(stories)) if next_key else None
+    }
+
+def build_story_details(story_id: str) -> CachedResponse:
+    """Load the pre-rendered summary/details payload for one story."""
+    detail_json = get_processor().get_story_detail_json(story_id)
+    
+    if detail_json is None:
+        raise HTTPException(status_code=404, detail="Story not found")
+    
+    return CachedResponse.from_body(detail_json.encode())
 
 @app.get("/api/stories")
-async def get_all_stories() -> List[Dict[str, Any]]:
-    """Get all processed stories for the stories screen."""
+async def get_all_stories(
+    request: Request,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    min_sources: Optional[int] = Query(None, ge=0),
+    min_balance: Optional[float] = Query(None, ge=0.0, le=1.0),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None
+):
+    """Get a page of processed stories for the stories screen.
+    
+    Pass the returned ``next_cursor`` back as ``cursor`` for the next page.
+    """
+    filters = {
+        'min_sources': min_sources,
+        'min_balance': min_balance,
+        'since': stored_timestamp(since),
+        'until': stored_timestamp(until)
+    }
     try:
-        stories = processor.get_processed_stories(20)  # Get up to 20 stories
-        
-        # Transform for frontend consumption
-        story_list = []
-        for i, story in enumerate(stories, 1):
-            # Generate subtitle from news sources
-            references = story['references']  # Already parsed in get_processed_stories
-            sources = [ref['source'] for ref in references]
-            
-            # Remove duplicates while preserving order
-            unique_sources = []
-            for source in sources:
-                if source not in unique_sources:
-                    unique_sources.append(source)
-            
-            # Format sources nicely
-            if len(unique_sources) == 1:
-                subtitle = unique_sources[0]
-            elif len(unique_sources) == 2:
-                subtitle = f"{unique_sources[0]} & {unique_sources[1]}"
-            else:
-                subtitle = ", ".join(unique_sources[:-1]) + f" & {unique_sources[-1]}"
-            
-            story_item = {
-                'id': story['id'],
-                'number': i,
-                'title': story['event_headline'],
-                'subtitle': subtitle,
-                'source_count': story['source_count'],
-                'political_balance_score': story['political_balance_score']
-            }
-            story_list.append(story_item)
-        
-        return story_list
+        key = ('stories', limit, cursor, *filters.values())
+        cached = await response_cache.get(key, lambda: build_story_list(limit, cursor, **filters))
+        return cached.to_response(request)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching stories: {str(e)}")
 
+@app.get("/api/stories/events")
+async def stream_story_events(request: Request):
+    """Server-sent events: a ``story`` event for every story created or changed.
+    
+    Each event carries ``{"type": "created"|"updated", "story": {...}}`` with
+    the story in the ``/api/stories`` item format, minus its ``number``. A
+    ``resync`` event means updates were missed and the list should be
+    refetched.
+    """
+    return StreamingResponse(
+        story_events.stream(request.headers.get('last-event-id')),
+        media_type='text/event-stream',
+        # no-transform/X-Accel-Buffering: keep proxies from compressing or buffering the stream
+        headers={'Cache-Control': 'no-cache, no-transform', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.get("/api/story/{story_id}")
-async def get_story_details(story_id: str) -> Dict[str, Any]:
+async def get_story_details(story_id: str, request: Request):
     """Get detailed story information for summary/details screens."""
     try:
-        stories = processor.get_processed_stories(50)  # Get more to find the specific one
-        
-        # Find the story by ID
-        target_story = None
-        story_number = 0
-        for i, story in enumerate(stories, 1):
-            if story['id'] == story_id:
-                target_story = story
-                story_number = i
-                break
-        
-        if not target_story:
-            raise HTTPException(status_code=404, detail="Story not found")
-        
-        # Generate subtitle from news sources
-        references = target_story['references']
-        sources = [ref['source'] for ref in references]
-        
-        # Remove duplicates while preserving order
-        unique_sources = []
-        for source in sources:
-            if source not in unique_sources:
-                unique_sources.append(source)
-        
-        # Format sources nicely
-        if len(unique_sources) == 1:
-            subtitle = unique_sources[0]
-        elif len(unique_sources) == 2:
-            subtitle = f"{unique_sources[0]} & {unique_sources[1]}"
-        else:
-            subtitle = ", ".join(unique_sources[:-1]) + f" & {unique_sources[-1]}"
-        
-        # Process context section into bullet points
-        context_sentences = target_story['background_context'].split('. ')
-        context_bullets = [sentence.strip() + ('.' if not sentence.endswith('.') else '') 
-                          for sentence in context_sentences if sentence.strip()]
-        
-        # Process impact sections into bullet points
-        def split_into_bullets(text):
-            # Simple split by sentences, max 4 bullets
-            sentences = text.split('. ')
-            bullets = []
-            for sentence in sentences[:4]:
-                if sentence.strip():
-                    bullet = sentence.strip()
-                    if not bullet.endswith('.'):
-                        bullet += '.'
-                    bullets.append(bullet)
-            return bullets
-        
-        economic_bullets = split_into_bullets(target_story['economic_impact'])
-        social_bullets = split_into_bullets(target_story['social_values'])
-        practical_bullets = split_into_bullets(target_story['practical_solutions'])
-        
-        # Process political perspectives
-        conservative_text = target_story['conservative_view']
-        progressive_text = target_story['progressive_view']
-        
-        story_details = {
-            'id': target_story['id'],
-            'number': story_number,
-            'title': target_story['event_headline'],
-            'subtitle': subtitle,
-            'unified_summary': target_story['unified_summary'],
-            'background_context': {
-                'bullets': context_bullets
-            },
-            'economic_impact': {
-                'bullets': economic_bullets
-            },
-            'social_values': {
-                'bullets': social_bullets
-            },
-            'practical_solutions': {
-                'bullets': practical_bullets
-            },
-            'political_perspectives': {
-                'conservative': conservative_text,
-                'progressive': progressive_text
-            },
-            'references': target_story['references'],
-            'metadata': {
-                'source_count': target_story['source_count'],
-                'political_balance_score': target_story['political_balance_score'],
-                'created_date': target_story['created_date']
-            }
-        }
-        
-        return story_details
+        cached = await response_cache.get(('story', story_id), lambda: build_story_details(story_id))
+        return cached.to_response(request)
         
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching story details: {str(e)}")
 
+@app.get("/api/search")
+async def search(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200),
+    type: str = Query('stories', pattern='^(stories|articles)$'),
+    limit: int = Query(20, ge=1, le=50),
+    offset: int = Query(0, ge=0, le=1000)
+):
+    """Keyword search over stories or articles, ranked by bm25.
+    
+    Snippets are HTML-escaped with matches wrapped in <mark>. Pass the
+    returned ``next_offset`` back as ``offset`` for the next page.
+    """
+    search_fn = search_stories if type == 'stories' else search_articles
+    try:
+        page = await db_executor.run(search_fn, q, limit, offset, get_processor().database_path)
+        return CachedResponse({'query': q, 'type': type, **page}).to_response(request)
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error searching: {str(e)}")
+
+@app.get("/api/pipeline/status")
+async def pipeline_status():
+    """Background pipeline state and per-stage durations of the last run."""
+    return scheduler.status()
+
+@app.get("/api/metrics")
+async def metrics():
+    """Stage and database latency histograms in the Prometheus text format."""
+    return PlainTextResponse(REGISTRY.render_prometheus(), media_type="text/plain; version=0.0.4")
+
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint."""
@@ -0,0 +1,48 @@
+"""Static file serving for the build written by ``src/web/assets.py``."""
+
+import stat
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+from src.api.compression import ENCODINGS, negotiate
+from src.web.assets import is_hashed
+
+# Hashed names never change content, so browsers need not revalidate them
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """``StaticFiles`` that serves a file's ``.br``/``.gz`` sibling when the client accepts it.
+
+    Content-hashed names get an immutable cache lifetime; everything else
+    (``index.html``, plain names) is revalidated with its ETag.
+    """
+
+    def __init__(self, directory):
+        # The build directory is created at startup, after this app is mounted
+        super().__init__(directory=directory, check_dir=False)
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = None
+        encoding = negotiate(Headers(scope=scope).get('accept-encoding'))
+        if encoding is not None and scope['method'] in ('GET', 'HEAD'):
+            suffix = dict(ENCODINGS)[encoding]
+            try:
+                full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path + suffix)
+            except (OSError, ValueError):
+                stat_result = None
+            if stat_result and stat.S_ISREG(stat_result.st_mode):
+                # The media type is guessed from the name without the .br/.gz suffix
+                response = self.file_response(full_path, stat_result, scope)
+                if response.status_code != 304:
+                    response.headers['Content-Encoding'] = encoding
+        if response is None:
+            response = await super().get_response(path, scope)
+
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.headers['Cache-Control'] = IMMUTABLE if is_hashed(path) else 'no-cache'
+        return response
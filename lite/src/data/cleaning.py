@@ -0,0 +1,74 @@
+"""Ingest-time text cleaning and the derived text fields stored per article.
+
+Feed bodies arrive as HTML fragments. They are cleaned once when an
+article is stored, and the results are kept in the ``articles`` table next
+to the raw ``content``:
+
+    clean_content    tags removed, entities decoded, whitespace collapsed
+    lead_sentence    clean_content up to its first '.'
+    clustering_text  title + lead sentence, the text clustering vectorizes
+
+so clustering and synthesis read ready-to-use text and never parse HTML.
+"""
+
+import html
+import re
+from typing import Any, Mapping, Optional, Tuple
+
+_BLOCK_TAG_RE = re.compile(r'</?(?:p|br|div|li|ul|ol|h[1-6]|blockquote|figure|figcaption|tr|td)\b[^>]*>',
+                           re.IGNORECASE)
+_TAG_RE = re.compile(r'<[^>]+>')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Rows per UPDATE batch when backfilling articles stored before these columns existed
+BACKFILL_BATCH = 5000
+
+
+def clean_html(content: Optional[str]) -> str:
+    """Plain text of an HTML fragment: tags stripped, entities decoded, whitespace collapsed."""
+    if not content:
+        return ''
+    text = _BLOCK_TAG_RE.sub(' ', content)  # Keep words in adjacent blocks apart
+    text = _TAG_RE.sub('', text)
+    return _WHITESPACE_RE.sub(' ', html.unescape(text)).strip()
+
+
+def lead_sentence(clean_content: str) -> str:
+    """Everything before the first '.', or the whole text if there is none."""
+    return clean_content.split('.', 1)[0].strip()
+
+
+def clustering_text(title: str, lead: str) -> str:
+    """Text used to place an article in the vector space."""
+    return f"{title} {lead}"
+
+
+def text_fields(title: str, content: Optional[str]) -> Tuple[str, str, str]:
+    """``(clean_content, lead_sentence, clustering_text)`` for one article."""
+    clean = clean_html(content)
+    lead = lead_sentence(clean)
+    return clean, lead, clustering_text(title, lead)
+
+
+def article_clean_content(article: Mapping[str, Any]) -> str:
+    """Stored clean body of an article mapping, cleaning ``content`` only if it has none."""
+    clean = article.get('clean_content')
+    return clean if clean is not None else clean_html(article.get('content'))
+
+
+def backfill_text_fields(conn) -> int:
+    """Derive the text fields for articles stored without them; caller owns the transaction."""
+    last_rowid, updated = 0, 0
+    while True:
+        # Walk by rowid so only one batch of bodies is in memory at a time
+        rows = conn.execute('''
+            SELECT rowid, title, content FROM articles
+            WHERE rowid > ? AND clustering_text IS NULL ORDER BY rowid LIMIT ?
+        ''', (last_rowid, BACKFILL_BATCH)).fetchall()
+        if not rows:
+            return updated
+        conn.executemany(
+            'UPDATE articles SET clean_content = ?, lead_sentence = ?, clustering_text = ? WHERE rowid = ?',
+            [(*text_fields(title, content), rowid) for rowid, title, content in rows]
+        )
+        last_rowid, updated = rows[-1][0], updated + len(rows)
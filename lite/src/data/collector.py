@@ -0,0 +1,239 @@
+"""Concurrent RSS news collector for all configured sources."""
+
+import asyncio
+import hashlib
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
+from urllib.parse import urlparse
+import sys
+import os
+
+import feedparser
+import httpx
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+from src.analysis.entities import extract_named_entities, article_entity_text, save_article_entities
+from src.data.cleaning import text_fields
+from src.data.database import fetch_by_ids, get_connection, init_schema, transaction
+from src.data.dedup import SimHashIndex, canonicalize_url, simhash, word_count
+from src.monitoring.metrics import span
+from config import (DATABASE_PATH, NEWS_SOURCES, FEED_TIMEOUT, FEED_HOST_TIMEOUTS,
+                    FEED_MAX_CONNECTIONS, FEED_USER_AGENT, DEDUP_SIMHASH_DISTANCE,
+                    DEDUP_MIN_WORDS, DEDUP_WINDOW_HOURS)
+
+
+class NewsCollector:
+    """Fetch every configured RSS feed concurrently and store new articles.
+
+    Feeds are requested in parallel over one pooled HTTP client, using the
+    ETag / Last-Modified validators remembered from the previous poll so
+    unchanged feeds answer with a cheap 304. ``sources`` and
+    ``database_path`` can be overridden to point the collector at a local
+    stand-in server serving canned feeds.
+    """
+
+    def __init__(self, sources: Optional[Dict[str, List[Dict[str, str]]]] = None,
+                 database_path=None):
+        self.sources = sources if sources is not None else NEWS_SOURCES
+        self.database_path = database_path or DATABASE_PATH
+        init_schema(self.database_path)
+
+    def _load_feed_state(self) -> Dict[str, Dict[str, Optional[str]]]:
+        """Load stored conditional-request validators keyed by feed URL."""
+        cursor = get_connection(self.database_path).execute(
+            'SELECT feed_url, etag, last_modified FROM feed_state'
+        )
+        return {row[0]: {'etag': row[1], 'last_modified': row[2]} for row in cursor.fetchall()}
+
+    def _iter_feeds(self):
+        """Yield (political_lean, source) pairs for every configured feed."""
+        for lean, sources in self.sources.items():
+            for source in sources:
+                yield lean, source
+
+    @staticmethod
+    def _timeout_for(url: str) -> httpx.Timeout:
+        """Return the request timeout configured for the feed's host."""
+        host = urlparse(url).hostname or ''
+        return httpx.Timeout(FEED_HOST_TIMEOUTS.get(host, FEED_TIMEOUT))
+
+    async def fetch_feed(self, client: httpx.AsyncClient, lean: str, source: Dict[str, str],
+                         validators: Dict[str, Optional[str]]) -> Dict[str, Any]:
+        """Fetch one feed with a conditional GET and parse it off the event loop."""
+        url = source['rss']
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+
+        result = {
+            'url': url,
+            'source': source,
+            'lean': lean,
+            'status': None,
+            'etag': validators.get('etag'),
+            'last_modified': validators.get('last_modified'),
+            'entries': []
+        }
+
+        with span('collect.fetch', source=source['name']):
+            try:
+                response = await client.get(url, headers=headers, timeout=self._timeout_for(url))
+            except httpx.HTTPError as e:
+                print(f"Error fetching {source['name']}: {e}")
+                return result
+
+        result['status'] = response.status_code
+        if response.status_code == 304:
+            return result
+        if response.status_code != 200:
+            print(f"Unexpected status {response.status_code} from {source['name']}")
+            return result
+
+        result['etag'] = response.headers.get('ETag')
+        result['last_modified'] = response.headers.get('Last-Modified')
+
+        # feedparser is CPU-bound; keep it off the event loop
+        with span('collect.parse', source=source['name']):
+            parsed = await asyncio.to_thread(feedparser.parse, response.content)
+        result['entries'] = parsed.entries
+        return result
+
+    @staticmethod
+    def _entry_to_article(entry, source: Dict[str, str], lean: str, collected_date: str) -> Optional[tuple]:
+        """Convert a parsed feed entry into an articles row."""
+        url = entry.get('link')
+        title = entry.get('title')
+        if not url or not title:
+            return None
+
+        content = entry.get('summary', '')
+        if entry.get('content'):
+            content = entry['content'][0].get('value', content)
+
+        # Keyed by the canonical URL so tracking/AMP variants of a link share an id
+        canonical_url = canonicalize_url(url)
+        title = title.strip()
+        return (
+            hashlib.md5(canonical_url.encode()).hexdigest(),
+            title,
+            content,
+            url,
+            source['name'],
+            lean,
+            entry.get('published'),
+            collected_date,
+            canonical_url,
+            # clean_content, lead_sentence, clustering_text: HTML is parsed here, once
+            *text_fields(title, content)
+        )
+
+    def link_duplicates(self, conn, rows: List[tuple], collected_date: str):
+        """Drop already-stored rows and mark near-duplicate bodies.
+
+        Returns the new rows, each extended with its ``duplicate_of`` id (None
+        for originals). Fingerprints of the originals are saved to the
+        SimHash index on ``conn``.
+        """
+        known = {row[0] for row in fetch_by_ids(conn, 'SELECT id FROM articles WHERE id IN ({placeholders})',
+                                                [row[0] for row in rows])}
+        # Rows stored before ids were derived from canonical URLs are found by their raw URL
+        known_urls = {row[0] for row in fetch_by_ids(conn, 'SELECT url FROM articles WHERE url IN ({placeholders})',
+                                                     [row[3] for row in rows])}
+        since = (datetime.now() - timedelta(hours=DEDUP_WINDOW_HOURS)).isoformat()
+        index = SimHashIndex(conn, DEDUP_SIMHASH_DISTANCE, since=since)
+
+        linked, fingerprints = [], []
+        for row in rows:
+            if row[0] in known or row[3] in known_urls:
+                continue
+            known.add(row[0])
+
+            duplicate_of = None
+            content = row[9]
+            fingerprint = simhash(content) if word_count(content) >= DEDUP_MIN_WORDS else None
+            if fingerprint is not None:
+                duplicate_of = index.find(fingerprint)
+                if duplicate_of is None:
+                    index.add(row[0], fingerprint)
+                    fingerprints.append((row[0], fingerprint))
+            linked.append(row + (duplicate_of,))
+
+        index.save(collected_date, fingerprints)
+        return linked
+
+    def save_feed_results(self, results: List[Dict[str, Any]]) -> int:
+        """Bulk-insert new articles and remember feed validators in one transaction."""
+        collected_date = datetime.now().isoformat()
+
+        rows = []
+        for result in results:
+            for entry in result['entries']:
+                row = self._entry_to_article(entry, result['source'], result['lean'], collected_date)
+                if row:
+                    rows.append(row)
+
+        state_rows = [
+            (r['url'], r['etag'], r['last_modified'], r['status'], collected_date)
+            for r in results if r['status'] is not None
+        ]
+
+        with transaction(self.database_path) as conn:
+            rows = self.link_duplicates(conn, rows, collected_date)
+            originals = [row for row in rows if row[12] is None]
+
+            # Extract entities once at ingest so clustering never re-runs the regexes
+            entities = {row[0]: extract_named_entities(article_entity_text(row[1], row[9])) for row in originals}
+
+            # rowcount, unlike total_changes, leaves out the rows the FTS triggers write
+            inserted = conn.executemany('''
+                INSERT OR IGNORE INTO articles
+                (id, title, content, url, source_name, political_lean, published_date, collected_date,
+                 canonical_url, clean_content, lead_sentence, clustering_text, duplicate_of)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows).rowcount
+            save_article_entities(conn, entities)
+
+            conn.executemany('''
+                INSERT OR REPLACE INTO feed_state
+                (feed_url, etag, last_modified, last_status, last_checked)
+                VALUES (?, ?, ?, ?, ?)
+            ''', state_rows)
+
+        if len(originals) < len(rows):
+            print(f"Linked {len(rows) - len(originals)} near-duplicate articles to earlier copies")
+        return inserted
+
+    async def collect_all(self) -> int:
+        """Fetch all feeds concurrently and store any new articles."""
+        feed_state = self._load_feed_state()
+        feeds = list(self._iter_feeds())
+
+        limits = httpx.Limits(max_connections=FEED_MAX_CONNECTIONS,
+                              max_keepalive_connections=FEED_MAX_CONNECTIONS)
+        async with httpx.AsyncClient(limits=limits, follow_redirects=True,
+                                     headers={'User-Agent': FEED_USER_AGENT}) as client:
+            results = await asyncio.gather(*[
+                self.fetch_feed(client, lean, source, feed_state.get(source['rss'], {}))
+                for lean, source in feeds
+            ])
+
+        not_modified = sum(1 for r in results if r['status'] == 304)
+        with span('collect.save'):
+            inserted = self.save_feed_results(results)
+        print(f"Collected {inserted} new articles from {len(feeds)} feeds ({not_modified} unchanged)")
+        return inserted
+
+    def collect(self) -> int:
+        """Synchronous entry point for running a full collection."""
+        return asyncio.run(self.collect_all())
+
+
+def main():
+    """Run a single collection pass over all configured sources."""
+    collector = NewsCollector()
+    collector.collect()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,383 @@
+"""Shared SQLite data-access layer for the collector, clusterer, processor and API.
+
+Every component goes through ``get_connection`` instead of opening its own
+``sqlite3.connect`` per call. Connections are cached per thread (and per
+process, so forked workers never reuse a parent's handle), run in WAL mode
+so API readers never block on pipeline writes, and are tuned once when
+opened. ``transaction`` groups a unit of work into a single commit.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+from config import DATABASE_PATH, METRICS_DB_STATEMENTS
+from src.data.cleaning import backfill_text_fields
+from src.monitoring.metrics import DB_METRIC, REGISTRY
+
+PRAGMAS = (
+    'PRAGMA journal_mode = WAL',
+    'PRAGMA synchronous = NORMAL',      # Safe with WAL; fsync only at checkpoints
+    'PRAGMA busy_timeout = 5000',       # Wait for a writer instead of failing
+    'PRAGMA temp_store = MEMORY',
+    'PRAGMA cache_size = -20000',       # ~20 MB page cache per connection
+    'PRAGMA mmap_size = 268435456',     # Map up to 256 MB of the file
+)
+
+SCHEMA = (
+    '''
+    CREATE TABLE IF NOT EXISTS articles (
+        id TEXT PRIMARY KEY,
+        title TEXT NOT NULL,
+        content TEXT,
+        url TEXT UNIQUE NOT NULL,
+        source_name TEXT NOT NULL,
+        political_lean TEXT NOT NULL,
+        published_date TEXT,
+        collected_date TEXT NOT NULL,
+        category TEXT DEFAULT 'general',
+        canonical_url TEXT,
+        duplicate_of TEXT,
+        clean_content TEXT,
+        lead_sentence TEXT,
+        clustering_text TEXT
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_articles_collected_date ON articles (collected_date)',
+    '''
+    CREATE TABLE IF NOT EXISTS article_fingerprints (
+        article_id TEXT PRIMARY KEY,
+        simhash INTEGER NOT NULL,
+        collected_date TEXT NOT NULL
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS fingerprint_bands (
+        band INTEGER NOT NULL,
+        value INTEGER NOT NULL,
+        article_id TEXT NOT NULL,
+        PRIMARY KEY (band, value, article_id)
+    ) WITHOUT ROWID
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS feed_state (
+        feed_url TEXT PRIMARY KEY,
+        etag TEXT,
+        last_modified TEXT,
+        last_status INTEGER,
+        last_checked TEXT
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS article_entities (
+        article_id TEXT NOT NULL,
+        entity TEXT NOT NULL,
+        PRIMARY KEY (article_id, entity)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS stories (
+        id TEXT PRIMARY KEY,
+        event_headline TEXT NOT NULL,
+        unified_summary TEXT NOT NULL,
+        background_context TEXT NOT NULL,
+        economic_impact TEXT NOT NULL,
+        social_values TEXT NOT NULL,
+        practical_solutions TEXT NOT NULL,
+        conservative_view TEXT NOT NULL,
+        progressive_view TEXT NOT NULL,
+        references_json TEXT NOT NULL,
+        created_date TEXT NOT NULL,
+        source_count INTEGER,
+        political_balance_score REAL,
+        detail_json TEXT
+    )
+    ''',
+    # Matches the stories listing order so keyset pages are index range scans
+    '''
+    CREATE INDEX IF NOT EXISTS idx_stories_listing
+    ON stories (created_date DESC, political_balance_score DESC, id DESC)
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS data_versions (
+        name TEXT PRIMARY KEY,
+        version INTEGER NOT NULL
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS generated_sections (
+        key TEXT PRIMARY KEY,
+        text TEXT NOT NULL,
+        created_date TEXT NOT NULL,
+        last_used TEXT NOT NULL
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS event_clusters (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        centroid BLOB NOT NULL,
+        size INTEGER NOT NULL,
+        created_date TEXT NOT NULL,
+        updated_date TEXT NOT NULL
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS event_cluster_members (
+        article_id TEXT PRIMARY KEY,
+        cluster_id INTEGER NOT NULL
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_event_cluster_members_cluster ON event_cluster_members (cluster_id)',
+    '''
+    CREATE TABLE IF NOT EXISTS clustering_state (
+        key TEXT PRIMARY KEY,
+        value BLOB
+    )
+    ''',
+    # Append-only log of story writes, streamed to browsers by the API's event hub
+    '''
+    CREATE TABLE IF NOT EXISTS story_events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        story_id TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        created_date TEXT NOT NULL
+    )
+    ''',
+)
+
+# Full-text indexes over articles and stories. External-content FTS5 tables
+# store only the index; triggers keep them in step with their source table.
+# Articles are indexed by their cleaned text, so markup never matches a query.
+FTS_TABLES = {
+    'articles_fts': (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+        "title, clean_content, content='articles', content_rowid='rowid', "
+        "tokenize='porter unicode61 remove_diacritics 2')",
+        '''
+        CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+            INSERT INTO articles_fts (rowid, title, clean_content) VALUES (new.rowid, new.title, new.clean_content);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+            INSERT INTO articles_fts (articles_fts, rowid, title, clean_content)
+            VALUES ('delete', old.rowid, old.title, old.clean_content);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE OF title, clean_content ON articles BEGIN
+            INSERT INTO articles_fts (articles_fts, rowid, title, clean_content)
+            VALUES ('delete', old.rowid, old.title, old.clean_content);
+            INSERT INTO articles_fts (rowid, title, clean_content) VALUES (new.rowid, new.title, new.clean_content);
+        END
+        ''',
+    ),
+    'stories_fts': (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS stories_fts USING fts5("
+        "event_headline, unified_summary, content='stories', content_rowid='rowid', "
+        "tokenize='porter unicode61 remove_diacritics 2')",
+        '''
+        CREATE TRIGGER IF NOT EXISTS stories_fts_insert AFTER INSERT ON stories BEGIN
+            INSERT INTO stories_fts (rowid, event_headline, unified_summary)
+            VALUES (new.rowid, new.event_headline, new.unified_summary);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS stories_fts_delete AFTER DELETE ON stories BEGIN
+            INSERT INTO stories_fts (stories_fts, rowid, event_headline, unified_summary)
+            VALUES ('delete', old.rowid, old.event_headline, old.unified_summary);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS stories_fts_update AFTER UPDATE OF event_headline, unified_summary ON stories BEGIN
+            INSERT INTO stories_fts (stories_fts, rowid, event_headline, unified_summary)
+            VALUES ('delete', old.rowid, old.event_headline, old.unified_summary);
+            INSERT INTO stories_fts (rowid, event_headline, unified_summary)
+            VALUES (new.rowid, new.event_headline, new.unified_summary);
+        END
+        ''',
+    ),
+}
+
+# Columns added after a table was first shipped: (table, column, declaration)
+COLUMN_MIGRATIONS = (
+    ('stories', 'detail_json', 'TEXT'),
+    ('articles', 'canonical_url', 'TEXT'),
+    ('articles', 'duplicate_of', 'TEXT'),
+    ('articles', 'clean_content', 'TEXT'),
+    ('articles', 'lead_sentence', 'TEXT'),
+    ('articles', 'clustering_text', 'TEXT'),
+)
+
+# FTS tables whose indexed columns changed: (table, column it must index).
+# Older versions are dropped with their triggers and rebuilt from FTS_TABLES.
+FTS_MIGRATIONS = (
+    ('articles_fts', 'clean_content'),
+)
+
+# Indexes on migrated columns, created once COLUMN_MIGRATIONS have run
+MIGRATED_INDEXES = (
+    'CREATE INDEX IF NOT EXISTS idx_articles_canonical_url ON articles (canonical_url)',
+    'CREATE INDEX IF NOT EXISTS idx_articles_duplicate_of ON articles (duplicate_of)',
+)
+
+_local = threading.local()
+_initialized = set()
+_init_lock = threading.Lock()
+
+_STATEMENT_TABLE_RE = re.compile(r'\b(?:FROM|INTO|UPDATE)\s+(\w+)', re.IGNORECASE)
+_DML_VERBS = {'select', 'insert', 'update', 'delete', 'replace', 'with'}
+
+
+@lru_cache(maxsize=1024)
+def statement_labels(sql: str):
+    """Low-cardinality metric label for a statement: its verb, plus the first table for DML."""
+    words = sql.split(None, 1)
+    verb = words[0].lower() if words else ''
+    table = _STATEMENT_TABLE_RE.search(sql) if verb in _DML_VERBS else None
+    return (('statement', f'{verb} {table.group(1)}' if table else verb),)
+
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor that records each statement's execution time (not row fetching)."""
+
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            REGISTRY.observe(DB_METRIC, time.perf_counter() - start, statement_labels(sql))
+
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            REGISTRY.observe(DB_METRIC, time.perf_counter() - start, statement_labels(sql))
+
+
+class TimedConnection(sqlite3.Connection):
+    """Connection whose statements all run on ``TimedCursor``s."""
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def _connect(database_path) -> sqlite3.Connection:
+    # Created on first connection rather than when config is imported
+    os.makedirs(os.path.dirname(os.path.abspath(database_path)), exist_ok=True)
+    conn = sqlite3.connect(database_path, factory=TimedConnection if METRICS_DB_STATEMENTS else sqlite3.Connection)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def get_connection(database_path=None) -> sqlite3.Connection:
+    """Return this thread's connection to ``database_path``, opening it once."""
+    key = str(database_path or DATABASE_PATH)
+    connections = getattr(_local, 'connections', None)
+    if connections is None or getattr(_local, 'pid', None) != os.getpid():
+        connections = _local.connections = {}
+        _local.pid = os.getpid()
+
+    conn = connections.get(key)
+    if conn is None:
+        conn = connections[key] = _connect(key)
+    return conn
+
+
+@contextmanager
+def transaction(database_path=None):
+    """Run a block of statements as one transaction on the shared connection."""
+    conn = get_connection(database_path)
+    with conn:
+        yield conn
+
+
+def close_connections():
+    """Close every connection opened by the calling thread."""
+    for conn in getattr(_local, 'connections', {}).values():
+        conn.close()
+    _local.connections = {}
+
+
+def init_schema(database_path=None):
+    """Create all tables and indexes; runs the DDL once per database per process."""
+    key = str(database_path or DATABASE_PATH)
+    with _init_lock:
+        if (os.getpid(), key) in _initialized:
+            return
+        with transaction(key) as conn:
+            for statement in SCHEMA:
+                conn.execute(statement)
+            added = set()
+            for table, column, declaration in COLUMN_MIGRATIONS:
+                existing = {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+                if column not in existing:
+                    conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} {declaration}')
+                    added.add((table, column))
+            for statement in MIGRATED_INDEXES:
+                conn.execute(statement)
+            # Articles stored before text cleaning moved to ingest
+            if ('articles', 'clustering_text') in added:
+                backfill_text_fields(conn)
+            # Story payloads stored before the story number was added when served
+            conn.execute('''
+                UPDATE stories SET detail_json = json_remove(detail_json, '$.number')
+                WHERE json_type(detail_json, '$.number') IS NOT NULL
+            ''')
+
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            for table, column in FTS_MIGRATIONS:
+                if table in tables and column not in {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}:
+                    for (trigger,) in conn.execute(
+                        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE ?", (f'{table}_%',)
+                    ).fetchall():
+                        conn.execute(f'DROP TRIGGER {trigger}')
+                    conn.execute(f'DROP TABLE {table}')
+                    tables.discard(table)
+            for table, statements in FTS_TABLES.items():
+                for statement in statements:
+                    conn.execute(statement)
+                # Index rows written before the table existed
+                if table not in tables:
+                    conn.execute(f"INSERT INTO {table} ({table}) VALUES ('rebuild')")
+        _initialized.add((os.getpid(), key))
+
+
+def bump_version(conn, name: str):
+    """Increment a data version counter; call inside the writing transaction."""
+    conn.execute('''
+        INSERT INTO data_versions (name, version) VALUES (?, 1)
+        ON CONFLICT(name) DO UPDATE SET version = version + 1
+    ''', (name,))
+
+
+def get_version(name: str, database_path=None) -> int:
+    """Current value of a data version counter (0 if never written)."""
+    row = get_connection(database_path).execute(
+        'SELECT version FROM data_versions WHERE name = ?', (name,)
+    ).fetchone()
+    return row[0] if row else 0
+
+
+def fetch_by_ids(conn, query: str, ids, chunk_size: int = 500):
+    """Run ``query`` (containing one ``{placeholders}`` slot) over ids in chunks.
+
+    SQLite caps bound parameters per statement, so large id lists are split.
+    """
+    ids = list(ids)
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        yield from conn.execute(query.format(placeholders=','.join('?' * len(chunk))), chunk)
@@ -0,0 +1,158 @@
+"""Ingest-time duplicate detection: canonical URLs and SimHash near-duplicates.
+
+Wire copy republished by several outlets, and the same story re-listed with
+tracking parameters or as an AMP page, would otherwise enter clustering as
+separate articles. ``canonicalize_url`` catches the URL variants. A 64-bit
+SimHash over word shingles of the body catches near-identical text: two
+fingerprints within ``max_distance`` bits must agree exactly on at least
+one of ``max_distance + 1`` bands (pigeonhole), so candidates are found by
+indexed band lookups instead of comparing against every stored article.
+"""
+
+import hashlib
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+
+# Query parameters that only track the click, never select content
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'cmpid', 'cmp', 'ocid', 'ref',
+    'ref_src', 'smid', 'smtyp', 'taid', 'ito', 'ns_source', 'ns_mchannel', 'ns_campaign',
+    'amp', 'outputtype',
+}
+TRACKING_PREFIXES = ('utm_', 'at_', '__twitter', 'itm_')
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_WORD_RE = re.compile(r'[a-z0-9]+')
+_AMP_PATH_RE = re.compile(r'(/amp)+/?$|\.amp(?=\.html?$|$)')
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize a URL so tracking, AMP and cosmetic variants compare equal."""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or '').lower()
+    for prefix in ('www.', 'amp.', 'm.'):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    if parts.port and parts.port not in (80, 443):
+        host = f'{host}:{parts.port}'
+
+    path = re.sub(r'/{2,}', '/', parts.path or '/')
+    if path.startswith('/amp/'):
+        path = path[len('/amp'):]
+    path = _AMP_PATH_RE.sub('', path) or '/'
+    if len(path) > 1:
+        path = path.rstrip('/')
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    # Scheme and fragment never change the article served
+    return urlunsplit(('https', host, path, urlencode(query), ''))
+
+
+def shingle_hashes(text: str, size: int = 3) -> np.ndarray:
+    """64-bit hashes of the word ``size``-grams of the text, tags stripped."""
+    words = _WORD_RE.findall(_TAG_RE.sub(' ', text).lower())
+    if len(words) < size:
+        grams = [' '.join(words)] if words else []
+    else:
+        grams = [' '.join(words[i:i + size]) for i in range(len(words) - size + 1)]
+    return np.array(
+        [int.from_bytes(hashlib.blake2b(gram.encode(), digest_size=8).digest(), 'little') for gram in grams],
+        dtype=np.uint64
+    )
+
+
+def simhash(text: str) -> Optional[int]:
+    """64-bit SimHash of the text, or None if it has no words."""
+    hashes = shingle_hashes(text)
+    if not len(hashes):
+        return None
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder='little')
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 - len(hashes)
+    return int(np.packbits(votes > 0, bitorder='little').view('<u8')[0])
+
+
+def word_count(text: str) -> int:
+    return len(_WORD_RE.findall(_TAG_RE.sub(' ', text).lower()))
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def to_signed(value: int) -> int:
+    """Map an unsigned 64-bit value onto SQLite's signed INTEGER range."""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def to_unsigned(value: int) -> int:
+    return value & 0xFFFFFFFFFFFFFFFF
+
+
+def band_values(fingerprint: int, bands: int) -> List[int]:
+    """Split a 64-bit fingerprint into ``bands`` contiguous bit ranges."""
+    width = 64 // bands
+    mask = (1 << width) - 1
+    return [(fingerprint >> (band * width)) & mask for band in range(bands)]
+
+
+class SimHashIndex:
+    """Banded SimHash index over the ``article_fingerprints`` tables.
+
+    ``find`` first checks fingerprints added in the current batch (kept in
+    memory) and then the stored ones, restricted to articles collected
+    since ``since``.
+    """
+
+    def __init__(self, conn, max_distance: int = 6, since: Optional[str] = None):
+        self.conn = conn
+        self.max_distance = max_distance
+        self.bands = max_distance + 1
+        self.since = since
+        self._pending: Dict[Tuple[int, int], List[Tuple[str, int]]] = {}
+
+    def find(self, fingerprint: int) -> Optional[str]:
+        """Id of a known article within ``max_distance`` bits, if any."""
+        for band, value in enumerate(band_values(fingerprint, self.bands)):
+            for article_id, other in self._pending.get((band, value), ()):
+                if hamming_distance(fingerprint, other) <= self.max_distance:
+                    return article_id
+
+        for band, value in enumerate(band_values(fingerprint, self.bands)):
+            query = '''
+                SELECT b.article_id, f.simhash FROM fingerprint_bands b
+                JOIN article_fingerprints f ON f.article_id = b.article_id
+                WHERE b.band = ? AND b.value = ?
+            '''
+            params = [band, value]
+            if self.since is not None:
+                query += ' AND f.collected_date >= ?'
+                params.append(self.since)
+            for article_id, other in self.conn.execute(query, params):
+                if hamming_distance(fingerprint, to_unsigned(other)) <= self.max_distance:
+                    return article_id
+        return None
+
+    def add(self, article_id: str, fingerprint: int):
+        """Make a newly accepted article findable by later ``find`` calls in this batch."""
+        for band, value in enumerate(band_values(fingerprint, self.bands)):
+            self._pending.setdefault((band, value), []).append((article_id, fingerprint))
+
+    def save(self, collected_date: str, fingerprints: Iterable[Tuple[str, int]]):
+        """Persist fingerprints and their bands; call inside the ingest transaction."""
+        fingerprints = list(fingerprints)
+        self.conn.executemany(
+            'INSERT OR IGNORE INTO article_fingerprints (article_id, simhash, collected_date) VALUES (?, ?, ?)',
+            [(article_id, to_signed(fingerprint), collected_date) for article_id, fingerprint in fingerprints]
+        )
+        self.conn.executemany(
+            'INSERT OR IGNORE INTO fingerprint_bands (band, value, article_id) VALUES (?, ?, ?)',
+            [(band, value, article_id)
+             for article_id, fingerprint in fingerprints
+             for band, value in enumerate(band_values(fingerprint, self.bands))]
+        )
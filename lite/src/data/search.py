@@ -0,0 +1,139 @@
+"""Keyword search over stories and articles using the FTS5 indexes."""
+
+import html
+import re
+from typing import Any, Dict, List, Optional
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+from config import DATABASE_PATH, SEARCH_MAX_CANDIDATES
+from src.data.database import get_connection, init_schema
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+_TAG_RE = re.compile(r'<[^>]*>|<[^>]*$')  # Whole tags, or one cut off by the snippet
+
+# Private-use markers FTS5 wraps around matches; swapped for <mark> after escaping
+_MATCH_START, _MATCH_END = '\ue000', '\ue001'
+SNIPPET_TOKENS = 16
+
+
+def fts_query(text: str) -> Optional[str]:
+    """Turn free user input into a safe FTS5 query.
+
+    Every word must match (implicit AND). Quoting each token means FTS5
+    operators and punctuation in the input can never cause a syntax error.
+    Prefix queries are deliberately not generated: expanding a short prefix
+    costs more than the rest of the search on a large archive.
+    """
+    tokens = _TOKEN_RE.findall(text)
+    if not tokens:
+        return None
+    return ' '.join(f'"{token}"' for token in tokens)
+
+
+def render_snippet(snippet: str) -> str:
+    """HTML-safe snippet with matches wrapped in <mark>; source markup is removed."""
+    text = html.escape(' '.join(html.unescape(_TAG_RE.sub(' ', snippet)).split()))
+    return text.replace(_MATCH_START, '<mark>').replace(_MATCH_END, '</mark>')
+
+
+def _snippet_sql(table: str, column: int) -> str:
+    return f"snippet({table}, {column}, '{_MATCH_START}', '{_MATCH_END}', '…', {SNIPPET_TOKENS})"
+
+
+def search_stories(query: str, limit: int = 20, offset: int = 0, database_path=None) -> Dict[str, Any]:
+    """Stories matching ``query``, best bm25 match first (headline hits weigh double)."""
+    return _search(
+        query, limit, offset, database_path,
+        rank_sql='''
+            SELECT stories_fts.rowid, bm25(stories_fts, 2.0, 1.0) AS score
+            FROM stories_fts
+            WHERE stories_fts MATCH ? AND stories_fts.rowid >= ?
+            ORDER BY score
+            LIMIT ? OFFSET ?
+        ''',
+        detail_sql=f'''
+            SELECT s.rowid, s.id, s.event_headline, s.created_date, s.source_count,
+                   {_snippet_sql('stories_fts', 1)}
+            FROM stories_fts JOIN stories s ON s.rowid = stories_fts.rowid
+            WHERE stories_fts MATCH ? AND stories_fts.rowid IN ({{placeholders}})
+        ''',
+        table='stories_fts',
+        to_result=lambda row: {
+            'id': row[1],
+            'title': row[2],
+            'created_date': row[3],
+            'source_count': row[4],
+            'snippet': render_snippet(row[5])
+        }
+    )
+
+
+def search_articles(query: str, limit: int = 20, offset: int = 0, database_path=None) -> Dict[str, Any]:
+    """Original (non-duplicate) articles matching ``query``, best bm25 match first."""
+    return _search(
+        query, limit, offset, database_path,
+        rank_sql='''
+            SELECT articles_fts.rowid, bm25(articles_fts, 2.0, 1.0) AS score
+            FROM articles_fts JOIN articles a ON a.rowid = articles_fts.rowid
+            WHERE articles_fts MATCH ? AND articles_fts.rowid >= ? AND a.duplicate_of IS NULL
+            ORDER BY score
+            LIMIT ? OFFSET ?
+        ''',
+        detail_sql=f'''
+            SELECT a.rowid, a.id, a.title, a.url, a.source_name, a.political_lean, a.collected_date,
+                   {_snippet_sql('articles_fts', 1)}
+            FROM articles_fts JOIN articles a ON a.rowid = articles_fts.rowid
+            WHERE articles_fts MATCH ? AND articles_fts.rowid IN ({{placeholders}})
+        ''',
+        table='articles_fts',
+        to_result=lambda row: {
+            'id': row[1],
+            'title': row[2],
+            'url': row[3],
+            'source': row[4],
+            'political_lean': row[5],
+            'collected_date': row[6],
+            'snippet': render_snippet(row[7])
+        }
+    )
+
+
+def _search(query: str, limit: int, offset: int, database_path, rank_sql: str, detail_sql: str,
+            table: str, to_result) -> Dict[str, Any]:
+    """Rank matches, then fetch rows and snippets for just the requested page.
+
+    bm25 has to score every matching row before sorting, which makes a very
+    common term cost time proportional to the archive. Ranking is therefore
+    limited to the newest SEARCH_MAX_CANDIDATES matches (rowids grow with
+    insertion), found by walking the match list backwards, which is cheap.
+    Snippets are built in a second query so only the page's rows pay for them.
+    """
+    match = fts_query(query)
+    if match is None:
+        return {'results': [], 'next_offset': None}
+
+    database_path = database_path or DATABASE_PATH
+    init_schema(database_path)
+    conn = get_connection(database_path)
+    cutoff = conn.execute(
+        f'SELECT rowid FROM {table} WHERE {table} MATCH ? ORDER BY rowid DESC LIMIT 1 OFFSET ?',
+        (match, SEARCH_MAX_CANDIDATES - 1)
+    ).fetchone()
+    min_rowid = cutoff[0] if cutoff else 0
+
+    # One extra row tells us whether another page follows
+    ranked = conn.execute(rank_sql, (match, min_rowid, limit + 1, offset)).fetchall()
+    page = ranked[:limit]
+    if not page:
+        return {'results': [], 'next_offset': None}
+
+    rowids = [rowid for rowid, _ in page]
+    details = {row[0]: row for row in conn.execute(
+        detail_sql.format(placeholders=','.join('?' * len(rowids))), (match, *rowids)
+    )}
+    results: List[Dict[str, Any]] = []
+    for rowid, score in page:
+        if rowid in details:
+            results.append(dict(to_result(details[rowid]), score=-score))
+    return {'results': results, 'next_offset': offset + limit if len(ranked) > limit else None}
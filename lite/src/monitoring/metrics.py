@@ -0,0 +1,168 @@
+"""Timing spans and latency histograms, exported in Prometheus text format.
+
+Spans (``with span('cluster.dbscan'):``) record their duration into the
+``newsbot_stage_duration_seconds`` histogram; SQLite statements go into
+``newsbot_db_statement_duration_seconds``. Each process keeps its own
+registry. Worker processes return ``REGISTRY.drain()`` with their results
+and the parent ``merge``s it, so the API process exposes the pipeline and
+story-processing workers' timings too.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+from config import METRICS_ENABLED
+
+# Upper bounds in seconds; fine enough for 1 ms SQL calls and for multi-minute stages
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+STAGE_METRIC = 'newsbot_stage_duration_seconds'
+DB_METRIC = 'newsbot_db_statement_duration_seconds'
+HELP = {
+    STAGE_METRIC: 'Time spent in a pipeline stage.',
+    DB_METRIC: 'Time to execute one SQLite statement.',
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-on-export histogram series keyed by label set."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (last is +Inf), sum, count]
+        self.series: Dict[LabelKey, List[Any]] = {}
+
+    def observe(self, labels: LabelKey, value: float):
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+
+class Span:
+    """Context manager timing a block into the stage histogram."""
+
+    __slots__ = ('registry', 'labels', 'start', 'elapsed')
+
+    def __init__(self, registry: 'MetricsRegistry', labels: LabelKey):
+        self.registry = registry
+        self.labels = labels
+        self.elapsed: Optional[float] = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.elapsed = time.perf_counter() - self.start
+        self.registry.observe(STAGE_METRIC, self.elapsed, self.labels)
+        return False
+
+
+class MetricsRegistry:
+    """Thread-safe set of named histograms for one process."""
+
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled = enabled
+        self._histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, value: float, labels: LabelKey = ()):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(labels, value)
+
+    def span(self, stage: str, **labels) -> Span:
+        """Time a block as ``stage``; ``elapsed`` is readable after it exits."""
+        return Span(self, (('stage', stage), *sorted(labels.items())))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Picklable copy of every histogram, for ``merge`` in another process."""
+        with self._lock:
+            return _export(self._histograms)
+
+    def drain(self) -> Dict[str, Any]:
+        """Snapshot and reset, so each observation is shipped to the parent only once."""
+        with self._lock:
+            snapshot = _export(self._histograms)
+            self._histograms = {}
+        return snapshot
+
+    def merge(self, snapshot: Optional[Dict[str, Any]]):
+        """Add another process's ``snapshot``/``drain`` into this registry."""
+        if not snapshot or not self.enabled:
+            return
+        with self._lock:
+            for name, data in snapshot.items():
+                histogram = self._histograms.get(name)
+                if histogram is None:
+                    histogram = self._histograms[name] = Histogram(data['buckets'])
+                if tuple(data['buckets']) != histogram.buckets:
+                    continue  # Incompatible bucket layout; can't be added
+                for labels, counts, total, count in data['series']:
+                    labels = tuple(tuple(pair) for pair in labels)
+                    series = histogram.series.setdefault(labels, [[0] * len(counts), 0.0, 0])
+                    series[0] = [a + b for a, b in zip(series[0], counts)]
+                    series[1] += total
+                    series[2] += count
+
+    def render_prometheus(self) -> str:
+        """All histograms in the Prometheus text exposition format."""
+        lines = []
+        for name, data in sorted(self.snapshot().items()):
+            lines.append(f'# HELP {name} {HELP.get(name, name)}')
+            lines.append(f'# TYPE {name} histogram')
+            bounds = [_format_value(bound) for bound in data['buckets']] + ['+Inf']
+            for labels, counts, total, count in sorted(data['series']):
+                cumulative = 0
+                for bound, bucket_count in zip(bounds, counts):
+                    cumulative += bucket_count
+                    lines.append(f'{name}_bucket{_format_labels(labels + (("le", bound),))} {cumulative}')
+                lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(total)}')
+                lines.append(f'{name}_count{_format_labels(labels)} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+def _export(histograms: Dict[str, Histogram]) -> Dict[str, Any]:
+    return {
+        name: {'buckets': histogram.buckets,
+               'series': [(labels, list(counts), total, count)
+                          for labels, (counts, total, count) in histogram.series.items()]}
+        for name, histogram in histograms.items()
+    }
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: LabelKey) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels) + '}'
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value))
+
+
+# Process-wide registry
+REGISTRY = MetricsRegistry()
+
+
+def span(stage: str, **labels) -> Span:
+    """Time a block into this process's registry."""
+    return REGISTRY.span(stage, **labels)
@@ -0,0 +1,189 @@
+"""Background scheduler that refreshes stories from inside the API server.
+
+The pipeline (collect -> cluster -> process) runs in a separate worker
+process so TF-IDF and DBSCAN never hold the server's GIL while requests
+are being served. Runs are spaced NEWS_UPDATE_INTERVAL apart with random
+jitter, never overlap, and report per-stage durations for the status
+endpoint.
+"""
+
+import asyncio
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Any, Dict, Optional
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+from config import (
+    NEWS_UPDATE_INTERVAL, PIPELINE_INITIAL_DELAY, PIPELINE_JITTER, PIPELINE_MAX_STORIES,
+    PIPELINE_INCREMENTAL, PIPELINE_LOCK_PATH
+)
+from src.monitoring.metrics import REGISTRY, span
+
+try:
+    import fcntl
+except ImportError:  # Windows: rely on the in-process guard only
+    fcntl = None
+
+STAGES = ('collect', 'cluster', 'process')
+
+
+def _acquire_run_lock(lock_path):
+    """Take a non-blocking exclusive lock, or return None if another run holds it."""
+    os.makedirs(os.path.dirname(os.path.abspath(lock_path)), exist_ok=True)
+    lock_file = open(lock_path, 'w')
+    if fcntl is None:
+        return lock_file
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+def run_pipeline(max_stories: int = PIPELINE_MAX_STORIES, incremental: bool = PIPELINE_INCREMENTAL,
+                 lock_path=PIPELINE_LOCK_PATH) -> Dict[str, Any]:
+    """Run collect -> cluster -> process once; executed in the worker process.
+
+    Never raises: a failing stage ends the run and is reported in ``error``
+    alongside the durations of the stages that did complete. ``metrics``
+    carries the run's timing histograms back to the server process.
+    """
+    from src.data.collector import NewsCollector
+    from src.analysis.clustering import EventClusterer
+    from src.synthesis.processor import StoryProcessor
+
+    result = {'stages': {}, 'error': None, 'skipped': False}
+    lock = _acquire_run_lock(lock_path)
+    if lock is None:
+        result['skipped'] = True
+        return result
+
+    try:
+        stage = 'collect'
+        with span('pipeline.collect') as timer:
+            result['articles_collected'] = NewsCollector().collect()
+        result['stages']['collect'] = timer.elapsed
+
+        stage = 'cluster'
+        with span('pipeline.cluster') as timer:
+            clusters = EventClusterer().get_top_stories(max_stories, incremental=incremental)
+        result['stages']['cluster'] = timer.elapsed
+
+        stage = 'process'
+        with span('pipeline.process') as timer:
+            processor = StoryProcessor()
+            stories = processor.process_story_clusters(clusters)
+            processor.save_processed_stories(stories)
+        result['stories_saved'] = len(stories)
+        result['stages']['process'] = timer.elapsed
+    except Exception as e:
+        result['error'] = f"{stage}: {e!r}"
+    finally:
+        lock.close()
+        result['metrics'] = REGISTRY.drain()
+
+    return result
+
+
+class PipelineScheduler:
+    """Run the pipeline periodically in a worker process from the API's event loop."""
+
+    def __init__(self, interval: float = NEWS_UPDATE_INTERVAL, jitter: float = PIPELINE_JITTER,
+                 initial_delay: float = PIPELINE_INITIAL_DELAY):
+        self.interval = interval
+        self.jitter = jitter
+        self.initial_delay = initial_delay
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._task: Optional[asyncio.Task] = None
+        self._running = False
+        self._next_run: Optional[float] = None
+        self.current_run: Optional[Dict[str, Any]] = None
+        self.last_run: Optional[Dict[str, Any]] = None
+        self.runs_completed = 0
+
+    def _next_delay(self) -> float:
+        """Interval with +/- jitter so restarts don't line up runs against the feeds."""
+        return self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        # spawn: forking a server process that owns threads and SQLite handles is unsafe
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+        return self._executor
+
+    def start(self):
+        """Start the scheduling loop on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        """Cancel the loop and shut the worker process down."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _loop(self):
+        delay = self.initial_delay
+        while True:
+            self._next_run = time.time() + delay
+            await asyncio.sleep(delay)
+            await self.run_once()
+            delay = self._next_delay()
+
+    async def run_once(self) -> bool:
+        """Run the pipeline now unless a run is already in progress."""
+        if self._running:
+            return False
+
+        self._running = True
+        started = time.time()
+        self.current_run = {'started': datetime.fromtimestamp(started).isoformat()}
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self.executor, run_pipeline)
+        except BrokenProcessPool as e:
+            # The worker died (e.g. OOM); start a fresh one next time
+            self._executor = None
+            result = {'stages': {}, 'error': f"worker: {e!r}", 'skipped': False}
+        finally:
+            self._running = False
+            self.current_run = None
+        REGISTRY.merge(result.pop('metrics', None))
+
+        status = 'skipped' if result['skipped'] else 'failed' if result['error'] else 'succeeded'
+        self.last_run = {
+            **result,
+            'status': status,
+            'started': datetime.fromtimestamp(started).isoformat(),
+            'duration': time.time() - started,
+        }
+        if status == 'succeeded':
+            self.runs_completed += 1
+        print(f"Pipeline run {status} in {self.last_run['duration']:.1f}s")
+        return True
+
+    def status(self) -> Dict[str, Any]:
+        """Snapshot for the status endpoint."""
+        return {
+            'running': self._running,
+            'current_run': self.current_run,
+            'last_run': self.last_run,
+            'next_run': datetime.fromtimestamp(self._next_run).isoformat() if self._next_run and not self._running else None,
+            'runs_completed': self.runs_completed,
+            'interval': self.interval,
+            'stages': list(STAGES),
+        }
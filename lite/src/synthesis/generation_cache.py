@@ -0,0 +1,70 @@
+"""Content-addressed cache of generated story sections.
+
+A section's key hashes everything its text depends on: the generator (the
+rule-based templates or a model name), PROMPT_VERSION, the section name and
+its input (the normalized cluster articles, or the exact prompt). Clusters
+whose articles haven't changed therefore skip generation entirely, and a
+change to one prompt only regenerates that section.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+from config import DATABASE_PATH
+from src.data.database import fetch_by_ids, get_connection, init_schema, transaction
+from src.synthesis.prompts import PROMPT_VERSION
+
+
+def cluster_input_hash(cluster_articles: List[Dict[str, Any]]) -> str:
+    """Hash of the article fields generation reads, independent of article order."""
+    normalized = sorted(
+        (article['id'], article['title'].strip(), ' '.join((article['content'] or '').split()),
+         article['source_name'], article['political_lean'])
+        for article in cluster_articles
+    )
+    return hashlib.sha256(json.dumps(normalized).encode()).hexdigest()
+
+
+def section_key(generator: str, section: str, section_input: str) -> str:
+    """Cache key of one section produced by ``generator`` from ``section_input``."""
+    material = f"{generator}\0{PROMPT_VERSION}\0{section}\0{section_input}"
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+class GenerationCache:
+    """Persistent key -> generated text store in the shared database."""
+
+    def __init__(self, database_path=None):
+        self.database_path = database_path or DATABASE_PATH
+        init_schema(self.database_path)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """Cached texts for whichever of ``keys`` are present; marks them as used."""
+        keys = list(dict.fromkeys(keys))
+        conn = get_connection(self.database_path)
+        found = dict(fetch_by_ids(conn, 'SELECT key, text FROM generated_sections WHERE key IN ({placeholders})', keys))
+        if found:
+            now = datetime.now().isoformat()
+            with transaction(self.database_path) as conn:
+                conn.executemany('UPDATE generated_sections SET last_used = ? WHERE key = ?',
+                                 [(now, key) for key in found])
+        return found
+
+    def put_many(self, texts: Dict[str, str]):
+        """Store newly generated texts."""
+        now = datetime.now().isoformat()
+        with transaction(self.database_path) as conn:
+            conn.executemany('''
+                INSERT INTO generated_sections (key, text, created_date, last_used) VALUES (?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET text = excluded.text, last_used = excluded.last_used
+            ''', [(key, text, now, now) for key, text in texts.items()])
+
+    def prune(self, max_age_days: int) -> int:
+        """Delete sections unused for ``max_age_days``; returns how many were removed."""
+        cutoff = (datetime.now() - timedelta(days=max_age_days)).isoformat()
+        with transaction(self.database_path) as conn:
+            return conn.execute('DELETE FROM generated_sections WHERE last_used < ?', (cutoff,)).rowcount
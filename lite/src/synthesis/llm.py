@@ -0,0 +1,178 @@
+"""Local CPU inference engine for writing story sections.
+
+torch and transformers are imported on first use, so the rest of the app
+(and the rule-based processor) runs without them. The model is loaded once
+per process and prompts from many clusters are batched into padded
+``generate`` calls.
+"""
+
+import string
+import time
+from typing import List, Optional
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+from config import (
+    DEFAULT_MODEL, MAX_TOKENS, TEMPERATURE, LLM_BATCH_SIZE, LLM_QUANTIZE, LLM_MAX_INPUT_TOKENS
+)
+
+
+class LLMEngine:
+    """Batched text generation with a causal language model on CPU.
+
+    Pass ``model`` and ``tokenizer`` to inject preloaded objects (for example
+    ``tiny_random_model()`` in offline tests); otherwise ``model_name`` is
+    loaded with ``from_pretrained`` the first time it is needed.
+    """
+
+    def __init__(self, model_name: str = DEFAULT_MODEL, max_new_tokens: int = MAX_TOKENS,
+                 temperature: float = TEMPERATURE, batch_size: int = LLM_BATCH_SIZE,
+                 quantize: bool = LLM_QUANTIZE, max_input_tokens: int = LLM_MAX_INPUT_TOKENS,
+                 model=None, tokenizer=None):
+        self.model_name = model_name
+        self.max_new_tokens = max_new_tokens
+        self.temperature = temperature
+        self.batch_size = batch_size
+        self.quantize = quantize
+        self.max_input_tokens = max_input_tokens
+        self.model = model
+        self.tokenizer = tokenizer
+        self.generated_tokens = 0
+        self.generation_seconds = 0.0
+        if model is not None:
+            self._prepare()
+
+    @property
+    def tokens_per_second(self) -> float:
+        """New tokens produced per second of generate() time, over the engine's lifetime."""
+        return self.generated_tokens / self.generation_seconds if self.generation_seconds else 0.0
+
+    def load(self):
+        """Load the tokenizer and model if they haven't been loaded yet."""
+        if self.model is not None:
+            return
+        from transformers import AutoModelForCausalLM, AutoTokenizer
+
+        print(f"Loading language model {self.model_name}")
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        self.model = AutoModelForCausalLM.from_pretrained(self.model_name)
+        self._prepare()
+
+    def _prepare(self):
+        import torch
+
+        # Decoder-only models continue from the right edge, so pad on the left;
+        # over-long prompts drop their oldest tokens and keep the instruction
+        self.tokenizer.padding_side = 'left'
+        self.tokenizer.truncation_side = 'left'
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+
+        self.model.eval()
+        if self.quantize:
+            # GPT-2 family models keep attention and MLP weights in Conv1D, which quantize_dynamic skips
+            conv1d_to_linear(self.model)
+            self.model = torch.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    def generate(self, prompts: List[str], max_new_tokens: Optional[int] = None) -> List[str]:
+        """Complete every prompt, returning only the generated text, in input order."""
+        import torch
+
+        self.load()
+        max_new_tokens = max_new_tokens or self.max_new_tokens
+        # Leave room in the context window for the generated tokens
+        max_length = self.max_input_tokens
+        context_window = getattr(self.model.config, 'max_position_embeddings', None)
+        if context_window:
+            max_length = min(max_length, context_window - max_new_tokens)
+
+        # Batch prompts of similar length together to keep padding small
+        order = sorted(range(len(prompts)), key=lambda i: len(prompts[i]))
+        outputs: List[Optional[str]] = [None] * len(prompts)
+        for start in range(0, len(order), self.batch_size):
+            batch = order[start:start + self.batch_size]
+            inputs = self.tokenizer(
+                [prompts[i] for i in batch], return_tensors='pt', padding=True,
+                truncation=True, max_length=max_length
+            )
+
+            began = time.perf_counter()
+            with torch.inference_mode():
+                generated = self.model.generate(
+                    **inputs,
+                    max_new_tokens=max_new_tokens,
+                    do_sample=self.temperature > 0,
+                    temperature=self.temperature if self.temperature > 0 else None,
+                    pad_token_id=self.tokenizer.pad_token_id
+                )
+            self.generation_seconds += time.perf_counter() - began
+
+            new_tokens = generated[:, inputs['input_ids'].shape[1]:]
+            self.generated_tokens += int((new_tokens != self.tokenizer.pad_token_id).sum())
+            texts = self.tokenizer.batch_decode(new_tokens, skip_special_tokens=True)
+            for i, text in zip(batch, texts):
+                outputs[i] = text.strip()
+
+        return outputs
+
+
+def conv1d_to_linear(model) -> int:
+    """Replace transformers ``Conv1D`` layers with equivalent ``nn.Linear`` ones, in place.
+
+    ``Conv1D`` is a linear layer with its weight stored transposed. Returns
+    the number of layers replaced.
+    """
+    import torch
+    from transformers.pytorch_utils import Conv1D
+
+    replaced = 0
+    for parent in list(model.modules()):
+        for name, child in list(parent.named_children()):
+            if not isinstance(child, Conv1D):
+                continue
+            in_features, out_features = child.weight.shape
+            linear = torch.nn.Linear(in_features, out_features)
+            with torch.no_grad():
+                linear.weight.copy_(child.weight.t())
+                linear.bias.copy_(child.bias)
+            setattr(parent, name, linear)
+            replaced += 1
+    return replaced
+
+
+def tiny_random_model(seed: int = 0):
+    """A small randomly initialized GPT-2 and character tokenizer, built offline.
+
+    Output is gibberish, but shapes, padding, batching and quantization
+    behave like a real model, so the engine can be exercised without
+    downloading weights.
+    """
+    import torch
+    from tokenizers import Regex, Tokenizer, decoders, models, pre_tokenizers
+    from transformers import GPT2Config, GPT2LMHeadModel, PreTrainedTokenizerFast
+
+    specials = ['<pad>', '<eos>', '<unk>']
+    vocab = {token: i for i, token in enumerate(specials + sorted(set(string.printable)))}
+    backend = Tokenizer(models.WordLevel(vocab=vocab, unk_token='<unk>'))
+    backend.pre_tokenizer = pre_tokenizers.Split(Regex(r'[\s\S]'), behavior='isolated')
+    backend.decoder = decoders.Fuse()
+    tokenizer = PreTrainedTokenizerFast(
+        tokenizer_object=backend, pad_token='<pad>', eos_token='<eos>', unk_token='<unk>'
+    )
+
+    torch.manual_seed(seed)
+    model = GPT2LMHeadModel(GPT2Config(
+        vocab_size=len(vocab), n_positions=2048, n_embd=64, n_layer=2, n_head=2,
+        bos_token_id=vocab['<eos>'], eos_token_id=vocab['<eos>'], pad_token_id=vocab['<pad>']
+    ))
+    return model, tokenizer
+
+
+_engine: Optional[LLMEngine] = None
+
+def get_engine() -> LLMEngine:
+    """The process-wide engine; the model itself loads on the first generate()."""
+    global _engine
+    if _engine is None:
+        _engine = LLMEngine()
+    return _engine
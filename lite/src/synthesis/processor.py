@@ -1,47 +1,71 @@
 """LLM-powered story processor for generating comprehensive summaries."""
 
-import sqlite3
 import json
 import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
-from config import DATABASE_PATH
+from config import (
+    DATABASE_PATH, PROCESSING_WORKERS, LLM_ENABLED, GENERATION_CACHE_ENABLED, GENERATION_CACHE_MAX_AGE_DAYS,
+    STORY_EVENTS_KEEP
+)
+from src.synthesis.rendering import render_story_detail, with_story_number
+from src.synthesis.llm import LLMEngine, get_engine
+from src.synthesis.prompts import SECTION_PROMPTS, build_section_prompts
+from src.synthesis.generation_cache import GenerationCache, cluster_input_hash, section_key
+from src.data.cleaning import article_clean_content
+from src.data.database import bump_version, fetch_by_ids, get_connection, get_version, init_schema, transaction
+from src.monitoring.metrics import REGISTRY, span
+
+STORY_COLUMNS = (
+    "id, event_headline, unified_summary, background_context, economic_impact, social_values, "
+    "practical_solutions, conservative_view, progressive_view, references_json, created_date, "
+    "source_count, political_balance_score"
+)
+
+# Per-process StoryProcessor used by the pool workers of process_story_clusters
+_worker_processor = None
+
+def _init_worker():
+    global _worker_processor
+    # Workers only generate; the parent reads the cache and saves the results
+    _worker_processor = StoryProcessor(init_db=False, cache_generations=False)
+
+def _generate_in_worker(task):
+    cluster_articles, cluster_id = task
+    print(f"Processing story cluster: {cluster_id}")
+    with span('synthesis.cluster'):
+        sections = _worker_processor.generate_sections(cluster_articles)
+    # Timings travel back with the result; the parent merges them into its registry
+    return sections, REGISTRY.drain()
 
 # For now, use a simple text-based approach
 # Will upgrade to actual LLM models once pipeline is working
 class StoryProcessor:
-    def __init__(self):
-        self.database_path = DATABASE_PATH
-        self._init_stories_database()
+    def __init__(self, llm_engine: Optional[LLMEngine] = None, database_path=None, init_db: bool = True,
+                 generation_cache: Optional[GenerationCache] = None,
+                 cache_generations: bool = GENERATION_CACHE_ENABLED):
+        """Set up a processor over ``database_path`` (``DATABASE_PATH`` by default).
+        
+        ``init_db=False`` skips creating the schema, for processors that only
+        generate sections. A ``generation_cache`` given here is used as is;
+        otherwise one is opened on the database when ``cache_generations``.
+        """
+        self.database_path = database_path or DATABASE_PATH
+        self.llm_engine = llm_engine
+        if init_db:
+            self._init_stories_database()
+        if generation_cache is None and cache_generations:
+            generation_cache = GenerationCache(self.database_path)
+        self.generation_cache = generation_cache
     
     def _init_stories_database(self):
         """Initialize database table for processed stories."""
-        conn = sqlite3.connect(self.database_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS stories (
-                id TEXT PRIMARY KEY,
-                event_headline TEXT NOT NULL,
-                unified_summary TEXT NOT NULL,
-                background_context TEXT NOT NULL,
-                economic_impact TEXT NOT NULL,
-                social_values TEXT NOT NULL,
-                practical_solutions TEXT NOT NULL,
-                conservative_view TEXT NOT NULL,
-                progressive_view TEXT NOT NULL,
-                references_json TEXT NOT NULL,
-                created_date TEXT NOT NULL,
-                source_count INTEGER,
-                political_balance_score REAL
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        init_schema(self.database_path)
         print("Stories database initialized")
     
     def generate_headline(self, cluster_articles: List[Dict[str, Any]]) -> str:
@@ -132,19 +156,13 @@ class StoryProcessor:
             if source not in sources_content:
                 sources_content[source] = []
             
-            if article['content']:
-                # Clean and extract content
-                content = article['content'].replace('<p>', '').replace('</p>', '').strip()
-                # Remove HTML tags and clean up
-                import re
-                content = re.sub(r'<[^>]+>', '', content)
-                content = re.sub(r'\s+', ' ', content).strip()
-                
-                if len(content) > 50:  # Only substantial content
-                    sources_content[source].append({
-                        'title': article['title'],
-                        'content': content[:800]  # Limit per article for processing
-                    })
+            # Cleaned once at ingest; see src.data.cleaning
+            content = article_clean_content(article)
+            if len(content) > 50:  # Only substantial content
+                sources_content[source].append({
+                    'title': article['title'],
+                    'content': content[:800]  # Limit per article for processing
+                })
         
         headline_lower = headline.lower()
         
@@ -391,22 +409,47 @@ class StoryProcessor:
         """Process a complete story cluster through all LLM prompts."""
         
         print(f"Processing story cluster: {cluster_id}")
+        with span('synthesis.cluster'):
+            return self._build_story(cluster_articles, cluster_id, self.generate_sections(cluster_articles))
+    
+    def generate_sections(self, cluster_articles: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Write every text section of a story with the rule-based templates."""
         
         # Step 1: Generate headline
-        headline = self.generate_headline(cluster_articles)
+        with span('synthesis.section', section='headline', generator='templates'):
+            headline = self.generate_headline(cluster_articles)
         print(f"Generated headline: {headline}")
         
         # Step 2: Generate unified summary
-        unified_summary = self.generate_unified_summary(cluster_articles, headline)
+        with span('synthesis.section', section='unified_summary', generator='templates'):
+            unified_summary = self.generate_unified_summary(cluster_articles, headline)
         
         # Step 3: Generate background context
-        background_context = self.generate_background_context(cluster_articles, headline)
+        with span('synthesis.section', section='background_context', generator='templates'):
+            background_context = self.generate_background_context(cluster_articles, headline)
         
         # Step 4: Generate impact analysis
-        impact_analysis = self.generate_impact_analysis(cluster_articles, headline)
+        with span('synthesis.section', section='impact_analysis', generator='templates'):
+            impact_analysis = self.generate_impact_analysis(cluster_articles, headline)
         
         # Step 5: Generate political perspectives
-        political_perspectives = self.generate_political_perspectives(cluster_articles, headline)
+        with span('synthesis.section', section='political_perspectives', generator='templates'):
+            political_perspectives = self.generate_political_perspectives(cluster_articles, headline)
+        
+        return {
+            'event_headline': headline,
+            'unified_summary': unified_summary,
+            'background_context': background_context,
+            'economic_impact': impact_analysis['economic_impact'],
+            'social_values': impact_analysis['social_values'],
+            'practical_solutions': impact_analysis['practical_solutions'],
+            'conservative_view': political_perspectives['conservative_view'],
+            'progressive_view': political_perspectives['progressive_view']
+        }
+    
+    def _build_story(self, cluster_articles: List[Dict[str, Any]], cluster_id: str,
+                     sections: Dict[str, str]) -> Dict[str, Any]:
+        """Combine generated sections with references and metadata into a story row."""
         
         # Step 6: Generate references
         references = self.generate_references(cluster_articles)
@@ -418,14 +461,7 @@ class StoryProcessor:
         
         processed_story = {
             'id': cluster_id,
-            'event_headline': headline,
-            'unified_summary': unified_summary,
-            'background_context': background_context,
-            'economic_impact': impact_analysis['economic_impact'],
-            'social_values': impact_analysis['social_values'],
-            'practical_solutions': impact_analysis['practical_solutions'],
-            'conservative_view': political_perspectives['conservative_view'],
-            'progressive_view': political_perspectives['progressive_view'],
+            **sections,
             'references_json': json.dumps(references),
             'created_date': datetime.now().isoformat(),
             'source_count': source_count,
@@ -434,71 +470,342 @@ class StoryProcessor:
         
         return processed_story
     
+    def generate_sections_with_llm(self, clusters_articles: List[List[Dict[str, Any]]]) -> List[Dict[str, str]]:
+        """Write every section of every cluster with the language model.
+        
+        Prompts for the same section across all clusters share a token budget,
+        so each section is one batched pass over the clusters. Sections whose
+        exact prompt was answered before come from the generation cache.
+        """
+        
+        engine = self.llm_engine or get_engine()
+        prompts = [build_section_prompts(cluster_articles) for cluster_articles in clusters_articles]
+        keys = [{section: section_key(engine.model_name, section, prompt) for section, prompt in cluster_prompts.items()}
+                for cluster_prompts in prompts]
+        cached = self.generation_cache.get_many(
+            key for cluster_keys in keys for key in cluster_keys.values()
+        ) if self.generation_cache else {}
+        
+        sections: List[Dict[str, str]] = [{} for _ in clusters_articles]
+        generated = {}
+        for section, (_, max_new_tokens) in SECTION_PROMPTS.items():
+            missing = []
+            for i, cluster_keys in enumerate(keys):
+                if cluster_keys[section] in cached:
+                    sections[i][section] = cached[cluster_keys[section]]
+                else:
+                    missing.append(i)
+            if not missing:
+                continue
+            with span('synthesis.section', section=section, generator='llm'):
+                texts = engine.generate([prompts[i][section] for i in missing], max_new_tokens)
+            for i, text in zip(missing, texts):
+                sections[i][section] = generated[keys[i][section]] = text
+        
+        if generated and self.generation_cache:
+            self.generation_cache.put_many(generated)
+        
+        # A blank headline would leave the story unlabeled; fall back to the rule-based one
+        for cluster_sections, cluster_articles in zip(sections, clusters_articles):
+            if not cluster_sections['event_headline']:
+                cluster_sections['event_headline'] = self.generate_headline(cluster_articles)
+        
+        print(f"Generated {len(generated)} sections ({len(cached)} cached) at "
+              f"{engine.tokens_per_second:.1f} tokens/sec")
+        return sections
+    
+    def generate_sections_with_templates(self, tasks: List[Tuple[List[Dict[str, Any]], str]],
+                                         workers: int) -> List[Dict[str, str]]:
+        """Write sections for (articles, cluster id) tasks, skipping clusters whose inputs are cached."""
+        
+        keys = []
+        for cluster_articles, _ in tasks:
+            input_hash = cluster_input_hash(cluster_articles)
+            keys.append({section: section_key('templates', section, input_hash) for section in SECTION_PROMPTS})
+        cached = self.generation_cache.get_many(
+            key for cluster_keys in keys for key in cluster_keys.values()
+        ) if self.generation_cache else {}
+        
+        sections: List[Optional[Dict[str, str]]] = [None] * len(tasks)
+        missing = []
+        for i, cluster_keys in enumerate(keys):
+            if all(key in cached for key in cluster_keys.values()):
+                sections[i] = {section: cached[key] for section, key in cluster_keys.items()}
+            else:
+                missing.append(i)
+        if tasks:
+            print(f"Generating {len(missing)} of {len(tasks)} clusters ({len(tasks) - len(missing)} unchanged)")
+        
+        workers = min(workers, len(missing))
+        if workers <= 1:
+            fresh = []
+            for i in missing:
+                cluster_articles, cluster_id = tasks[i]
+                print(f"Processing story cluster: {cluster_id}")
+                with span('synthesis.cluster'):
+                    fresh.append(self.generate_sections(cluster_articles))
+        else:
+            # spawn: this also runs inside the scheduler's worker and the API process,
+            # where forking with live threads and SQLite handles is unsafe
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=_init_worker) as executor:
+                fresh = []
+                for cluster_sections, worker_metrics in executor.map(
+                    _generate_in_worker, [tasks[i] for i in missing],
+                    chunksize=max(1, len(missing) // (workers * 4))
+                ):
+                    fresh.append(cluster_sections)
+                    REGISTRY.merge(worker_metrics)
+        
+        generated = {}
+        for i, cluster_sections in zip(missing, fresh):
+            sections[i] = cluster_sections
+            generated.update({keys[i][section]: text for section, text in cluster_sections.items()})
+        if generated and self.generation_cache:
+            self.generation_cache.put_many(generated)
+        return sections
+    
+    def process_story_clusters(self, clusters: List[Dict[str, Any]], workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Process independent clusters in parallel, returning stories in input order.
+        
+        ``clusters`` are the dicts from ``EventClusterer.get_top_stories``.
+        With more than one worker they are fanned out to a process pool;
+        results come back to this process so the caller can save them in one
+        batch transaction. When the language model is enabled, generation is
+        instead batched across clusters in this process. Either way, sections
+        whose inputs are unchanged since an earlier run come from the
+        generation cache instead of being regenerated.
+        """
+        
+        # Article records pickle as they are, so they go to the workers unconverted
+        tasks = [(list(cluster['articles']), cluster['id']) for cluster in clusters]
+        
+        # The model batches across clusters itself, so it runs in this process
+        if self.llm_engine is not None or LLM_ENABLED:
+            sections = self.generate_sections_with_llm([articles for articles, _ in tasks])
+        else:
+            workers = workers if workers is not None else PROCESSING_WORKERS
+            if workers <= 0:
+                workers = os.cpu_count() or 1
+            sections = self.generate_sections_with_templates(tasks, workers)
+        
+        if self.generation_cache:
+            self.generation_cache.prune(GENERATION_CACHE_MAX_AGE_DAYS)
+        return [self._build_story(articles, cluster_id, cluster_sections)
+                for (articles, cluster_id), cluster_sections in zip(tasks, sections)]
+    
     def save_processed_story(self, processed_story: Dict[str, Any]):
         """Save processed story to database."""
+        self.save_processed_stories([processed_story])
+    
+    def save_processed_stories(self, processed_stories: List[Dict[str, Any]]):
+        """Upsert a batch of processed stories in a single transaction.
+        
+        The details-screen payload (bullets and subtitle) is rendered here
+        once, so serving a story is two indexed reads. Every story that is
+        new or whose payload changed also gets a ``story_events`` row, which
+        the API streams to connected browsers.
+        """
+        
+        detail_json = {
+            story['id']: json.dumps(render_story_detail(
+                dict(story, references=json.loads(story['references_json']))
+            ), separators=(',', ':'))
+            for story in processed_stories
+        }
         
-        conn = sqlite3.connect(self.database_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR REPLACE INTO stories 
-            (id, event_headline, unified_summary, background_context, economic_impact, 
-             social_values, practical_solutions, conservative_view, progressive_view, 
-             references_json, created_date, source_count, political_balance_score)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            processed_story['id'],
-            processed_story['event_headline'],
-            processed_story['unified_summary'],
-            processed_story['background_context'],
-            processed_story['economic_impact'],
-            processed_story['social_values'],
-            processed_story['practical_solutions'],
-            processed_story['conservative_view'],
-            processed_story['progressive_view'],
-            processed_story['references_json'],
-            processed_story['created_date'],
-            processed_story['source_count'],
-            processed_story['political_balance_score']
-        ))
-        
-        conn.commit()
-        conn.close()
-        print(f"Saved processed story: {processed_story['event_headline']}")
+        with transaction(self.database_path) as conn:
+            previous = dict(fetch_by_ids(
+                conn, 'SELECT id, detail_json FROM stories WHERE id IN ({placeholders})', list(detail_json)
+            ))
+            conn.executemany('''
+                INSERT INTO stories 
+                (id, event_headline, unified_summary, background_context, economic_impact, 
+                 social_values, practical_solutions, conservative_view, progressive_view, 
+                 references_json, created_date, source_count, political_balance_score, detail_json)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    event_headline = excluded.event_headline,
+                    unified_summary = excluded.unified_summary,
+                    background_context = excluded.background_context,
+                    economic_impact = excluded.economic_impact,
+                    social_values = excluded.social_values,
+                    practical_solutions = excluded.practical_solutions,
+                    conservative_view = excluded.conservative_view,
+                    progressive_view = excluded.progressive_view,
+                    references_json = excluded.references_json,
+                    created_date = excluded.created_date,
+                    source_count = excluded.source_count,
+                    political_balance_score = excluded.political_balance_score,
+                    detail_json = excluded.detail_json
+            ''', [(
+                processed_story['id'],
+                processed_story['event_headline'],
+                processed_story['unified_summary'],
+                processed_story['background_context'],
+                processed_story['economic_impact'],
+                processed_story['social_values'],
+                processed_story['practical_solutions'],
+                processed_story['conservative_view'],
+                processed_story['progressive_view'],
+                processed_story['references_json'],
+                processed_story['created_date'],
+                processed_story['source_count'],
+                processed_story['political_balance_score'],
+                detail_json[processed_story['id']]
+            ) for processed_story in processed_stories])
+            bump_version(conn, 'stories')
+            self._record_story_events(conn, processed_stories, previous, detail_json)
+        
+        for processed_story in processed_stories:
+            print(f"Saved processed story: {processed_story['event_headline']}")
+    
+    @staticmethod
+    def _record_story_events(conn, processed_stories: List[Dict[str, Any]], previous: Dict[str, str],
+                             detail_json: Dict[str, str]):
+        """Log new and changed stories as compact stories-screen items; caller owns the transaction."""
+        created_date = datetime.now().isoformat()
+        events = []
+        for story in processed_stories:
+            if story['id'] in previous and previous[story['id']] == detail_json[story['id']]:
+                continue
+            detail = json.loads(detail_json[story['id']])
+            events.append((story['id'], json.dumps({
+                'type': 'updated' if story['id'] in previous else 'created',
+                'story': {
+                    'id': story['id'],
+                    'title': detail['title'],
+                    'subtitle': detail['subtitle'],
+                    'source_count': story['source_count'],
+                    'political_balance_score': story['political_balance_score']
+                }
+            }, separators=(',', ':')), created_date))
+        if not events:
+            return
+        conn.executemany(
+            'INSERT INTO story_events (story_id, payload, created_date) VALUES (?, ?, ?)', events
+        )
+        conn.execute('DELETE FROM story_events WHERE id <= (SELECT MAX(id) FROM story_events) - ?',
+                     (STORY_EVENTS_KEEP,))
+    
+    def get_story_events(self, after_id: int, limit: int = 100) -> List[Tuple[int, str]]:
+        """``(id, payload)`` of the story events after ``after_id``, oldest first."""
+        return get_connection(self.database_path).execute(
+            'SELECT id, payload FROM story_events WHERE id > ? ORDER BY id LIMIT ?', (after_id, limit)
+        ).fetchall()
+    
+    def get_latest_story_event_id(self) -> int:
+        row = get_connection(self.database_path).execute('SELECT MAX(id) FROM story_events').fetchone()
+        return row[0] or 0
+    
+    def get_stories_version(self) -> int:
+        """Version counter bumped on every write to the stories table."""
+        return get_version('stories', self.database_path)
     
     def get_processed_stories(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get processed stories from database."""
         
-        conn = sqlite3.connect(self.database_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT * FROM stories 
-            ORDER BY created_date DESC, political_balance_score DESC
-            LIMIT ?
-        ''', (limit,))
-        
-        stories = []
-        for row in cursor.fetchall():
-            story = {
-                'id': row[0],
-                'event_headline': row[1],
-                'unified_summary': row[2],
-                'background_context': row[3],
-                'economic_impact': row[4],
-                'social_values': row[5],
-                'practical_solutions': row[6],
-                'conservative_view': row[7],
-                'progressive_view': row[8],
-                'references': json.loads(row[9]),
-                'created_date': row[10],
-                'source_count': row[11],
-                'political_balance_score': row[12]
-            }
-            stories.append(story)
-        
-        conn.close()
+        stories, _ = self.get_stories_page(limit)
         return stories
+    
+    def get_stories_page(self, limit: int = 20, after: Optional[Tuple[str, float, str]] = None,
+                         min_sources: Optional[int] = None, min_balance: Optional[float] = None,
+                         since: Optional[str] = None, until: Optional[str] = None
+                         ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[str, float, str]]]:
+        """Get one page of stories in listing order, newest first.
+        
+        ``after`` is the (created_date, political_balance_score, id) key of
+        the last story on the previous page. Seeking past it walks the
+        listing index, so deep pages cost the same as the first. Returns the
+        stories and the key to continue from, or None on the last page.
+        """
+        
+        conditions = []
+        params: List[Any] = []
+        if after is not None:
+            conditions.append('(created_date, political_balance_score, id) < (?, ?, ?)')
+            params.extend(after)
+        if min_sources is not None:
+            conditions.append('source_count >= ?')
+            params.append(min_sources)
+        if min_balance is not None:
+            conditions.append('political_balance_score >= ?')
+            params.append(min_balance)
+        if since is not None:
+            conditions.append('created_date >= ?')
+            params.append(since)
+        if until is not None:
+            conditions.append('created_date < ?')
+            params.append(until)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        
+        # One extra row tells us whether another page follows
+        rows = get_connection(self.database_path).execute(f'''
+            SELECT {STORY_COLUMNS} FROM stories
+            {where}
+            ORDER BY created_date DESC, political_balance_score DESC, id DESC
+            LIMIT ?
+        ''', (*params, limit + 1)).fetchall()
+        
+        stories = [self._row_to_story(row) for row in rows[:limit]]
+        next_key = None
+        if len(rows) > limit:
+            last = stories[-1]
+            next_key = (last['created_date'], last['political_balance_score'], last['id'])
+        return stories, next_key
+    
+    def get_processed_story(self, story_id: str) -> Optional[Dict[str, Any]]:
+        """Get a single processed story by primary key."""
+        
+        row = get_connection(self.database_path).execute(
+            f'SELECT {STORY_COLUMNS} FROM stories WHERE id = ?', (story_id,)
+        ).fetchone()
+        return self._row_to_story(row) if row else None
+    
+    def get_story_detail_json(self, story_id: str) -> Optional[str]:
+        """Get the serialized details-screen payload for a story.
+        
+        The stored payload is served with the story's current listing
+        number, counted over the listing index when it is read. Stories
+        saved before payloads were rendered at write time are rendered on
+        the fly from their stored sections.
+        """
+        
+        conn = get_connection(self.database_path)
+        row = conn.execute(
+            'SELECT detail_json, created_date, political_balance_score FROM stories WHERE id = ?', (story_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        detail_json, created_date, balance = row
+        if detail_json is None:
+            story = self.get_processed_story(story_id)
+            detail_json = json.dumps(render_story_detail(story), separators=(',', ':'))
+        
+        # Stories ahead of this one in the get_stories_page order
+        number = conn.execute('''
+            SELECT COUNT(*) + 1 FROM stories
+            WHERE (created_date, political_balance_score, id) > (?, ?, ?)
+        ''', (created_date, balance, story_id)).fetchone()[0]
+        return with_story_number(detail_json, number)
+    
+    @staticmethod
+    def _row_to_story(row) -> Dict[str, Any]:
+        return {
+            'id': row[0],
+            'event_headline': row[1],
+            'unified_summary': row[2],
+            'background_context': row[3],
+            'economic_impact': row[4],
+            'social_values': row[5],
+            'practical_solutions': row[6],
+            'conservative_view': row[7],
+            'progressive_view': row[8],
+            'references': json.loads(row[9]),
+            'created_date': row[10],
+            'source_count': row[11],
+            'political_balance_score': row[12]
+        }
 
 def main():
     """Test the story processor."""
@@ -513,9 +820,8 @@ def main():
     # Process each cluster
     processor = StoryProcessor()
     
-    for cluster in story_clusters:
-        processed_story = processor.process_story_cluster(cluster['articles'], cluster['id'])
-        processor.save_processed_story(processed_story)
+    processed_stories = processor.process_story_clusters(story_clusters)
+    processor.save_processed_stories(processed_stories)
     
     # Show results
     print("\n=== PROCESSED STORIES ===")
@@ -0,0 +1,52 @@
+"""Prompt templates for LLM-written story sections."""
+
+from typing import Any, Dict, List
+
+from src.data.cleaning import article_clean_content
+
+# Bump whenever a template or its token budget changes
+PROMPT_VERSION = 1
+
+# Characters of each article's text included in the source digest
+ARTICLE_EXCERPT_CHARS = 400
+
+# section -> (instruction, max new tokens)
+SECTION_PROMPTS = {
+    'event_headline': (
+        "Write one neutral headline, under 15 words, naming the event these articles report.", 32),
+    'unified_summary': (
+        "Write a factual summary of the event in three short paragraphs, combining what every "
+        "source reports and naming sources where they disagree.", 384),
+    'background_context': (
+        "Write three sentences of background a reader needs to understand this event.", 160),
+    'economic_impact': (
+        "Write up to four sentences on the economic impact of this event.", 160),
+    'social_values': (
+        "Write up to four sentences on the social and values questions this event raises.", 160),
+    'practical_solutions': (
+        "Write up to four sentences on practical responses or solutions being discussed.", 160),
+    'conservative_view': (
+        "In two or three sentences, describe how conservative commentators frame this event, "
+        "fairly and without caricature.", 128),
+    'progressive_view': (
+        "In two or three sentences, describe how progressive commentators frame this event, "
+        "fairly and without caricature.", 128),
+}
+
+
+def source_digest(cluster_articles: List[Dict[str, Any]]) -> str:
+    """Compact listing of every article in the cluster for use as prompt context."""
+    lines = []
+    for article in cluster_articles:
+        excerpt = article_clean_content(article)[:ARTICLE_EXCERPT_CHARS]
+        lines.append(f"- {article['source_name']} ({article['political_lean']}): {article['title']}. {excerpt}")
+    return '\n'.join(lines)
+
+
+def build_section_prompts(cluster_articles: List[Dict[str, Any]]) -> Dict[str, str]:
+    """One prompt per story section; the instruction comes last so left truncation keeps it."""
+    digest = source_digest(cluster_articles)
+    return {
+        section: f"News articles about one event:\n{digest}\n\n{instruction}\n"
+        for section, (instruction, _) in SECTION_PROMPTS.items()
+    }
@@ -0,0 +1,78 @@
+"""Render processed stories into the payloads served by the web API."""
+
+from typing import Any, Dict, List, Optional
+
+
+def format_source_subtitle(references: List[Dict[str, str]]) -> str:
+    """Join the distinct source names of a story, e.g. "CNN, BBC & Fox News"."""
+    # Remove duplicates while preserving order
+    unique_sources = list(dict.fromkeys(ref['source'] for ref in references))
+
+    # Format sources nicely
+    if not unique_sources:
+        return ''
+    if len(unique_sources) == 1:
+        return unique_sources[0]
+    if len(unique_sources) == 2:
+        return f"{unique_sources[0]} & {unique_sources[1]}"
+    return ", ".join(unique_sources[:-1]) + f" & {unique_sources[-1]}"
+
+
+def split_into_bullets(text: str, max_bullets: Optional[int] = None) -> List[str]:
+    """Split text into sentence bullets, each ending with a period."""
+    sentences = text.split('. ')
+    if max_bullets is not None:
+        sentences = sentences[:max_bullets]
+
+    bullets = []
+    for sentence in sentences:
+        if sentence.strip():
+            bullet = sentence.strip()
+            if not bullet.endswith('.'):
+                bullet += '.'
+            bullets.append(bullet)
+    return bullets
+
+
+def render_story_detail(story: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the summary/details screens payload for a processed story.
+
+    ``story`` uses the stories table columns, with ``references`` already
+    parsed from ``references_json``. The story's ``number`` depends on every
+    other story, so it is left out here and added when the payload is
+    served (see ``with_story_number``).
+    """
+    return {
+        'id': story['id'],
+        'title': story['event_headline'],
+        'subtitle': format_source_subtitle(story['references']),
+        'unified_summary': story['unified_summary'],
+        'background_context': {
+            'bullets': split_into_bullets(story['background_context'])
+        },
+        # Impact sections: max 4 bullets each
+        'economic_impact': {
+            'bullets': split_into_bullets(story['economic_impact'], 4)
+        },
+        'social_values': {
+            'bullets': split_into_bullets(story['social_values'], 4)
+        },
+        'practical_solutions': {
+            'bullets': split_into_bullets(story['practical_solutions'], 4)
+        },
+        'political_perspectives': {
+            'conservative': story['conservative_view'],
+            'progressive': story['progressive_view']
+        },
+        'references': story['references'],
+        'metadata': {
+            'source_count': story['source_count'],
+            'political_balance_score': story['political_balance_score'],
+            'created_date': story['created_date']
+        }
+    }
+
+
+def with_story_number(detail_json: str, number: int) -> str:
+    """Serialized payload from ``render_story_detail`` with the story's listing ``number`` added."""
+    return f'{{"number":{int(number)},{detail_json[1:]}'
@@ -0,0 +1,111 @@
+"""Build hashed, precompressed copies of the frontend's static files.
+
+Every file in ``STATIC_DIR`` is written to ``STATIC_BUILD_DIR`` twice: under
+its own name and under a content-hashed one (``app.3f2a9c1b0d4e.js``), each
+next to a ``.gz`` and, when the ``brotli`` package is installed, a ``.br``
+variant. The server then only picks a file per request and never
+compresses assets itself, and hashed names can be cached forever because
+their content never changes. ``index.html`` is rewritten to reference the
+hashed names. Run from the lite directory after changing the frontend:
+
+    python -m src.web.assets
+
+The API server also runs the build on startup; unchanged files are skipped.
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+from config import STATIC_DIR, STATIC_BUILD_DIR
+from src.api.compression import ENCODINGS, compress
+
+PAGE = 'index.html'
+MANIFEST = 'manifest.json'
+HASH_LENGTH = 12
+HASHED_NAME_RE = re.compile(r'\.[0-9a-f]{%d}\.\w+$' % HASH_LENGTH)
+VARIANT_SUFFIX_RE = re.compile(r'\.(?:br|gz)$')
+COMPRESSIBLE_SUFFIXES = {'.html', '.css', '.js', '.json', '.svg', '.txt'}
+
+
+def hashed_name(name: str, body: bytes) -> str:
+    stem, suffix = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha256(body).hexdigest()[:HASH_LENGTH]}{suffix}"
+
+
+def is_hashed(name: str) -> bool:
+    """True for names produced by ``hashed_name``, whose content never changes."""
+    return bool(HASHED_NAME_RE.search(name))
+
+
+def _replace(path: Path, body: bytes):
+    temporary = path.with_name(path.name + '.tmp')
+    temporary.write_bytes(body)
+    os.replace(temporary, path)
+
+
+def write_asset(output_dir: Path, name: str, body: bytes) -> bool:
+    """Write ``body`` and its compressed variants; False if it was already current."""
+    target = output_dir / name
+    if target.exists() and target.read_bytes() == body:
+        return False
+    for encoding, suffix in ENCODINGS:
+        variant = output_dir / (name + suffix)
+        if os.path.splitext(name)[1] not in COMPRESSIBLE_SUFFIXES:
+            variant.unlink(missing_ok=True)
+            continue
+        compressed = compress(body, encoding, best=True)
+        if len(compressed) < len(body):
+            _replace(variant, compressed)
+        else:
+            variant.unlink(missing_ok=True)
+    # Written last, so an interrupted build is redone next time
+    _replace(target, body)
+    return True
+
+
+def remove_stale(output_dir: Path, manifest: Dict[str, str]) -> int:
+    """Delete hashed files (and their variants) left over from earlier builds."""
+    current = set(manifest.values())
+    removed = 0
+    for path in output_dir.iterdir():
+        # Variants from any coding, including ones this install can no longer produce
+        name = VARIANT_SUFFIX_RE.sub('', path.name)
+        if is_hashed(name) and name not in current:
+            path.unlink()
+            removed += 1
+    return removed
+
+
+def build_assets(source_dir: Path = STATIC_DIR, output_dir: Path = STATIC_BUILD_DIR) -> Dict[str, str]:
+    """Build the static files; returns the manifest of source name -> hashed name."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {}
+    written = 0
+    for path in sorted(source_dir.iterdir()):
+        if not path.is_file() or path.name == PAGE:
+            continue
+        body = path.read_bytes()
+        manifest[path.name] = hashed_name(path.name, body)
+        written += write_asset(output_dir, manifest[path.name], body)
+        # Plain name too, for pages that were cached before this build
+        written += write_asset(output_dir, path.name, body)
+
+    page = (source_dir / PAGE).read_text()
+    for name, hashed in manifest.items():
+        page = page.replace(f'"/static/{name}"', f'"/static/{hashed}"')
+    written += write_asset(output_dir, PAGE, page.encode())
+    _replace(output_dir / MANIFEST, json.dumps(manifest, indent=2).encode())
+    removed = remove_stale(output_dir, manifest)
+
+    if written or removed:
+        print(f"Built {written} static files into {output_dir}, removed {removed} stale ones")
+    return manifest
+
+
+if __name__ == "__main__":
+    build_assets()
@@ -4,12 +4,33 @@ class NewsApp {
         this.currentScreen = 'home';
         this.currentStory = null;
         this.stories = [];
+        this.storiesLoaded = false;
+        this.eventSource = null;
         this.init();
     }
 
     init() {
         this.bindEvents();
         this.handleInitialRoute();
+        this.subscribeToUpdates();
+    }
+
+    subscribeToUpdates() {
+        // The server pushes every story the pipeline writes; EventSource reconnects by itself
+        if (!window.EventSource) return;
+
+        this.eventSource = new EventSource('/api/stories/events');
+        this.eventSource.addEventListener('story', (e) => {
+            this.applyStoryEvent(JSON.parse(e.data));
+        });
+        this.eventSource.addEventListener('resync', () => {
+            // Updates were missed; the list is only trustworthy after a fresh fetch
+            if (this.currentScreen === 'stories') {
+                this.loadStories();
+            } else {
+                this.storiesLoaded = false;
+            }
+        });
     }
 
     bindEvents() {
@@ -141,7 +162,9 @@ class NewsApp {
                 throw new Error('Failed to fetch stories');
             }
             
-            this.stories = await response.json();
+            const page = await response.json();
+            this.stories = page.stories;
+            this.storiesLoaded = true;
             this.renderStories();
             
         } catch (error) {
@@ -159,7 +182,16 @@ class NewsApp {
             return;
         }
 
-        const storiesHTML = this.stories.map(story => `
+        const storiesHTML = this.stories.map(story => this.storyItemHTML(story)).join('');
+
+        storiesList.innerHTML = storiesHTML;
+
+        // Bind click events to story items
+        document.querySelectorAll('.story-item').forEach(item => this.bindStoryItem(item));
+    }
+
+    storyItemHTML(story) {
+        return `
             <div class="story-item" data-story-id="${story.id}">
                 <span class="story-number">${story.number}.</span>
                 <div class="story-content">
@@ -167,20 +199,72 @@ class NewsApp {
                     <p class="story-subtitle">${story.subtitle}</p>
                 </div>
             </div>
-        `).join('');
+        `;
+    }
 
-        storiesList.innerHTML = storiesHTML;
+    bindStoryItem(item) {
+        item.addEventListener('click', (e) => {
+            e.preventDefault();
+            const storyId = item.dataset.storyId;
+            this.navigateToStory(storyId);
+        });
+    }
 
-        // Bind click events to story items
-        document.querySelectorAll('.story-item').forEach(item => {
-            item.addEventListener('click', (e) => {
-                e.preventDefault();
-                const storyId = item.dataset.storyId;
-                this.navigateToStory(storyId);
-            });
+    applyStoryEvent(event) {
+        const story = event.story;
+
+        // An open details screen for this story is refreshed in place
+        if (this.currentScreen === 'story' && this.currentStory && this.currentStory.id === story.id) {
+            this.refreshStoryDetails(story.id);
+        }
+
+        // Before the first fetch there is no list to patch; loadStories gets it whole
+        if (!this.storiesLoaded) return;
+
+        const index = this.stories.findIndex(s => s.id === story.id);
+        if (index >= 0) {
+            this.stories[index] = { ...this.stories[index], ...story };
+        } else {
+            // New stories are the newest, and the list is newest first
+            this.stories.unshift({ ...story });
+        }
+        this.stories.forEach((s, i) => { s.number = i + 1; });
+
+        // Patch only the changed item instead of re-rendering the list
+        const storiesList = document.getElementById('stories-list');
+        const template = document.createElement('template');
+        template.innerHTML = this.storyItemHTML(this.stories[Math.max(index, 0)]).trim();
+        const item = template.content.firstElementChild;
+        this.bindStoryItem(item);
+
+        const existing = storiesList.querySelector(`.story-item[data-story-id="${story.id}"]`);
+        if (existing) {
+            existing.replaceWith(item);
+        } else {
+            storiesList.querySelectorAll('.loading').forEach(el => el.remove());
+            storiesList.prepend(item);
+        }
+        storiesList.querySelectorAll('.story-item .story-number').forEach((el, i) => {
+            el.textContent = `${i + 1}.`;
         });
     }
 
+    async refreshStoryDetails(storyId) {
+        try {
+            const response = await fetch(`/api/story/${storyId}`);
+            if (!response.ok) return;
+
+            const story = await response.json();
+            // Still on the same story once the fetch returns
+            if (this.currentStory && this.currentStory.id === storyId) {
+                this.currentStory = story;
+                this.renderStoryDetails();
+            }
+        } catch (error) {
+            console.error('Error refreshing story details:', error);
+        }
+    }
+
     async loadStoryDetails(storyId) {
         try {
             // Step 1: Prepare story screen with loading state BEFORE transition
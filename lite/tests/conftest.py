@@ -0,0 +1,46 @@
+import json
+import os
+import sys
+
+import pytest
+
+# Modules import ``config`` and ``src`` relative to the lite directory
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+@pytest.fixture
+def story():
+    """Factory for processed-story dicts as ``save_processed_stories`` takes them."""
+    def make(story_id, created, balance):
+        return {
+            'id': story_id,
+            'event_headline': f'Headline {story_id}',
+            'unified_summary': 'Summary.',
+            'background_context': 'Background one. Background two.',
+            'economic_impact': 'Economy.',
+            'social_values': 'Values.',
+            'practical_solutions': 'Solutions.',
+            'conservative_view': 'Conservative.',
+            'progressive_view': 'Progressive.',
+            'references_json': json.dumps([{'source': 'Source', 'title': 'Title', 'url': 'https://example.com'}]),
+            'created_date': created.isoformat(),
+            'source_count': 2,
+            'political_balance_score': balance,
+        }
+    return make
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """An API test client over a fresh database, and the processor behind it."""
+    from fastapi.testclient import TestClient
+
+    import src.api.main as main
+    from src.synthesis.processor import StoryProcessor
+
+    processor = StoryProcessor(database_path=tmp_path / 'news.db')
+    monkeypatch.setattr(main, '_processor', processor)
+    # Re-read the stories version on every request
+    monkeypatch.setattr(main.response_cache, 'check_interval', 0.0)
+    main.response_cache.invalidate()
+    return TestClient(main.app), processor
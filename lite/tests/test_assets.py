@@ -0,0 +1,26 @@
+"""Static asset build: hashed names, compressed variants, stale output removal."""
+
+import json
+
+from src.web.assets import build_assets, is_hashed
+
+
+def test_rebuild_removes_stale_hashed_files(tmp_path):
+    source, output = tmp_path / 'src', tmp_path / 'out'
+    source.mkdir()
+    (source / 'index.html').write_text('<script src="/static/app.js"></script>')
+    (source / 'app.js').write_text('console.log("first build, long enough to compress well");' * 20)
+
+    first = build_assets(source, output)['app.js']
+    assert (output / first).exists() and (output / f'{first}.gz').exists()
+    assert first in (output / 'index.html').read_text()
+
+    (source / 'app.js').write_text('console.log("second build, long enough to compress well");' * 20)
+    manifest = build_assets(source, output)
+    second = manifest['app.js']
+
+    assert second != first
+    assert json.loads((output / 'manifest.json').read_text()) == manifest
+    hashed = sorted(path.name for path in output.iterdir() if is_hashed(path.name.removesuffix('.gz')))
+    assert hashed == [second, f'{second}.gz']
+    assert second in (output / 'index.html').read_text()
@@ -0,0 +1,106 @@
+"""Collector against a local stand-in server serving canned feeds."""
+
+import sqlite3
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.data.collector import NewsCollector
+
+BODY = '<p>Officials confirmed the bridge will reopen next week after repairs. {}</p>'
+
+ITEM = '''<item><title>{title}</title><link>{link}</link>
+<description><![CDATA[{body}]]></description></item>'''
+
+
+def rss(*items):
+    return ('<?xml version="1.0"?><rss version="2.0"><channel><title>Feed</title>'
+            + ''.join(ITEM.format(**item) for item in items) + '</channel></rss>').encode()
+
+
+FEEDS = {
+    '/left.xml': rss(
+        {'title': 'Bridge to reopen', 'link': 'https://news.example.com/bridge',
+         'body': BODY.format('Left.')},
+        {'title': 'Council vote delayed', 'link': 'https://news.example.com/council?id=7',
+         'body': BODY.format('Council.')},
+    ),
+    # The same articles behind tracking and AMP variants of their links
+    '/right.xml': rss(
+        {'title': 'Bridge to reopen', 'link': 'https://www.news.example.com/amp/bridge?utm_source=rss',
+         'body': BODY.format('Left.')},
+        {'title': 'Council vote delayed', 'link': 'http://news.example.com/council/?id=7&fbclid=abc',
+         'body': BODY.format('Council.')},
+    ),
+}
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        etag = f'"{self.path}"'
+        FeedHandler.requests.append((self.path, self.headers.get('If-None-Match')))
+        if self.path not in FEEDS:
+            self.send_response(404)
+            self.end_headers()
+        elif self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+        else:
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/rss+xml')
+            self.send_header('ETag', etag)
+            self.end_headers()
+            self.wfile.write(FEEDS[self.path])
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def feed_server():
+    FeedHandler.requests = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FeedHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def collector(feed_server, tmp_path):
+    sources = {
+        'left': [{'name': 'Left Source', 'rss': f'{feed_server}/left.xml'}],
+        'right': [{'name': 'Right Source', 'rss': f'{feed_server}/right.xml'}],
+    }
+    return NewsCollector(sources=sources, database_path=tmp_path / 'news.db')
+
+
+def test_canonical_urls_deduplicate_across_feeds(collector):
+    assert collector.collect() == 2
+
+    conn = sqlite3.connect(collector.database_path)
+    rows = conn.execute('SELECT canonical_url, clean_content FROM articles ORDER BY canonical_url').fetchall()
+    assert [row[0] for row in rows] == ['https://news.example.com/bridge', 'https://news.example.com/council?id=7']
+    assert all('<p>' not in row[1] for row in rows)
+
+
+def test_unchanged_feeds_are_fetched_conditionally(collector):
+    assert collector.collect() == 2
+    assert collector.collect() == 0
+
+    second_poll = FeedHandler.requests[2:]
+    assert sorted(second_poll) == [('/left.xml', '"/left.xml"'), ('/right.xml', '"/right.xml"')]
+    conn = sqlite3.connect(collector.database_path)
+    assert conn.execute('SELECT DISTINCT last_status FROM feed_state').fetchall() == [(304,)]
+
+
+def test_unreachable_feed_does_not_stop_collection(feed_server, tmp_path):
+    sources = {
+        'left': [{'name': 'Left Source', 'rss': f'{feed_server}/left.xml'}],
+        'center': [{'name': 'Missing', 'rss': f'{feed_server}/missing.xml'}],
+    }
+    assert NewsCollector(sources=sources, database_path=tmp_path / 'news.db').collect() == 2
@@ -0,0 +1,27 @@
+"""API cold start stays within the import-time budget (see benchmarks/import_time.py)."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+LITE_ROOT = Path(__file__).resolve().parent.parent
+BUDGET_MS = 1500
+
+pytest.importorskip('uvicorn')
+
+
+def test_api_imports_within_budget_and_without_heavy_modules(tmp_path):
+    output = tmp_path / 'import_time.json'
+    completed = subprocess.run(
+        [sys.executable, str(LITE_ROOT / 'benchmarks' / 'import_time.py'),
+         '--runs', '3', '--budget-ms', str(BUDGET_MS), '--output', str(output)],
+        cwd=LITE_ROOT, capture_output=True, text=True
+    )
+    results = json.loads(output.read_text())
+
+    assert results['heavy_modules'] == [], completed.stdout
+    assert results['median_ms'] <= BUDGET_MS, completed.stdout
+    assert completed.returncode == 0, completed.stdout + completed.stderr
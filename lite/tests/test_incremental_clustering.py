@@ -0,0 +1,106 @@
+"""Incremental clustering across consecutive polls."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.analysis.clustering import EventClusterer
+from src.data.cleaning import text_fields
+from src.data.database import init_schema, transaction
+
+# Each story term appears in two unrelated base articles, so the fitted vocabulary knows it
+BASE = [
+    ('Senate passes farm bill after long debate', 'The Senate passed the farm bill on Tuesday.'),
+    ('Senate passes farm bill after debate', 'Senators passed the farm bill on Tuesday.'),
+    ('Wildfire insurance rates climb', 'Insurers raised premiums.'),
+    ('Wildfire season budget debated', 'Lawmakers argued over funding.'),
+    ('Evacuation drills planned for schools', 'Schools will practice drills.'),
+    ('Evacuation routes mapped by officials', 'Officials mapped routes.'),
+    ('Sonoma wine harvest begins', 'Growers began picking grapes.'),
+    ('Sonoma tourism rebounds', 'Visitors returned.'),
+    ('County budget approved', 'Supervisors approved spending.'),
+    ('County fair opens', 'Crowds arrived.'),
+]
+
+STORY = [
+    ('Wildfire forces evacuation in Sonoma county', 'A wildfire forced the evacuation of Sonoma county towns.'),
+    ('Sonoma county wildfire forces evacuation', 'The wildfire forced an evacuation across Sonoma county.'),
+]
+
+# None of these terms occur in BASE, so the vectorizer fitted at compaction has never seen them
+NEW_STORY = [
+    ('Volcano erupts near Reykjavik airport', 'Lava from the volcano reached the Reykjavik airport road.'),
+    ('Reykjavik airport closed as volcano erupts', 'The volcano eruption shut the Reykjavik airport.'),
+]
+
+
+def insert(database_path, articles, source, collected):
+    rows = []
+    for i, (title, content) in enumerate(articles):
+        article_id = f'{source}-{collected.timestamp()}-{i}'
+        rows.append((article_id, title, content, f'https://{source}.example.com/{article_id}', source, 'center',
+                     collected.isoformat(), *text_fields(title, content)))
+    with transaction(database_path) as conn:
+        conn.executemany('''
+            INSERT INTO articles (id, title, content, url, source_name, political_lean, collected_date,
+                                  clean_content, lead_sentence, clustering_text)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+    return [row[0] for row in rows]
+
+
+def story_clusters(clusterer, story_ids):
+    return [members for members in clusterer.cluster_state.load_members(
+        clusterer.cluster_state.load_live_clusters(clusterer._live_since())[0]
+    ).values() if set(members) & set(story_ids)]
+
+
+@pytest.fixture
+def clusterer(tmp_path):
+    clusterer = EventClusterer(engine='sparse', backend='tfidf')
+    clusterer.database_path = tmp_path / 'news.db'
+    init_schema(clusterer.database_path)
+    return clusterer
+
+
+def test_story_split_over_two_polls_forms_a_cluster(clusterer):
+    now = datetime.now()
+    insert(clusterer.database_path, BASE, 'base', now - timedelta(hours=2))
+    clusterer.update_clusters()  # First run compacts
+    assert clusterer.cluster_state.get_value('last_compaction') is not None
+
+    first = insert(clusterer.database_path, STORY[:1], 'left', now - timedelta(hours=1))
+    clusterer.update_clusters()
+    assert story_clusters(clusterer, first) == []
+
+    second = insert(clusterer.database_path, STORY[1:], 'right', now)
+    clusterer.update_clusters()
+    assert [sorted(members) for members in story_clusters(clusterer, first + second)] == [sorted(first + second)]
+
+    # A full re-cluster of the same articles agrees
+    clusterer.compact_clusters()
+    assert [sorted(members) for members in story_clusters(clusterer, first + second)] == [sorted(first + second)]
+
+
+def test_unclustered_articles_alone_do_not_rerun(clusterer):
+    now = datetime.now()
+    insert(clusterer.database_path, BASE, 'base', now - timedelta(hours=2))
+    clusterer.update_clusters()
+    insert(clusterer.database_path, STORY[:1], 'left', now - timedelta(hours=1))
+    clusterer.update_clusters()
+    watermark = clusterer.cluster_state.get_value('watermark')
+
+    clusterer.update_clusters()
+    assert clusterer.cluster_state.get_value('watermark') == watermark
+
+
+def test_story_with_unseen_terms_forms_a_cluster(clusterer):
+    now = datetime.now()
+    insert(clusterer.database_path, BASE, 'base', now - timedelta(hours=2))
+    clusterer.update_clusters()
+    assert 'volcano' not in clusterer.cluster_state.load_vectorizer().vocabulary_
+
+    story = insert(clusterer.database_path, NEW_STORY, 'wire', now)
+    clusterer.update_clusters()
+    assert [sorted(members) for members in story_clusters(clusterer, story)] == [sorted(story)]
+    assert 'volcano' in clusterer.cluster_state.load_vectorizer().vocabulary_
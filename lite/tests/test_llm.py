@@ -0,0 +1,37 @@
+"""Quantized, batched generation on the offline tiny model."""
+
+import pytest
+
+torch = pytest.importorskip('torch')
+pytest.importorskip('transformers')
+
+from src.synthesis.llm import LLMEngine, conv1d_to_linear, tiny_random_model
+
+
+def test_conv1d_conversion_keeps_outputs():
+    model, tokenizer = tiny_random_model()
+    model.eval()
+    inputs = tokenizer(['Officials confirmed the bridge will reopen.'], return_tensors='pt')
+    with torch.inference_mode():
+        before = model(**inputs).logits
+    assert conv1d_to_linear(model) == 8  # c_attn, c_proj, c_fc, mlp c_proj in each of 2 layers
+    with torch.inference_mode():
+        after = model(**inputs).logits
+    assert torch.allclose(before, after, atol=1e-5)
+
+
+def test_quantized_batched_generation():
+    model, tokenizer = tiny_random_model()
+    engine = LLMEngine(model=model, tokenizer=tokenizer, quantize=True, batch_size=2,
+                       max_new_tokens=6, temperature=0.0)
+
+    quantized = [module for module in engine.model.modules()
+                 if isinstance(module, torch.ao.nn.quantized.dynamic.Linear)]
+    assert len(quantized) == 9  # Every attention and MLP layer, plus lm_head
+
+    prompts = ['Summarize:', 'Write the background for a story about a bridge.', 'Impact on families:']
+    outputs = engine.generate(prompts)
+    assert len(outputs) == len(prompts)
+    assert all(isinstance(output, str) for output in outputs)
+    assert engine.generated_tokens > 0
+    assert engine.tokens_per_second > 0
@@ -0,0 +1,69 @@
+"""Article search indexes cleaned text, not the stored HTML."""
+
+import sqlite3
+
+from src.data import database
+from src.data.cleaning import text_fields
+from src.data.database import init_schema, transaction
+from src.data.search import search_articles
+
+HTML = ('<p class="lede">Officials confirmed the <a href="https://publisher.example.com/bridge">bridge</a> '
+        'will reopen.</p><img src="https://cdn.publisher.example.com/photo.png">')
+
+
+def insert_article(database_path, article_id='a1', content=HTML):
+    with transaction(database_path) as conn:
+        conn.execute('''
+            INSERT INTO articles (id, title, content, url, source_name, political_lean, collected_date,
+                                  clean_content, lead_sentence, clustering_text)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (article_id, 'Bridge update', content, f'https://publisher.example.com/{article_id}', 'Source',
+              'center', '2026-01-01T00:00:00', *text_fields('Bridge update', content)))
+
+
+def matched_ids(query, database_path):
+    return [result['id'] for result in search_articles(query, database_path=database_path)['results']]
+
+
+def test_markup_does_not_match(tmp_path):
+    database_path = tmp_path / 'news.db'
+    init_schema(database_path)
+    insert_article(database_path)
+
+    assert matched_ids('reopen', database_path) == ['a1']
+    for markup in ('href', 'class', 'lede', 'png', 'publisher'):
+        assert matched_ids(markup, database_path) == []
+
+    with transaction(database_path) as conn:
+        conn.execute("UPDATE articles SET clean_content = 'Ferry service resumes' WHERE id = 'a1'")
+    assert matched_ids('ferry', database_path) == ['a1']
+    assert matched_ids('reopen', database_path) == []
+
+
+def test_raw_content_index_is_rebuilt(tmp_path):
+    database_path = tmp_path / 'news.db'
+    init_schema(database_path)
+    insert_article(database_path)
+
+    # An index from before articles were indexed by clean_content
+    conn = sqlite3.connect(database_path)
+    conn.executescript('''
+        DROP TRIGGER articles_fts_insert;
+        DROP TRIGGER articles_fts_delete;
+        DROP TRIGGER articles_fts_update;
+        DROP TABLE articles_fts;
+        CREATE VIRTUAL TABLE articles_fts USING fts5(title, content, content='articles', content_rowid='rowid');
+        CREATE TRIGGER articles_fts_insert AFTER INSERT ON articles BEGIN
+            INSERT INTO articles_fts (rowid, title, content) VALUES (new.rowid, new.title, new.content);
+        END;
+        INSERT INTO articles_fts (articles_fts) VALUES ('rebuild');
+    ''')
+    conn.close()
+    database.close_connections()
+    database._initialized.clear()
+
+    init_schema(database_path)
+    assert matched_ids('href', database_path) == []
+    assert matched_ids('reopen', database_path) == ['a1']
+    insert_article(database_path, 'a2', '<p>The bridge will reopen in May.</p>')
+    assert sorted(matched_ids('reopen', database_path)) == ['a1', 'a2']
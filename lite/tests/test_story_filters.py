@@ -0,0 +1,20 @@
+"""since/until filters on /api/stories against the stored created_date format."""
+
+from datetime import datetime, timedelta, timezone
+
+
+def listed_ids(client, **params):
+    return [item['id'] for item in client.get('/api/stories', params=params).json()['stories']]
+
+
+def test_aware_bounds_compare_as_local_time(client, story):
+    client, processor = client
+    boundary = datetime.now().replace(microsecond=0) - timedelta(hours=1)
+    processor.save_processed_stories([
+        story('before', boundary - timedelta(minutes=1), 0.5),
+        story('after', boundary + timedelta(minutes=1), 0.5),
+    ])
+
+    for bound in (boundary, boundary.astimezone(), boundary.astimezone(timezone(timedelta(hours=-7)))):
+        assert listed_ids(client, since=bound.isoformat()) == ['after']
+        assert listed_ids(client, until=bound.isoformat()) == ['before']
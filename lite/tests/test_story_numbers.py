@@ -0,0 +1,29 @@
+"""Story numbers on the details payload agree with the stories listing."""
+
+from datetime import datetime, timedelta
+
+
+def numbers(client):
+    listing = client.get('/api/stories').json()['stories']
+    return ({item['id']: item['number'] for item in listing},
+            {item['id']: client.get(f'/api/story/{item["id"]}').json()['number'] for item in listing})
+
+
+def test_detail_numbers_follow_the_listing_across_saves(client, story):
+    client, processor = client
+    now = datetime.now()
+    processor.save_processed_stories([story(f'old-{i}', now - timedelta(hours=2), i / 10) for i in range(3)])
+    listed, detailed = numbers(client)
+    assert detailed == listed == {'old-2': 1, 'old-1': 2, 'old-0': 3}
+    etag = client.get('/api/story/old-2').headers['etag']
+
+    processor.save_processed_stories([story(f'new-{i}', now, i / 10) for i in range(3)])
+    listed, detailed = numbers(client)
+    assert detailed == listed
+    assert sorted(listed.values()) == list(range(1, 7))
+    assert listed['old-2'] == 4
+
+    # The cached body and its ETag move with the number
+    response = client.get('/api/story/old-2', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['etag'] != etag